@@ -0,0 +1,341 @@
+"""
+Benchmark and perf-regression suite.
+
+Times engine steps on the bundled patterns and on random soups across
+board sizes, the renderer (offscreen, through SDL's dummy video driver)
+and pattern loading. Reports steps/s, cells/s (board cells processed per
+second, or pattern cells placed per second for loads) and peak memory as
+seen by tracemalloc (shared memory used by the parallel engine is not
+traced).
+
+    python -m benchmark --save benchmark_baseline.json
+    python -m benchmark --quick --compare benchmark_baseline.json --tolerance 15
+
+``--compare`` exits with status 1 when any case is more than
+``--tolerance`` percent slower than the stored baseline.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from engines import LOCAL_ENGINES, create_simulation
+from patternio import read_cells, center_cells, read_pattern, place_pattern
+
+SIZES = [100, 512, 2048, 8192]
+QUICK_SIZES = [100, 512]
+DENSITIES = [0.05, 0.15, 0.5]
+PATTERN_BOARD = 512
+RENDER_ZOOMS = [10, 5]
+RENDERERS = ["pixels", "rects"]
+
+# Set- and tree-based engines are far too slow for multi-megacell soups
+MAX_SOUP_SIZE = {"sparse": 512, "chunked": 512, "hashlife": 512}
+
+
+def soup_coords(width, height, density, seed=0, band=1024):
+    """
+    Seeded random soup as coordinate arrays, built without Python loops.
+    Rows are drawn in bands so an 8k board never needs a full float array.
+    """
+    rng = np.random.default_rng(seed)
+    xs, ys = [], []
+    for top in range(0, height, band):
+        rows = min(band, height - top)
+        band_ys, band_xs = np.nonzero(
+            rng.random((rows, width), dtype=np.float32) < density
+        )
+        xs.append(band_xs)
+        ys.append(band_ys + top)
+    return np.concatenate(xs), np.concatenate(ys)
+
+
+def measure(fn, min_time, rounds=3, max_iterations=10_000):
+    """
+    Call ``fn`` repeatedly for ``rounds`` rounds of ``min_time / rounds``
+    seconds each (at least once per round) and keep the fastest round, which
+    filters out most scheduler noise.
+
+    :return: (iterations, elapsed seconds) of the fastest round
+    """
+    clock = time.perf_counter
+    best = None
+    for _ in range(rounds):
+        start = clock()
+        iterations = 0
+        while iterations < max_iterations:
+            fn()
+            iterations += 1
+            if clock() - start >= min_time / rounds:
+                break
+        elapsed = clock() - start
+        if best is None or iterations / elapsed > best[0] / best[1]:
+            best = (iterations, elapsed)
+    return best
+
+
+def _close(simulation):
+    close = getattr(simulation, "close", None)
+    if close:
+        close()
+
+
+# -------------------------------------------------
+# Cases
+# -------------------------------------------------
+def bench_step(engine, width, height, coords, min_time):
+    """Steps/s, cells/s and peak memory for one engine on one board."""
+    tracemalloc.start()
+    simulation = create_simulation(engine, width, height)
+    try:
+        simulation.add_coords(*coords)
+        simulation.step()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        steps, elapsed = measure(simulation.step, min_time)
+        return {
+            "steps_per_s": steps / elapsed,
+            "cells_per_s": width * height * steps / elapsed,
+            "population": len(simulation.positions),
+            "peak_mem_bytes": peak,
+        }
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        _close(simulation)
+
+
+def bench_render(renderer, zoom, density, fade, min_time):
+    """Frames/s for LifeView.update_fade + draw_cells on an offscreen surface."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+    from view import LifeView
+    from constants import WIDTH, HEIGHT, YELLOW
+
+    pygame.display.init()
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    view = LifeView(screen, zoom, renderer=renderer)
+    view.set_fade_enabled(fade)
+
+    simulation = create_simulation("dense", WIDTH // zoom, HEIGHT // zoom)
+    simulation.add_coords(*soup_coords(simulation.width, simulation.height, density))
+
+    def frame():
+        simulation.step()
+        view.update_fade(simulation.positions, 1 / 60)
+        view.draw_cells(simulation.positions, YELLOW)
+
+    tracemalloc.start()
+    frame()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    frames, elapsed = measure(frame, min_time)
+    return {
+        "frames_per_s": frames / elapsed,
+        "cells_per_s": simulation.width * simulation.height * frames / elapsed,
+        "peak_mem_bytes": peak,
+    }
+
+
+def bench_load(path, min_time):
+    """Loads/s for reading a pattern and placing it on a board."""
+    simulation = create_simulation("sparse", PATTERN_BOARD, PATTERN_BOARD)
+
+    def load():
+        simulation.positions.clear()
+        header, batches = read_pattern(path)
+        place_pattern(simulation, header, batches)
+
+    tracemalloc.start()
+    load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    loads, elapsed = measure(load, min_time)
+    return {
+        "loads_per_s": loads / elapsed,
+        "cells_per_s": len(simulation.positions) * loads / elapsed,
+        "mb_per_s": os.path.getsize(path) / 1e6 * loads / elapsed,
+        "peak_mem_bytes": peak,
+    }
+
+
+def collect_cases(args):
+    """Yield (case_id, thunk) pairs for everything selected on the command line."""
+    patterns = sorted(
+        glob.glob(os.path.join("patterns", "*.cells"))
+        + glob.glob(os.path.join("patterns", "*.rle"))
+    )
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+
+    if "step" in args.suites:
+        for engine in args.engines:
+            for path in patterns:
+                name = os.path.splitext(os.path.basename(path))[0]
+                cells, w, h = read_cells(path)
+                placed = center_cells(cells, w, h, PATTERN_BOARD, PATTERN_BOARD)
+                coords = (
+                    np.array([x for x, _ in placed], dtype=np.int64),
+                    np.array([y for _, y in placed], dtype=np.int64),
+                )
+                yield (
+                    f"step/{engine}/pattern/{name}",
+                    lambda e=engine, c=coords: bench_step(
+                        e, PATTERN_BOARD, PATTERN_BOARD, c, args.min_time
+                    ),
+                )
+
+            for size in sizes:
+                if size > MAX_SOUP_SIZE.get(engine, size):
+                    continue
+                for density in args.densities:
+                    yield (
+                        f"step/{engine}/soup{round(density * 100)}/{size}x{size}",
+                        lambda e=engine, s=size, d=density: bench_step(
+                            e, s, s, soup_coords(s, s, d), args.min_time
+                        ),
+                    )
+
+    if "render" in args.suites:
+        for renderer in RENDERERS:
+            for zoom in RENDER_ZOOMS:
+                for density in args.densities:
+                    for fade in (False, True):
+                        yield (
+                            f"render/{renderer}/zoom{zoom}/soup{round(density * 100)}"
+                            f"/fade-{'on' if fade else 'off'}",
+                            lambda r=renderer, z=zoom, d=density, f=fade: bench_render(
+                                r, z, d, f, args.min_time
+                            ),
+                        )
+
+    if "load" in args.suites:
+        for path in patterns:
+            name = os.path.splitext(os.path.basename(path))[0]
+            yield f"load/{name}", lambda p=path: bench_load(p, args.min_time)
+
+
+# -------------------------------------------------
+# Baselines
+# -------------------------------------------------
+def rate_of(result):
+    """The headline throughput number of a result, whatever its suite."""
+    for key in ("steps_per_s", "frames_per_s", "loads_per_s"):
+        if key in result:
+            return result[key]
+    raise KeyError("result has no rate")
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print a comparison against ``baseline`` and return the ids of cases
+    that are more than ``tolerance`` percent slower.
+    """
+    regressions = []
+    for case_id, result in results.items():
+        base = baseline.get(case_id)
+        if base is None:
+            print(f"  NEW      {case_id}")
+            continue
+        rate, base_rate = rate_of(result), rate_of(base)
+        change = (rate - base_rate) / base_rate * 100
+        status = "OK"
+        if -change > tolerance:
+            status = "SLOWER"
+            regressions.append(case_id)
+        print(f"  {status:<8} {case_id}: {change:+.1f}% ({base_rate:.1f} -> {rate:.1f}/s)")
+
+    skipped = len(baseline.keys() - results.keys())
+    if skipped:
+        print(f"  ({skipped} baseline case(s) not selected in this run)")
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmark", description="Game of Life benchmark suite."
+    )
+    parser.add_argument(
+        "--suites", nargs="+", choices=["step", "render", "load"],
+        default=["step", "render", "load"], help="suites to run (default: all)",
+    )
+    parser.add_argument(
+        "--engines", nargs="+", choices=sorted(LOCAL_ENGINES),
+        default=[e for e in LOCAL_ENGINES if e != "parallel"],
+        help="engines for the step suite (default: all but parallel)",
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int,
+        help=f"square board sizes for soups (default: {SIZES})",
+    )
+    parser.add_argument(
+        "--densities", nargs="+", type=float, default=DENSITIES,
+        help=f"soup densities (default: {DENSITIES})",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help=f"only soup sizes {QUICK_SIZES}"
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.5,
+        help="seconds to time each case for (default: %(default)s)",
+    )
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=10.0,
+        help="percent slowdown allowed by --compare (default: %(default)s)",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    results = {}
+    for case_id, run_case in collect_cases(args):
+        result = run_case()
+        results[case_id] = result
+        print(
+            f"{case_id:<48} {rate_of(result):>12.1f}/s "
+            f"{result['cells_per_s']:>14.3g} cells/s "
+            f"{result['peak_mem_bytes'] / 2**20:>9.1f} MiB peak"
+        )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "meta": {
+                        "python": platform.python_version(),
+                        "numpy": np.__version__,
+                        "machine": platform.machine(),
+                        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    },
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        print(f"Comparing against {args.compare} (tolerance {args.tolerance}%):")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) regressed")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
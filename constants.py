@@ -16,4 +16,39 @@ PANEL_BORDER_COLOR = (200, 200, 0)
 BUTTON_LABEL_COLOR = (235, 235, 0)
 
 WIDTH, HEIGHT= 800, 800
-FPS = 120
\ No newline at end of file
+FPS = 120
+
+# Simulation engine used at startup (see engines.ENGINES)
+ENGINE = "sparse"
+
+# Cell renderer: "pixels" blits the board in bulk from a one-pixel-per-cell
+# buffer, "rects" draws every cell with its own pygame.draw.rect call
+RENDERER = "pixels"
+
+# Zoom levels in pixels per cell. Below 1:1 every pixel stands for a square
+# block of cells and is shaded by how many of them are alive
+ZOOM_LEVELS = (1 / 64, 1 / 32, 1 / 16, 1 / 8, 1 / 4, 1 / 2, *range(1, 21))
+ZOOM = 10
+
+# Grid lines are hidden below GRID_HIDE_ZOOM pixels per cell and drawn
+# progressively fainter between it and GRID_FADE_ZOOM
+GRID_HIDE_ZOOM = 4
+GRID_FADE_ZOOM = 8
+
+# Camera speed for the arrow keys on an unbounded plane (pixels per second)
+PAN_SPEED = 600
+
+# File the save/load snapshot keys write and read
+SNAPSHOT_PATH = "board.lifesnap"
+
+# File the frame profiler's per-frame timings are saved to
+PROFILE_CSV_PATH = "frame_profile.csv"
+
+# Generations skipped by the "jump ahead" key once the board is cycling
+CYCLE_JUMP = 1_000_000
+
+# Generation rate range for the speed slider (generations per second), the
+# rate used at startup, and the per-frame time budget for stepping (seconds)
+MIN_GEN_RATE, MAX_GEN_RATE = 1, 10_000
+GEN_RATE = 10
+STEP_BUDGET = 0.008
@@ -0,0 +1,152 @@
+"""
+Cycle and stabilization detection via incrementally maintained board hashes.
+"""
+import random
+from collections import deque
+import numpy as np
+
+_MASK = (1 << 64) - 1
+
+
+def _splitmix64(value):
+    """Scramble a 64-bit integer (SplitMix64 finalizer)."""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+def _splitmix64_array(values):
+    """``_splitmix64`` over a uint64 array (NumPy wraps the arithmetic mod 2**64)."""
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class CycleDetector:
+    """
+    Detect when the board starts repeating.
+
+    The board is fingerprinted with a Zobrist hash: the XOR of a
+    pseudo-random 64-bit key per live cell. A birth or death flips one
+    cell, so the hash is updated with one XOR per change instead of being
+    recomputed from the whole board. The last ``window`` fingerprints are
+    kept; when the current one was seen ``p`` generations ago, the board is
+    in a cycle of period ``p`` (1 means it is still).
+
+    Keys are derived from the cell coordinates, so the plane can be
+    unbounded and no key table is needed.
+    """
+
+    def __init__(self, window=256, seed=None):
+        self.window = window
+        self._salt = random.Random(seed).getrandbits(64)
+        self.stale = True           # board was edited; re-hash before use
+        self._reset_state(0)
+
+
+    def _reset_state(self, population):
+        self.hash = 0
+        self.population = population
+        self.history = deque()      # (generation, fingerprint), oldest first
+        self._seen = {}             # fingerprint -> generation
+        self.period = None
+        self.cycle_start = None
+
+
+    def _key(self, x, y):
+        return _splitmix64(((x & 0xFFFFFFFF) << 32 | (y & 0xFFFFFFFF)) ^ self._salt)
+
+
+    def _keys(self, xs, ys):
+        """``_key`` for arrays of columns and rows."""
+        low = np.uint64(0xFFFFFFFF)
+        packed = (xs.astype(np.uint64) & low) << np.uint64(32) | (ys.astype(np.uint64) & low)
+        return _splitmix64_array(packed ^ np.uint64(self._salt))
+
+
+    def invalidate(self):
+        """Note that the board changed outside of a generation step."""
+        self.stale = True
+
+
+    def reset(self, cells, generation):
+        """Re-hash ``cells`` from scratch and forget the history."""
+        cells = list(cells)
+        self._reset_state(len(cells))
+        for x, y in cells:
+            self.hash ^= self._key(x, y)
+        self.stale = False
+        self._remember(generation)
+
+
+    def _remember(self, generation):
+        fingerprint = (self.hash, self.population)
+        self.history.append((generation, fingerprint))
+        self._seen[fingerprint] = generation
+
+        while len(self.history) > self.window:
+            old_generation, old_fingerprint = self.history.popleft()
+            if self._seen.get(old_fingerprint) == old_generation:
+                del self._seen[old_fingerprint]
+
+
+    def observe(self, births, deaths, generation):
+        """
+        Apply one generation's births and deaths and check for a repeat.
+
+        :param births: iterable of (x, y) cells that came alive
+        :param deaths: iterable of (x, y) cells that died
+        :param generation: generation number after the step
+        :return: the period if the board is cycling, otherwise None
+        """
+        for cells in (births, deaths):
+            for x, y in cells:
+                self.hash ^= self._key(x, y)
+        return self._advance(len(births) - len(deaths), generation)
+
+
+    def observe_coords(self, births, deaths, generation):
+        """
+        Like ``observe``, but with births and deaths as ``(xs, ys)`` int
+        arrays (as engines with ``track_changes`` report them), hashed in
+        one vectorized pass each.
+        """
+        for xs, ys in (births, deaths):
+            if len(xs):
+                self.hash ^= int(np.bitwise_xor.reduce(self._keys(xs, ys)))
+        return self._advance(len(births[0]) - len(deaths[0]), generation)
+
+
+    def _advance(self, growth, generation):
+        """Record the new fingerprint after a generation and check for a repeat."""
+        self.population += growth
+
+        previous = self._seen.get((self.hash, self.population))
+        if previous is None:
+            self.period = None
+            self.cycle_start = None
+        elif self.period is None:
+            self.period = generation - previous
+            self.cycle_start = previous
+
+        self._remember(generation)
+        return self.period
+
+
+    def fast_forward(self, generation, skip):
+        """
+        Split a jump of ``skip`` generations into whole periods, which leave
+        the board unchanged and can be added to the counter analytically,
+        and the few remaining generations that must actually be stepped.
+        The stored history is shifted to match the new counter.
+
+        :return: (generation after the whole periods, steps still to run)
+        """
+        whole = skip - skip % self.period
+        self.history = deque((g + whole, f) for g, f in self.history)
+        self._seen = {f: g + whole for f, g in self._seen.items()}
+        if self.cycle_start is not None:
+            self.cycle_start += whole
+        return generation + whole, skip - whole
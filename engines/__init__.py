@@ -0,0 +1,58 @@
+"""
+Simulation engines.
+
+Every engine exposes the same surface as ``LifeSimulation``: ``step()``,
+``positions``, ``generations``, ``width``/``height``, ``clear()`` and
+``update_grid_size()``, and accepts a ``rule`` keyword (see ``rules.py``). Engines are imported lazily so optional
+dependencies are only needed for the engine actually in use.
+
+``LOCAL_ENGINES`` are the ones a frontend can pick directly; ``remote``
+wraps one of them in its own process.
+
+Engines in ``UNBOUNDED_ENGINES`` can run on an infinite plane (they set
+``unbounded``; hashlife always does), and then also answer
+``live_cells(x0, y0, x1, y1)`` for a rectangle of it.
+
+``engines.batched`` is not in the registry: it steps a stack of small
+independent boards together, for sweeps rather than for the game.
+"""
+from importlib import import_module
+
+# name -> (module, class)
+ENGINES = {
+    "sparse": ("simulation", "LifeSimulation"),
+    "dense": ("engines.dense", "DenseSimulation"),
+    "bitpacked": ("engines.bitpacked", "BitPackedSimulation"),
+    "hashlife": ("engines.hashlife", "HashLifeSimulation"),
+    "chunked": ("engines.chunked", "ChunkedSimulation"),
+    "parallel": ("engines.parallel", "ParallelSimulation"),
+    "remote": ("engines.remote", "RemoteSimulation"),
+}
+
+# Engines that take ``unbounded=True`` (hashlife's plane is always unbounded)
+UNBOUNDED_ENGINES = ("sparse", "chunked", "hashlife")
+
+# Engines whose ``step()`` has finished the generation when it returns.
+# "remote" only queues the step for its child process, so timing it
+# measures queue writes; frontends offer it only as a wrapper
+LOCAL_ENGINES = tuple(name for name in ENGINES if name != "remote")
+
+
+def create_simulation(name, width, height, **options):
+    """
+    Build a simulation engine by name.
+
+    :param name: key in ``ENGINES``
+    :param width: board width in cells
+    :param height: board height in cells
+    :param options: engine-specific keyword arguments
+    """
+    try:
+        module_name, class_name = ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown engine '{name}'. Choose from: {', '.join(ENGINES)}"
+        ) from None
+
+    engine_cls = getattr(import_module(module_name), class_name)
+    return engine_cls(width, height, **options)
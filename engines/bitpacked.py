@@ -0,0 +1,285 @@
+import numpy as np
+from engines.cellset import CellSet, coords_from_cells
+from engines.density import density_from_packed
+from engines.dense import rule_terms
+from rules import CONWAY, compile_rule
+
+WORD_BITS = 64
+WORD = np.dtype("<u8")
+
+
+def _set_bits(board):
+    """``(xs, ys)`` int arrays of the set bits of a packed board."""
+    rows, words = np.nonzero(board)
+    if rows.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.copy()
+
+    packed = board[rows, words].view(np.uint8).reshape(-1, 8)
+    bits = np.unpackbits(packed, axis=1, bitorder="little")
+    hit, bit = np.nonzero(bits)
+    xs = words[hit].astype(np.int64) * WORD_BITS + bit
+    return xs, rows[hit].astype(np.int64)
+
+
+class BitPackedSimulation:
+    """
+    Game of Life on a bit-packed board.
+
+    Each row is stored as ``ceil(width / 64)`` little-endian uint64 words,
+    with column ``x`` held in bit ``x % 64`` of word ``x // 64``. A step
+    builds a 4-bit neighbor count with bitwise full-adder logic and matches
+    it against the rule's terms, so one operation updates 64 cells, and a
+    16k x 16k board takes 32 MB.
+
+    Rows are processed in bands of ``band_rows`` so temporaries stay small
+    even on very large boards. Cells outside the board are always dead.
+
+    Set ``track_changes`` to have ``step()`` leave the generation's
+    ``births`` and ``deaths`` as ``(xs, ys)`` arrays, found by XOR-ing the
+    old and new words and unpacking only those that differ.
+    """
+
+    def __init__(self, width, height, rule=CONWAY, band_rows=256):
+        self.width = width
+        self.height = height
+        self.band_rows = band_rows
+        self.generations = 0
+        self.track_changes = False
+        self.births = self.deaths = None
+        self.rule = compile_rule(rule)
+        self._terms = rule_terms(self.rule)
+        self.board = self._empty_board(width, height)
+
+
+    @staticmethod
+    def _empty_board(width, height):
+        words = (width + WORD_BITS - 1) // WORD_BITS
+        return np.zeros((height, words), dtype=WORD)
+
+
+    @property
+    def _last_word_mask(self):
+        """Mask of the bits in a row's last word that are on the board."""
+        used = self.width % WORD_BITS
+        if used == 0:
+            return np.uint64(0xFFFFFFFFFFFFFFFF)
+        return np.uint64((1 << used) - 1)
+
+
+    @property
+    def positions(self):
+        """Live cells as a set-like view of ``(col, row)`` tuples."""
+        return CellSet(self)
+
+
+    @positions.setter
+    def positions(self, cells):
+        self.clear()
+        self.add_cells(cells)
+
+
+    @property
+    def population(self):
+        return int(np.bitwise_count(self.board).sum())
+
+
+    def clear(self):
+        self.board.fill(0)
+
+
+    def add_cells(self, cells):
+        """
+        Bulk-insert live cells, ignoring any that fall outside the board.
+
+        :param cells: iterable of (col, row) tuples
+        """
+        self.add_coords(*coords_from_cells(cells))
+
+
+    def add_coords(self, xs, ys):
+        """
+        Bulk-insert live cells given as coordinate arrays, ignoring any that
+        fall outside the board.
+
+        :param xs: int array of columns
+        :param ys: int array of rows
+        """
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        xs, ys = xs[inside], ys[inside]
+        bits = np.left_shift(np.uint64(1), (xs % WORD_BITS).astype(WORD))
+        np.bitwise_or.at(self.board, (ys, xs // WORD_BITS), bits)
+
+
+    def packed_board(self):
+        """The board in snapshot layout: the live ``(height, words)`` array itself."""
+        return self.board
+
+
+    def load_packed(self, board):
+        """
+        Take a ``(height, words)`` uint64 board, e.g. a memory-mapped
+        snapshot, as the current generation. The words are copied, so
+        later changes to the file can't reach the live board. Bits past
+        ``width`` must be clear.
+        """
+        if board.shape != self.board.shape:
+            raise ValueError(
+                f"board shape {board.shape} doesn't match {self.board.shape}"
+            )
+        self.board = np.array(board, dtype=WORD)
+
+
+    def live_cells(self):
+        """
+        Return live cells as two int arrays ``(xs, ys)``.
+
+        Only words that hold at least one live cell are unpacked, so the
+        cost follows the population rather than the board area.
+        """
+        return _set_bits(self.board)
+
+
+    def density(self, x0, y0, cols, rows, block):
+        """
+        Live cells per ``block`` square (see ``engines.density``), by
+        popcount straight off the packed words.
+        """
+        return density_from_packed(self.board, self.width, x0, y0, cols, rows, block)
+
+
+    def step(self):
+        """Advance the simulation by one generation."""
+        old, self.board = self.board, self._next_generation()
+        if self.track_changes:
+            changed = old ^ self.board
+            self.births = _set_bits(changed & self.board)
+            self.deaths = _set_bits(changed & old)
+        self.generations += 1
+
+
+    def _next_generation(self):
+        """Apply the rule one band of rows at a time."""
+        new_board = np.empty_like(self.board)
+        for top in range(0, self.height, self.band_rows):
+            bottom = min(top + self.band_rows, self.height)
+            new_board[top:bottom] = self._next_band(top, bottom)
+
+        if new_board.shape[1]:
+            new_board[:, -1] &= self._last_word_mask
+        return new_board
+
+
+    def _next_band(self, top, bottom):
+        """
+        Compute rows ``top:bottom`` of the next generation.
+
+        Neighbor counts are built from bit-planes: each row's west/centre/
+        east planes are summed into 2-bit horizontal totals, then the rows
+        above, beside and below are added with full adders into a 4-bit
+        count ``(c3 c2 c1 c0)``.
+        """
+        board = self.board
+        rows = np.zeros((bottom - top + 2, board.shape[1]), dtype=WORD)
+        src_top = max(top - 1, 0)
+        src_bottom = min(bottom + 1, self.height)
+        dst = src_top - (top - 1)
+        rows[dst:dst + src_bottom - src_top] = board[src_top:src_bottom]
+
+        # Neighbor to the west / east of each cell, carrying across words
+        west = rows << 1
+        west[:, 1:] |= rows[:, :-1] >> 63
+        east = rows >> 1
+        east[:, :-1] |= rows[:, 1:] << 63
+
+        # Horizontal sums: west + centre + east (0..3) and west + east (0..2)
+        we_xor = west ^ east
+        h0 = we_xor ^ rows
+        h1 = (west & east) | (rows & we_xor)
+        m0 = we_xor[1:-1]
+        m1 = (west & east)[1:-1]
+
+        # Row above + row below (0..6)
+        t0, t1 = h0[:-2], h1[:-2]
+        b0, b1 = h0[2:], h1[2:]
+        s0 = t0 ^ b0
+        carry = t0 & b0
+        s1 = t1 ^ b1 ^ carry
+        s2 = (t1 & b1) | (carry & (t1 ^ b1))
+
+        # ... plus the cell's own row (0..8)
+        c0 = s0 ^ m0
+        carry = s0 & m0
+        c1 = s1 ^ m1 ^ carry
+        carry = (s1 & m1) | (carry & (s1 ^ m1))
+        c2 = s2 ^ carry
+        c3 = s2 & carry
+
+        alive = rows[1:-1]
+        return self._match_terms((c0, c1, c2, c3), alive)
+
+
+    def _match_terms(self, count_bits, alive):
+        """
+        OR together one bitwise equality mask per rule term. Counts below 8
+        have bit 3 clear; 8 is the only count with bit 3 set.
+        """
+        c0, c1, c2, c3 = count_bits
+        planes = ((c0, ~c0), (c1, ~c1), (c2, ~c2))
+        under_eight = ~c3
+
+        result = np.zeros_like(alive)
+        for count, state in self._terms:
+            if count == 8:
+                hit = c3.copy()
+            else:
+                hit = under_eight.copy()
+                for bit, (one, zero) in enumerate(planes):
+                    hit &= one if (count >> bit) & 1 else zero
+            if state == 1:
+                hit &= alive
+            elif state == 0:
+                hit &= ~alive
+            result |= hit
+        return result
+
+
+    def update_grid_size(self, width, height, tile_size):
+        """
+        Update the grid size based on screen dimensions and tile size.
+        Cells that no longer fit on the board are dropped.
+
+        :param width: screen width in pixels
+        :param height: screen height in pixels
+        :param tile_size: size of each cell in pixels (zoom level)
+        """
+        new_width = int(width // tile_size)
+        new_height = int(height // tile_size)
+        if (new_width, new_height) == (self.width, self.height):
+            return
+
+        xs, ys = self.live_cells()
+        self.width = new_width
+        self.height = new_height
+        self.board = self._empty_board(new_width, new_height)
+        self.add_coords(xs, ys)
+
+
+    # -------------------------------------------------
+    # CellSet hooks
+    # -------------------------------------------------
+    def _has_cell(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            word = int(self.board[y, x // WORD_BITS])
+            return bool((word >> (x % WORD_BITS)) & 1)
+        return False
+
+
+    def _set_cell(self, x, y, alive):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        bit = np.uint64(1 << (x % WORD_BITS))
+        if alive:
+            self.board[y, x // WORD_BITS] |= bit
+        else:
+            self.board[y, x // WORD_BITS] &= ~bit
@@ -0,0 +1,88 @@
+from collections.abc import MutableSet
+import numpy as np
+
+
+def coords_from_cells(cells):
+    """Convert an iterable of (col, row) tuples into ``(xs, ys)`` int arrays."""
+    coords = np.fromiter(
+        (c for cell in cells for c in cell), dtype=np.int64
+    ).reshape(-1, 2)
+    return coords[:, 0], coords[:, 1]
+
+
+def _coord_keys(xs, ys):
+    """One int64 per cell, for coordinates that fit in 32 bits."""
+    return (xs.astype(np.int64) << 32) | (ys.astype(np.int64) & 0xFFFFFFFF)
+
+
+def coords_difference(a, b):
+    """
+    Cells of ``a`` that aren't in ``b``, both ``(xs, ys)`` arrays of
+    distinct cells.
+    """
+    keep = ~np.isin(_coord_keys(*a), _coord_keys(*b), assume_unique=True)
+    return a[0][keep], a[1][keep]
+
+
+class CellSet(MutableSet):
+    """
+    Set-like view over the live cells of a grid-backed engine.
+
+    Lets code written against ``LifeSimulation.positions`` (add, remove,
+    clear, ``in``, ``len``, iteration, set difference) work unchanged on
+    engines that don't store their board as a set of tuples.
+
+    The engine must provide ``_has_cell(x, y)``, ``_set_cell(x, y, alive)``,
+    ``live_cells()``, ``population`` and ``clear()``.
+    """
+
+    __slots__ = ("engine",)
+
+    def __init__(self, engine):
+        self.engine = engine
+
+
+    @classmethod
+    def _from_iterable(cls, it):
+        # Results of set operations are plain sets, not new views
+        return set(it)
+
+
+    def __contains__(self, pos):
+        x, y = pos
+        return self.engine._has_cell(x, y)
+
+
+    def __iter__(self):
+        xs, ys = self.engine.live_cells()
+        return zip(xs.tolist(), ys.tolist())
+
+
+    def __len__(self):
+        return self.engine.population
+
+
+    def __repr__(self):
+        return f"CellSet({len(self)} cells)"
+
+
+    def add(self, pos):
+        x, y = pos
+        self.engine._set_cell(x, y, True)
+
+
+    def discard(self, pos):
+        x, y = pos
+        self.engine._set_cell(x, y, False)
+
+
+    def clear(self):
+        self.engine.clear()
+
+
+    def live_cells(self, *region):
+        """
+        Bulk export as ``(xs, ys)`` NumPy arrays; see the engine's docs.
+        Engines on an unbounded plane also take a ``x0, y0, x1, y1`` region.
+        """
+        return self.engine.live_cells(*region)
@@ -0,0 +1,318 @@
+from collections import defaultdict
+import numpy as np
+from engines.cellset import CellSet, coords_from_cells
+from engines.density import density_from_coords
+from rules import CONWAY, compile_rule
+
+
+class ChunkedSimulation:
+    """
+    Sparse engine that only re-evaluates active tiles.
+
+    The plane is split into ``tile_size`` x ``tile_size`` tiles, each holding
+    the set of its live cells. A step only recomputes tiles that changed in
+    the previous generation (``dirty_tiles``), plus neighbors whose border a
+    change actually touched; every other tile is known to be unchanged and
+    is carried over as is. On a settled board the cost follows activity,
+    not population.
+
+    ``dirty_tiles`` is public so a renderer can repaint only those tiles.
+    The tiles also serve as a spatial index: ``live_cells()`` over a
+    rectangle only visits the tiles it overlaps.
+
+    Set ``track_changes`` to have ``step()`` leave the generation's
+    ``births`` and ``deaths`` as ``(xs, ys)`` arrays; they come straight
+    from the tiles that changed.
+
+    :param unbounded: run on an infinite plane; ``width`` and ``height``
+        then only describe the viewport and never clip cells
+    """
+
+    def __init__(self, width, height, rule=CONWAY, tile_size=32, unbounded=False):
+        self.width = width
+        self.height = height
+        self.unbounded = unbounded
+        self.tile_size = tile_size
+        self.generations = 0
+        self.rule = compile_rule(rule)
+        self.track_changes = False
+        self.births = self.deaths = None
+
+        self._tiles = {}            # {(tx, ty): {(col, row), ...}}
+        self._population = 0
+        self.dirty_tiles = set()    # tiles changed by the last step or edits
+        self._awake = set()         # tiles to recompute on the next step
+
+
+    @property
+    def positions(self):
+        """Live cells as a set-like view of ``(col, row)`` tuples."""
+        return CellSet(self)
+
+
+    @positions.setter
+    def positions(self, cells):
+        self.clear()
+        self.add_cells(cells)
+
+
+    @property
+    def population(self):
+        return self._population
+
+
+    def clear(self):
+        # An empty board has nothing to recompute, but the renderer must
+        # still learn which tiles were wiped
+        self.dirty_tiles.update(self._tiles)
+        self._tiles.clear()
+        self._population = 0
+
+
+    def add_cells(self, cells):
+        """
+        Bulk-insert live cells, ignoring any that fall outside the board.
+
+        :param cells: iterable of (col, row) tuples
+        """
+        for x, y in cells:
+            self._set_cell(x, y, True)
+
+
+    def add_coords(self, xs, ys):
+        """
+        Bulk-insert live cells given as coordinate arrays, ignoring any that
+        fall outside the board.
+
+        :param xs: int array of columns
+        :param ys: int array of rows
+        """
+        self.add_cells(zip(xs.tolist(), ys.tolist()))
+
+
+    def live_cells(self, x0=None, y0=None, x1=None, y1=None):
+        """
+        Return live cells as two int arrays ``(xs, ys)``: all of them, or
+        only those inside ``[x0, x1) x [y0, y1)``. A rectangle costs time
+        in proportion to the tiles it overlaps, not to the population.
+        """
+        if x0 is None:
+            tiles = self._tiles.values()
+        else:
+            tiles = [tile for _, tile in self._tiles_in(x0, y0, x1, y1)]
+
+        cells = [pos for tile in tiles for pos in tile]
+        coords = np.array(cells, dtype=np.int64).reshape(-1, 2)
+        xs, ys = coords[:, 0], coords[:, 1]
+        if x0 is not None:
+            # Tiles on the rectangle's edge stick out of it
+            inside = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+            xs, ys = xs[inside], ys[inside]
+        return xs, ys
+
+
+    def density(self, x0, y0, cols, rows, block):
+        """
+        Live cells per ``block`` square (see ``engines.density``). When a
+        block holds whole tiles, only tile sizes are summed.
+        """
+        x1, y1 = x0 + cols * block, y0 + rows * block
+        ts = self.tile_size
+        if block % ts:
+            xs, ys = self.live_cells(x0, y0, x1, y1)
+            return density_from_coords(xs, ys, x0, y0, cols, rows, block)
+        tiles = self._tiles_in(x0, y0, x1, y1)
+        xs = np.array([tx * ts for (tx, _), _ in tiles], dtype=np.int64)
+        ys = np.array([ty * ts for (_, ty), _ in tiles], dtype=np.int64)
+        sizes = [len(tile) for _, tile in tiles]
+        return density_from_coords(xs, ys, x0, y0, cols, rows, block, weights=sizes)
+
+
+    def _tiles_in(self, x0, y0, x1, y1):
+        """``(key, cells)`` of the live tiles overlapping ``[x0, x1) x [y0, y1)``."""
+        ts = self.tile_size
+        tx0, ty0 = x0 // ts, y0 // ts
+        tx1, ty1 = (x1 - 1) // ts, (y1 - 1) // ts
+        tiles = self._tiles
+        if (tx1 - tx0 + 1) * (ty1 - ty0 + 1) > len(tiles):
+            # Fewer live tiles than tiles in the rectangle: scan those
+            return [
+                (t, tile) for t, tile in tiles.items()
+                if tx0 <= t[0] <= tx1 and ty0 <= t[1] <= ty1
+            ]
+        return [
+            (t, tiles[t])
+            for t in (
+                (tx, ty) for ty in range(ty0, ty1 + 1) for tx in range(tx0, tx1 + 1)
+            )
+            if t in tiles
+        ]
+
+
+    def _neighbor_tiles(self, tiles):
+        """``tiles`` plus every tile touching one of them."""
+        grown = set()
+        for tx, ty in tiles:
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    grown.add((tx + dx, ty + dy))
+        return grown
+
+
+    def _wake_around(self, x, y):
+        """Schedule every tile within one cell of (x, y) for recompute."""
+        ts = self.tile_size
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                self._awake.add(((x + dx) // ts, (y + dy) // ts))
+
+
+    def step(self):
+        """Advance the simulation by one generation."""
+        self.dirty_tiles = self._next_generation()
+        self.generations += 1
+
+
+    def _next_generation(self):
+        """
+        Recompute awake tiles in place and return the set that changed.
+        """
+        ts = self.tile_size
+        tiles = self._tiles
+        cols = (self.width + ts - 1) // ts
+        rows = (self.height + ts - 1) // ts
+        if self.unbounded:
+            active = self._awake
+        else:
+            active = {
+                (tx, ty) for tx, ty in self._awake if 0 <= tx < cols and 0 <= ty < rows
+            }
+        self._awake = set()
+        ring = self._neighbor_tiles(active) - active
+
+        # Count neighbors contributed by every cell that can touch an active
+        # tile: all cells inside active tiles, plus edge cells of the ring
+        neighbor_counts = defaultdict(int)
+        sources = [tiles[t] for t in active if t in tiles]
+        born, survives = self.rule.table
+        if survives[0]:
+            # Under S0 isolated live cells survive, so count them in at 0
+            for cells in sources:
+                neighbor_counts.update(dict.fromkeys(cells, 0))
+        for t in ring:
+            if t in tiles:
+                sources.append(
+                    [
+                        (x, y) for x, y in tiles[t]
+                        if x % ts in (0, ts - 1) or y % ts in (0, ts - 1)
+                    ]
+                )
+
+        width, height, unbounded = self.width, self.height, self.unbounded
+        for cells in sources:
+            for x, y in cells:
+                for dx in (-1, 0, 1):
+                    for dy in (-1, 0, 1):
+                        if dx == 0 and dy == 0:
+                            continue
+                        nx, ny = x + dx, y + dy
+                        if unbounded or (0 <= nx < width and 0 <= ny < height):
+                            neighbor_counts[(nx, ny)] += 1
+
+        # Apply the rule, keeping only cells that land in active tiles
+        new_tiles = {t: set() for t in active}
+        for pos, count in neighbor_counts.items():
+            t = (pos[0] // ts, pos[1] // ts)
+            tile = new_tiles.get(t)
+            if tile is None:
+                continue
+            if (survives if pos in tiles.get(t, ()) else born)[count]:
+                tile.add(pos)
+
+        changed = set()
+        births, deaths = [], []
+        for t, new in new_tiles.items():
+            old = tiles.get(t, set())
+            if new == old:
+                continue
+            changed.add(t)
+            for x, y in new ^ old:
+                self._wake_around(x, y)
+            if self.track_changes:
+                births.extend(new - old)
+                deaths.extend(old - new)
+            self._population += len(new) - len(old)
+            if new:
+                tiles[t] = new
+            else:
+                tiles.pop(t, None)
+        if self.track_changes:
+            self.births = coords_from_cells(births)
+            self.deaths = coords_from_cells(deaths)
+        return changed
+
+
+    def update_grid_size(self, width, height, tile_size):
+        """
+        Update the grid size based on screen dimensions and tile size.
+        Cells that no longer fit on the board are dropped (on an unbounded
+        plane only the viewport changes).
+
+        :param width: screen width in pixels
+        :param height: screen height in pixels
+        :param tile_size: size of each cell in pixels (zoom level)
+        """
+        new_width = int(width // tile_size)
+        new_height = int(height // tile_size)
+        if (new_width, new_height) == (self.width, self.height):
+            return
+
+        self.width = new_width
+        self.height = new_height
+        if self.unbounded:
+            return
+        for t, cells in list(self._tiles.items()):
+            kept = {(x, y) for x, y in cells if x < new_width and y < new_height}
+            self._population -= len(cells) - len(kept)
+            if kept:
+                self._tiles[t] = kept
+            else:
+                del self._tiles[t]
+
+        # The board edge moved, so every remaining tile needs a fresh look
+        self.dirty_tiles.update(self._tiles)
+        self._awake.update(self._tiles)
+
+
+    # -------------------------------------------------
+    # CellSet hooks
+    # -------------------------------------------------
+    def _has_cell(self, x, y):
+        tile = self._tiles.get((x // self.tile_size, y // self.tile_size))
+        return tile is not None and (x, y) in tile
+
+
+    def _set_cell(self, x, y, alive):
+        if not self.unbounded and not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        t = (x // self.tile_size, y // self.tile_size)
+        tile = self._tiles.get(t)
+        pos = (x, y)
+
+        if alive:
+            if tile is None:
+                tile = self._tiles[t] = set()
+            if pos in tile:
+                return
+            tile.add(pos)
+            self._population += 1
+        else:
+            if tile is None or pos not in tile:
+                return
+            tile.remove(pos)
+            self._population -= 1
+            if not tile:
+                del self._tiles[t]
+
+        self.dirty_tiles.add(t)
+        self._wake_around(x, y)
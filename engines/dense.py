@@ -0,0 +1,248 @@
+import numpy as np
+from engines.cellset import CellSet, coords_from_cells
+from engines.density import density_from_board
+from rules import CONWAY, compile_rule
+
+
+def count_neighbors(padded, out):
+    """
+    Sum the eight neighbors of every interior cell of a zero-padded board,
+    or of each board in a stack of them.
+
+    :param padded: uint8 array of shape (..., h + 2, w + 2)
+    :param out: uint8 array of shape (..., h, w) that receives the counts
+    """
+    np.add(padded[..., :-2, :-2], padded[..., :-2, 1:-1], out=out)
+    out += padded[..., :-2, 2:]
+    out += padded[..., 1:-1, :-2]
+    out += padded[..., 1:-1, 2:]
+    out += padded[..., 2:, :-2]
+    out += padded[..., 2:, 1:-1]
+    out += padded[..., 2:, 2:]
+    return out
+
+
+def rule_terms(rule):
+    """
+    Compile a rule's (state, count) table into the list of neighbor counts
+    that produce a live cell, each tagged with the state it requires:
+    ``None`` (either), ``1`` (alive, survival only) or ``0`` (dead, birth only).
+    """
+    terms = []
+    for count in range(9):
+        born, survives = rule.table[0][count], rule.table[1][count]
+        if born and survives:
+            terms.append((count, None))
+        elif survives:
+            terms.append((count, 1))
+        elif born:
+            terms.append((count, 0))
+    return terms
+
+
+def apply_rule(counts, board, terms, out=None, scratch=None):
+    """
+    Return the next uint8 board from neighbor counts.
+
+    Each compiled term costs one vectorized compare, so Conway costs two
+    and Day & Night five, with no per-cell branching. (Fancy-indexing an
+    18-entry table measured roughly twice as slow as this in NumPy.)
+
+    :param out: uint8 array to write the result into (not ``board``)
+    :param scratch: bool array of the same shape for each term's matches
+    """
+    alive = board.view(bool)
+    if out is None:
+        result = np.zeros(counts.shape, dtype=bool)
+    else:
+        result = out.view(bool)
+        result.fill(False)
+    hit = np.empty(counts.shape, dtype=bool) if scratch is None else scratch
+    for count, state in terms:
+        np.equal(counts, count, out=hit)
+        if state == 1:
+            hit &= alive
+        elif state == 0:
+            # hit and not alive
+            np.greater(hit, alive, out=hit)
+        result |= hit
+    return result.view(np.uint8)
+
+
+def board_changes(old, new):
+    """
+    Cells that differ between two ``(height, width)`` uint8 boards.
+
+    :return: ``(births, deaths)``, each an ``(xs, ys)`` pair of int arrays
+    """
+    ys, xs = np.nonzero(old != new)
+    born = new[ys, xs].view(bool)
+    return (xs[born], ys[born]), (xs[~born], ys[~born])
+
+
+class DenseSimulation:
+    """
+    Game of Life on a dense NumPy board.
+
+    Drop-in replacement for ``LifeSimulation``: the board is a uint8 array
+    indexed ``[row, col]`` and neighbor counts are computed with eight
+    shifted-array sums, so step cost depends on board area instead of on
+    how many cells are alive. Cells outside the board are always dead.
+
+    Set ``track_changes`` to have ``step()`` leave the generation's
+    ``births`` and ``deaths`` as ``(xs, ys)`` arrays.
+    """
+
+    def __init__(self, width, height, rule=CONWAY):
+        self.width = width
+        self.height = height
+        self.generations = 0
+        self.track_changes = False
+        self.births = self.deaths = None
+        self.rule = compile_rule(rule)
+        self._terms = rule_terms(self.rule)
+        self.board = np.zeros((height, width), dtype=np.uint8)
+        self._allocate_buffers()
+
+
+    def _allocate_buffers(self):
+        # Reused every step so stepping doesn't allocate full-board arrays:
+        # the next generation is written into the back board, which then
+        # swaps places with the current one
+        self._padded = np.zeros((self.height + 2, self.width + 2), dtype=np.uint8)
+        self._counts = np.zeros((self.height, self.width), dtype=np.uint8)
+        self._hit = np.zeros((self.height, self.width), dtype=bool)
+        self._back = np.zeros((self.height, self.width), dtype=np.uint8)
+
+
+    @property
+    def positions(self):
+        """Live cells as a set-like view of ``(col, row)`` tuples."""
+        return CellSet(self)
+
+
+    @positions.setter
+    def positions(self, cells):
+        self.clear()
+        self.add_cells(cells)
+
+
+    @property
+    def population(self):
+        return int(np.count_nonzero(self.board))
+
+
+    def clear(self):
+        self.board.fill(0)
+
+
+    def live_cells(self):
+        """Return live cells as two int arrays ``(xs, ys)``."""
+        ys, xs = np.nonzero(self.board)
+        return xs, ys
+
+
+    def density(self, x0, y0, cols, rows, block):
+        """Live cells per ``block`` square; see ``engines.density``."""
+        return density_from_board(self.board, x0, y0, cols, rows, block)
+
+
+    def add_cells(self, cells):
+        """
+        Bulk-insert live cells, ignoring any that fall outside the board.
+
+        :param cells: iterable of (col, row) tuples
+        """
+        self.add_coords(*coords_from_cells(cells))
+
+
+    def add_coords(self, xs, ys):
+        """
+        Bulk-insert live cells given as coordinate arrays, ignoring any that
+        fall outside the board.
+
+        :param xs: int array of columns
+        :param ys: int array of rows
+        """
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        self.board[ys[inside], xs[inside]] = 1
+
+
+    def packed_board(self):
+        """
+        The board bit-packed like ``BitPackedSimulation``: one row of
+        little-endian uint64 words per board row.
+        """
+        words = (self.width + 63) // 64
+        packed = np.zeros((self.height, words * 8), dtype=np.uint8)
+        packed[:, :(self.width + 7) // 8] = np.packbits(self.board, axis=1, bitorder="little")
+        return packed.view("<u8")
+
+
+    def load_packed(self, board):
+        """Replace the board with a bit-packed ``(height, words)`` uint64 one."""
+        if board.shape != (self.height, (self.width + 63) // 64):
+            raise ValueError(f"board shape {board.shape} doesn't match this board")
+        # Unpack a band of rows at a time so the temporary stays small
+        for top in range(0, self.height, 1024):
+            rows = board[top:top + 1024]
+            self.board[top:top + rows.shape[0]] = np.unpackbits(
+                rows.view(np.uint8), axis=1, count=self.width, bitorder="little"
+            )
+
+
+    def step(self):
+        """Advance the simulation by one generation."""
+        old, self.board = self.board, self._next_generation()
+        self._back = old
+        if self.track_changes:
+            self.births, self.deaths = board_changes(old, self.board)
+        self.generations += 1
+
+
+    def _next_generation(self):
+        """Apply the rule to the whole board at once."""
+        self._padded[1:-1, 1:-1] = self.board
+        count_neighbors(self._padded, self._counts)
+        return apply_rule(
+            self._counts, self.board, self._terms, out=self._back, scratch=self._hit
+        )
+
+
+    def update_grid_size(self, width, height, tile_size):
+        """
+        Update the grid size based on screen dimensions and tile size.
+        Cells that no longer fit on the board are dropped.
+
+        :param width: screen width in pixels
+        :param height: screen height in pixels
+        :param tile_size: size of each cell in pixels (zoom level)
+        """
+        new_width = int(width // tile_size)
+        new_height = int(height // tile_size)
+        if (new_width, new_height) == (self.width, self.height):
+            return
+
+        board = np.zeros((new_height, new_width), dtype=np.uint8)
+        keep_h = min(new_height, self.height)
+        keep_w = min(new_width, self.width)
+        board[:keep_h, :keep_w] = self.board[:keep_h, :keep_w]
+
+        self.board = board
+        self.width = new_width
+        self.height = new_height
+        self._allocate_buffers()
+
+
+    # -------------------------------------------------
+    # CellSet hooks
+    # -------------------------------------------------
+    def _has_cell(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.board[y, x])
+        return False
+
+
+    def _set_cell(self, x, y, alive):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.board[y, x] = 1 if alive else 0
@@ -0,0 +1,103 @@
+"""
+Block population counts for zoomed-out rendering.
+
+Each function counts the live cells in a ``rows`` x ``cols`` grid of
+``block`` x ``block`` squares whose top-left square starts at cell
+``(x0, y0)``, and returns them as a ``(rows, cols)`` int32 array. ``x0``
+and ``y0`` must be multiples of ``block``. The array-backed variants are
+whole-array reductions; engines with a spatial index (tiles, quadtree
+nodes) instead sum per-region populations they already keep, so the cost
+follows the number of blocks rather than the number of cells.
+"""
+import numpy as np
+
+
+def _block_range(start, count, block, size):
+    """
+    Blocks ``[first, last)`` of ``count`` starting at cell ``start`` that
+    overlap ``[0, size)``, and the cell range they cover on the board.
+    """
+    first = max(0, -start // block)
+    last = min(count, -(-(size - start) // block))
+    return first, last, start + first * block, min(size, start + last * block)
+
+
+def _block_sums(a, block, axis):
+    """
+    Sum runs of ``block`` entries of a 2-D array along ``axis``; a short
+    last run (the board's edge) is summed too.
+    """
+    a = np.moveaxis(a, axis, 0)
+    full = a.shape[0] - a.shape[0] % block
+    sums = a[:full].reshape(-1, block, a.shape[1]).sum(axis=1, dtype=np.int32)
+    if full < a.shape[0]:
+        sums = np.concatenate([sums, a[full:].sum(axis=0, dtype=np.int32, keepdims=True)])
+    return np.moveaxis(sums, 0, axis)
+
+
+def density_from_coords(xs, ys, x0, y0, cols, rows, block, weights=None):
+    """
+    Block counts from live-cell coordinates.
+
+    :param weights: optional population per coordinate (e.g. per quadtree
+        node or tile corner) instead of one cell each
+    """
+    cx = (xs - x0) // block
+    cy = (ys - y0) // block
+    inside = (cx >= 0) & (cx < cols) & (cy >= 0) & (cy < rows)
+    if weights is not None:
+        weights = np.asarray(weights)[inside]
+    counts = np.bincount(
+        cy[inside] * cols + cx[inside], weights=weights, minlength=rows * cols
+    )
+    return counts.astype(np.int32).reshape(rows, cols)
+
+
+def density_from_board(board, x0, y0, cols, rows, block):
+    """Block counts from a ``(height, width)`` uint8 board of 0s and 1s."""
+    counts = np.zeros((rows, cols), dtype=np.int32)
+    height, width = board.shape
+    r0, r1, top, bottom = _block_range(y0, rows, block, height)
+    c0, c1, left, right = _block_range(x0, cols, block, width)
+    if r0 >= r1 or c0 >= c1:
+        return counts
+
+    # Rows first, while the array is still contiguous
+    summed = _block_sums(board[top:bottom, left:right], block, 0)
+    counts[r0:r1, c0:c1] = _block_sums(summed, block, 1)
+    return counts
+
+
+def density_from_packed(board, width, x0, y0, cols, rows, block):
+    """
+    Block counts from a bit-packed ``(height, words)`` little-endian uint64
+    board (``BitPackedSimulation``'s layout), by popcount of the bit groups
+    each block covers; nothing is unpacked.
+    """
+    counts = np.zeros((rows, cols), dtype=np.int32)
+    height = board.shape[0]
+    r0, r1, top, bottom = _block_range(y0, rows, block, height)
+    c0, c1, left, right = _block_range(x0, cols, block, width)
+    if r0 >= r1 or c0 >= c1:
+        return counts
+
+    # Popcount groups of `group` bits: whole 8..64-bit lanes where the block
+    # allows, else masked fields of each byte
+    group = min(block, 64)
+    band = np.ascontiguousarray(board[top:bottom])
+    if group >= 8:
+        bits = np.bitwise_count(band.view(f"<u{group // 8}"))
+    else:
+        octets = band.view(np.uint8)
+        fields = [
+            np.bitwise_count(octets & np.uint8(((1 << group) - 1) << shift))
+            for shift in range(0, 8, group)
+        ]
+        bits = np.stack(fields, axis=-1).reshape(bottom - top, -1)
+
+    bits = bits[:, left // group:-(-right // group)]
+    summed = _block_sums(bits, block, 0)
+    if block > group:
+        summed = _block_sums(summed, block // group, 1)
+    counts[r0:r1, c0:c1] = summed
+    return counts
@@ -0,0 +1,465 @@
+import numpy as np
+from engines.cellset import CellSet, coords_difference
+from engines.density import density_from_coords
+from rules import CONWAY, compile_rule
+
+
+class _Node:
+    """
+    Canonical quadtree node. Level 0 nodes are single cells; a level ``k``
+    node covers a ``2**k`` square split into four level ``k - 1`` children.
+    Nodes are interned, so identical subtrees are the same object.
+    """
+
+    __slots__ = ("nw", "ne", "sw", "se", "level", "population")
+
+    def __init__(self, nw, ne, sw, se, level, population):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+
+# (dy, dx) offsets in Rule.table512 bit order
+_NEIGHBORHOOD = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+_OFF = _Node(None, None, None, None, 0, 0)
+_ON = _Node(None, None, None, None, 0, 1)
+
+
+class HashLifeSimulation:
+    """
+    HashLife engine: a canonicalized quadtree with a memoized RESULT cache.
+
+    Repetitive patterns are evaluated once per distinct subtree, so
+    ``step_pow2(k)`` can jump ``2**k`` generations at roughly the cost of a
+    single one. The plane is unbounded; ``width`` and ``height`` only set
+    the viewport that ``positions`` / ``live_cells()`` enumerate.
+
+    Set ``track_changes`` to have ``step()`` leave the births and deaths
+    inside ``changes_region`` (``(x0, y0, x1, y1)``, the viewport when
+    None) as ``(xs, ys)`` arrays. A plane can be far bigger than anything
+    shown, so only that rectangle is compared: its cells after each step
+    are kept as the next step's "before", so each step walks the tree
+    over the rectangle once.
+
+    :param rule: Life-like rulestring or ``Rule`` (B0 rules are rejected)
+    :param cache_size: maximum number of memoized RESULT entries. When it
+        is exceeded, the cache is flushed and nodes no longer reachable from
+        the current pattern are dropped.
+    :param unbounded: accepted like the other unbounded-capable engines;
+        the plane is always unbounded
+    """
+
+    MIN_LEVEL = 3
+
+    def __init__(self, width, height, rule=CONWAY, cache_size=1_000_000, unbounded=True):
+        if not unbounded:
+            raise ValueError("HashLife's plane is always unbounded")
+        self.width = width
+        self.height = height
+        self.unbounded = True
+        self.cache_size = cache_size
+        self.generations = 0
+        self.rule = compile_rule(rule)
+        self.track_changes = False
+        self.changes_region = None
+        self.births = self.deaths = None
+
+        self._nodes = {}
+        self._results = {}
+        self._empty = [_OFF]
+        self.clear()
+
+
+    # -------------------------------------------------
+    # Node construction
+    # -------------------------------------------------
+    def _join(self, nw, ne, sw, se):
+        """Return the canonical node with the given children."""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = _Node(
+                nw, ne, sw, se,
+                nw.level + 1,
+                nw.population + ne.population + sw.population + se.population,
+            )
+            self._nodes[key] = node
+        return node
+
+
+    def _empty_node(self, level):
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self._join(e, e, e, e))
+        return self._empty[level]
+
+
+    def _centre(self, node):
+        """Level ``k - 1`` node covering the middle of a level ``k`` node."""
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+
+    def _expand(self):
+        """Grow the root one level, keeping the old root in the middle."""
+        root = self.root
+        e = self._empty_node(root.level - 1)
+        self.root = self._join(
+            self._join(e, e, e, root.nw),
+            self._join(e, e, root.ne, e),
+            self._join(e, root.sw, e, e),
+            self._join(root.se, e, e, e),
+        )
+        half = 1 << (root.level - 1)
+        self._origin_x -= half
+        self._origin_y -= half
+
+
+    def _is_padded(self, node):
+        """True when every live cell sits in the centre half of ``node``."""
+        return self._centre(self._centre(node)).population == node.population
+
+
+    def _trim(self):
+        """Shrink the root while its border quadrants are empty."""
+        while self.root.level > self.MIN_LEVEL:
+            centre = self._centre(self.root)
+            if centre.population != self.root.population:
+                break
+            quarter = 1 << (self.root.level - 2)
+            self.root = centre
+            self._origin_x += quarter
+            self._origin_y += quarter
+
+
+    # -------------------------------------------------
+    # Evolution
+    # -------------------------------------------------
+    def _life_4x4(self, node):
+        """Base case: advance the centre 2x2 of a 4x4 node by one generation."""
+        cells = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+        table = self.rule.table512
+        out = []
+        for y in (1, 2):
+            for x in (1, 2):
+                # Pack the 3x3 neighborhood into a 9-bit table index
+                index = 0
+                for bit, (dy, dx) in enumerate(_NEIGHBORHOOD):
+                    index |= cells[y + dy][x + dx].population << bit
+                out.append(_ON if table[index] else _OFF)
+        return self._join(*out)
+
+
+    def _successor(self, node, j):
+        """
+        RESULT of a level ``k`` node: its centre (level ``k - 1``) advanced
+        ``2**j`` generations, for ``0 <= j <= k - 2``.
+        """
+        if node.population == 0:
+            return self._empty_node(node.level - 1)
+
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            join = self._join
+            # Nine overlapping level k - 1 nodes
+            n00 = nw
+            n01 = join(nw.ne, ne.nw, nw.se, ne.sw)
+            n02 = ne
+            n10 = join(nw.sw, nw.se, sw.nw, sw.ne)
+            n11 = join(nw.se, ne.sw, sw.ne, se.nw)
+            n12 = join(ne.sw, ne.se, se.nw, se.ne)
+            n20 = sw
+            n21 = join(sw.ne, se.nw, sw.se, se.sw)
+            n22 = se
+
+            nine = (n00, n01, n02, n10, n11, n12, n20, n21, n22)
+            step = self._successor
+            if j == node.level - 2:
+                # Full speed: advance half the time in each of two stages
+                stage = j - 1
+                first = [step(n, stage) for n in nine]
+            else:
+                # Slower than full speed: the first stage only re-centres
+                stage = j
+                first = [self._centre(n) for n in nine]
+
+            c00, c01, c02, c10, c11, c12, c20, c21, c22 = first
+            result = join(
+                step(join(c00, c01, c10, c11), stage),
+                step(join(c01, c02, c11, c12), stage),
+                step(join(c10, c11, c20, c21), stage),
+                step(join(c11, c12, c21, c22), stage),
+            )
+
+        self._results[key] = result
+        return result
+
+
+    def step_pow2(self, k):
+        """Advance the simulation by ``2**k`` generations at once."""
+        self._tracked = None
+        while self.root.level < k + 2 or not self._is_padded(self.root):
+            self._expand()
+        # One extra ring of padding so nothing escapes in 2**k generations
+        self._expand()
+
+        quarter = 1 << (self.root.level - 2)
+        self.root = self._successor(self.root, k)
+        self._origin_x += quarter
+        self._origin_y += quarter
+        self.generations += 1 << k
+
+        self._trim()
+        if len(self._results) > self.cache_size:
+            self._collect_garbage()
+
+
+    def advance(self, generations):
+        """Advance by any number of generations, one power of two at a time."""
+        k = 0
+        while generations:
+            if generations & 1:
+                self.step_pow2(k)
+            generations >>= 1
+            k += 1
+
+
+    def step(self):
+        """Advance the simulation by one generation."""
+        if not self.track_changes:
+            self.step_pow2(0)
+            return
+
+        region = self.changes_region or (0, 0, self.width, self.height)
+        if self._tracked is not None and self._tracked[0] == region:
+            old = self._tracked[1]
+        else:
+            old = self.live_cells(*region)
+        self.step_pow2(0)
+        new = self.live_cells(*region)
+        self._tracked = (region, new)
+        self.births = coords_difference(new, old)
+        self.deaths = coords_difference(old, new)
+
+
+    def _collect_garbage(self):
+        """Flush the RESULT cache and drop nodes unreachable from the root."""
+        self._results.clear()
+        old_nodes = self._nodes
+        self._nodes = {}
+        self._empty = [_OFF]
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in self._nodes:
+                continue
+            self._nodes[key] = old_nodes.get(key, node)
+            stack.extend(key)
+
+
+    # -------------------------------------------------
+    # Public surface shared with LifeSimulation
+    # -------------------------------------------------
+    @property
+    def positions(self):
+        """
+        Live cells as a set-like view of ``(col, row)`` tuples. ``len()`` is
+        the total population; iteration only covers the viewport.
+        """
+        return CellSet(self)
+
+
+    @positions.setter
+    def positions(self, cells):
+        self.clear()
+        self.add_cells(cells)
+
+
+    @property
+    def population(self):
+        return self.root.population
+
+
+    def clear(self):
+        self._tracked = None        # (region, cells) as of the last step
+        self.root = self._empty_node(self.MIN_LEVEL)
+        self._origin_x = 0
+        self._origin_y = 0
+
+
+    def add_cells(self, cells):
+        """
+        Bulk-insert live cells anywhere on the plane.
+
+        :param cells: iterable of (col, row) tuples
+        """
+        for x, y in cells:
+            self._set_cell(x, y, True)
+
+
+    def add_coords(self, xs, ys):
+        """
+        Bulk-insert live cells given as coordinate arrays, anywhere on the plane.
+
+        :param xs: int array of columns
+        :param ys: int array of rows
+        """
+        self.add_cells(zip(xs.tolist(), ys.tolist()))
+
+
+    def live_cells(self, x0=0, y0=0, x1=None, y1=None):
+        """
+        Return live cells inside ``[x0, x1) x [y0, y1)`` (the viewport by
+        default) as two int arrays ``(xs, ys)``. Only nodes that intersect
+        the rectangle and contain live cells are expanded.
+        """
+        x1 = self.width if x1 is None else x1
+        y1 = self.height if y1 is None else y1
+        xs, ys = [], []
+
+        stack = [(self.root, self._origin_x, self._origin_y)]
+        while stack:
+            node, x, y = stack.pop()
+            if node.population == 0:
+                continue
+            size = 1 << node.level
+            if x >= x1 or y >= y1 or x + size <= x0 or y + size <= y0:
+                continue
+            if node.level == 0:
+                xs.append(x)
+                ys.append(y)
+                continue
+            half = size >> 1
+            stack.append((node.nw, x, y))
+            stack.append((node.ne, x + half, y))
+            stack.append((node.sw, x, y + half))
+            stack.append((node.se, x + half, y + half))
+
+        return np.array(xs, dtype=np.int64), np.array(ys, dtype=np.int64)
+
+
+    def density(self, x0, y0, cols, rows, block):
+        """
+        Live cells per ``block`` square (see ``engines.density``). The
+        descent stops at the first node that fits inside a single block and
+        uses its stored population, so the cost follows the blocks in view,
+        not the cells. Nodes needn't line up with the blocks (the root's
+        origin moves as it grows and shrinks), so one straddling a block
+        edge is split further.
+        """
+        x1, y1 = x0 + cols * block, y0 + rows * block
+        xs, ys, populations = [], [], []
+
+        stack = [(self.root, self._origin_x, self._origin_y)]
+        while stack:
+            node, x, y = stack.pop()
+            if node.population == 0:
+                continue
+            size = 1 << node.level
+            if x >= x1 or y >= y1 or x + size <= x0 or y + size <= y0:
+                continue
+            if (
+                (x - x0) // block == (x + size - 1 - x0) // block
+                and (y - y0) // block == (y + size - 1 - y0) // block
+            ):
+                xs.append(x)
+                ys.append(y)
+                populations.append(node.population)
+                continue
+            half = size >> 1
+            stack.append((node.nw, x, y))
+            stack.append((node.ne, x + half, y))
+            stack.append((node.sw, x, y + half))
+            stack.append((node.se, x + half, y + half))
+
+        return density_from_coords(
+            np.array(xs, dtype=np.int64), np.array(ys, dtype=np.int64),
+            x0, y0, cols, rows, block, weights=populations,
+        )
+
+
+    def update_grid_size(self, width, height, tile_size):
+        """
+        Update the viewport size based on screen dimensions and tile size.
+        The plane itself is unbounded, so no cells are dropped.
+
+        :param width: screen width in pixels
+        :param height: screen height in pixels
+        :param tile_size: size of each cell in pixels (zoom level)
+        """
+        self.width = int(width // tile_size)
+        self.height = int(height // tile_size)
+
+
+    # -------------------------------------------------
+    # CellSet hooks
+    # -------------------------------------------------
+    def _has_cell(self, x, y):
+        node = self.root
+        x -= self._origin_x
+        y -= self._origin_y
+        size = 1 << node.level
+        if not (0 <= x < size and 0 <= y < size):
+            return False
+        while node.level > 0:
+            if node.population == 0:
+                return False
+            half = 1 << (node.level - 1)
+            if y < half:
+                node = node.nw if x < half else node.ne
+            else:
+                node = node.sw if x < half else node.se
+            x %= half
+            y %= half
+        return node is _ON
+
+
+    def _set_cell(self, x, y, alive):
+        self._tracked = None
+        size = 1 << self.root.level
+        while not (
+            self._origin_x <= x < self._origin_x + size
+            and self._origin_y <= y < self._origin_y + size
+        ):
+            self._expand()
+            size = 1 << self.root.level
+        self.root = self._set(
+            self.root, x - self._origin_x, y - self._origin_y, alive
+        )
+
+
+    def _set(self, node, x, y, alive):
+        if node.level == 0:
+            return _ON if alive else _OFF
+        half = 1 << (node.level - 1)
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        if y < half:
+            if x < half:
+                nw = self._set(nw, x, y, alive)
+            else:
+                ne = self._set(ne, x - half, y, alive)
+        else:
+            if x < half:
+                sw = self._set(sw, x, y - half, alive)
+            else:
+                se = self._set(se, x - half, y - half, alive)
+        return self._join(nw, ne, sw, se)
@@ -0,0 +1,301 @@
+import multiprocessing as mp
+import os
+import threading
+from multiprocessing import connection, shared_memory
+from threading import BrokenBarrierError
+import numpy as np
+from engines.cellset import CellSet, coords_from_cells
+from engines.density import density_from_board
+from engines.dense import apply_rule, board_changes, count_neighbors, rule_terms
+from rules import CONWAY, compile_rule
+
+
+def _attach(name, shape):
+    """Map an existing shared-memory block as a uint8 board."""
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+
+
+def _strip_worker(names, shape, top, bottom, terms, front, stop, start, done):
+    """
+    Worker loop: on each ``start`` barrier, compute rows ``top:bottom`` of the
+    next generation from the front buffer into the back buffer, reading one
+    halo row above and below, then meet the others at ``done``.
+    """
+    height, width = shape
+    attached = [_attach(name, shape) for name in names]
+    shms = [shm for shm, _ in attached]
+    boards = [board for _, board in attached]
+    del attached
+
+    rows = bottom - top
+    padded = np.zeros((rows + 2, width + 2), dtype=np.uint8)
+    counts = np.zeros((rows, width), dtype=np.uint8)
+    hit = np.zeros((rows, width), dtype=bool)
+    src = dst = None
+
+    try:
+        while True:
+            start.wait()
+            if stop.value:
+                break
+            try:
+                src = boards[front.value]
+                dst = boards[1 - front.value]
+
+                padded[0, 1:-1] = src[top - 1] if top > 0 else 0
+                padded[-1, 1:-1] = src[bottom] if bottom < height else 0
+                padded[1:-1, 1:-1] = src[top:bottom]
+
+                count_neighbors(padded, counts)
+                apply_rule(counts, src[top:bottom], terms, out=dst[top:bottom], scratch=hit)
+            except Exception:
+                start.abort()
+                done.abort()
+                raise
+            done.wait()
+    except BrokenBarrierError:
+        pass
+    finally:
+        # Views must be dropped before the mappings can be closed
+        del boards, src, dst
+        for shm in shms:
+            shm.close()
+
+
+class ParallelSimulation:
+    """
+    Dense engine spread over a persistent pool of worker processes.
+
+    The board is double-buffered in ``multiprocessing.shared_memory``. Each
+    worker owns one horizontal strip; a step releases all workers through a
+    barrier, every worker writes its strip of the next generation into the
+    back buffer, and the buffers are swapped once all strips are done.
+
+    If a worker dies, both barriers are broken so ``step()`` raises
+    ``RuntimeError`` instead of waiting forever. Call ``close()`` to stop
+    the workers and free the shared memory.
+    ``track_changes`` works as in ``DenseSimulation``.
+
+    :param rule: Life-like rulestring or ``Rule``
+    :param workers: number of worker processes (defaults to the CPU count,
+        capped at the board height)
+    """
+
+    def __init__(self, width, height, rule=CONWAY, workers=None):
+        self.width = width
+        self.height = height
+        self.workers = workers or os.cpu_count() or 1
+        self.generations = 0
+        self.track_changes = False
+        self.births = self.deaths = None
+        self.rule = compile_rule(rule)
+        self._ctx = mp.get_context()
+        self._pool = []
+        self._start_pool()
+
+
+    # -------------------------------------------------
+    # Worker pool
+    # -------------------------------------------------
+    def _start_pool(self):
+        shape = (self.height, self.width)
+        size = max(1, self.width * self.height)
+        self._shm = [shared_memory.SharedMemory(create=True, size=size) for _ in range(2)]
+        self._boards = [
+            np.ndarray(shape, dtype=np.uint8, buffer=shm.buf) for shm in self._shm
+        ]
+        for board in self._boards:
+            board.fill(0)
+
+        self._front = self._ctx.Value("i", 0, lock=False)
+        self._stop = self._ctx.Value("b", 0, lock=False)
+
+        count = max(1, min(self.workers, self.height))
+        self._start = self._ctx.Barrier(count + 1)
+        self._done = self._ctx.Barrier(count + 1)
+
+        bounds = np.linspace(0, self.height, count + 1).astype(int)
+        names = [shm.name for shm in self._shm]
+        self._pool = [
+            self._ctx.Process(
+                target=_strip_worker,
+                args=(
+                    names, shape, int(top), int(bottom), rule_terms(self.rule),
+                    self._front, self._stop, self._start, self._done,
+                ),
+                daemon=True,
+            )
+            for top, bottom in zip(bounds[:-1], bounds[1:])
+        ]
+        for proc in self._pool:
+            proc.start()
+        threading.Thread(
+            target=self._watch_pool,
+            args=(self._pool, self._start, self._done),
+            daemon=True,
+        ).start()
+
+
+    @staticmethod
+    def _watch_pool(pool, start, done):
+        """
+        Break both barriers as soon as any worker exits, so a step waiting
+        on a dead worker fails instead of hanging. Workers also exit when
+        the pool is stopped, by which point the barriers are no longer used.
+        """
+        connection.wait([proc.sentinel for proc in pool])
+        start.abort()
+        done.abort()
+
+
+    def _stop_pool(self):
+        if not self._pool:
+            return
+        self._stop.value = 1
+        try:
+            self._start.wait(timeout=5)
+        except BrokenBarrierError:
+            pass
+        for proc in self._pool:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        self._pool = []
+
+        self._boards = []
+        for shm in self._shm:
+            try:
+                shm.close()
+            except BufferError:
+                pass  # a caller still holds a board view; unlink regardless
+            shm.unlink()
+        self._shm = []
+
+
+    def close(self):
+        """Shut down the worker pool and release the shared memory."""
+        self._stop_pool()
+
+
+    def __del__(self):
+        self._stop_pool()
+
+
+    @property
+    def board(self):
+        """The current generation as a (height, width) uint8 array."""
+        return self._boards[self._front.value]
+
+
+    # -------------------------------------------------
+    # Public surface shared with LifeSimulation
+    # -------------------------------------------------
+    @property
+    def positions(self):
+        """Live cells as a set-like view of ``(col, row)`` tuples."""
+        return CellSet(self)
+
+
+    @positions.setter
+    def positions(self, cells):
+        self.clear()
+        self.add_cells(cells)
+
+
+    @property
+    def population(self):
+        return int(np.count_nonzero(self.board))
+
+
+    def clear(self):
+        self.board.fill(0)
+
+
+    def add_cells(self, cells):
+        """
+        Bulk-insert live cells, ignoring any that fall outside the board.
+
+        :param cells: iterable of (col, row) tuples
+        """
+        self.add_coords(*coords_from_cells(cells))
+
+
+    def add_coords(self, xs, ys):
+        """
+        Bulk-insert live cells given as coordinate arrays, ignoring any that
+        fall outside the board.
+
+        :param xs: int array of columns
+        :param ys: int array of rows
+        """
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        self.board[ys[inside], xs[inside]] = 1
+
+
+    def live_cells(self):
+        """Return live cells as two int arrays ``(xs, ys)``."""
+        ys, xs = np.nonzero(self.board)
+        return xs, ys
+
+
+    def density(self, x0, y0, cols, rows, block):
+        """Live cells per ``block`` square; see ``engines.density``."""
+        return density_from_board(self.board, x0, y0, cols, rows, block)
+
+
+    def step(self):
+        """Advance the simulation by one generation across all workers."""
+        try:
+            self._start.wait()
+            self._done.wait()
+        except BrokenBarrierError:
+            codes = [proc.exitcode for proc in self._pool if not proc.is_alive()]
+            raise RuntimeError(
+                f"A simulation worker failed (exit codes: {codes}); "
+                "close() this engine and create a new one"
+            ) from None
+        self._front.value = 1 - self._front.value
+        if self.track_changes:
+            # The back buffer still holds the previous generation
+            self.births, self.deaths = board_changes(
+                self._boards[1 - self._front.value], self.board
+            )
+        self.generations += 1
+
+
+    def update_grid_size(self, width, height, tile_size):
+        """
+        Update the grid size based on screen dimensions and tile size.
+        Cells that no longer fit on the board are dropped, and the worker
+        pool is restarted around freshly sized shared buffers.
+
+        :param width: screen width in pixels
+        :param height: screen height in pixels
+        :param tile_size: size of each cell in pixels (zoom level)
+        """
+        new_width = int(width // tile_size)
+        new_height = int(height // tile_size)
+        if (new_width, new_height) == (self.width, self.height):
+            return
+
+        xs, ys = self.live_cells()
+        self._stop_pool()
+        self.width = new_width
+        self.height = new_height
+        self._start_pool()
+        self.add_cells(zip(xs.tolist(), ys.tolist()))
+
+
+    # -------------------------------------------------
+    # CellSet hooks
+    # -------------------------------------------------
+    def _has_cell(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.board[y, x])
+        return False
+
+
+    def _set_cell(self, x, y, alive):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.board[y, x] = 1 if alive else 0
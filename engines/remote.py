@@ -0,0 +1,376 @@
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from engines import create_simulation
+from engines.cellset import CellSet, coords_from_cells
+from engines.density import density_from_board
+from rules import CONWAY, compile_rule
+
+# Cap on how often the simulation process publishes a finished generation;
+# generations in between are still computed, just not copied out
+PUBLISH_INTERVAL = 1 / 240
+
+
+def _attach(name, shape):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+
+
+def _write_board(simulation, dst):
+    """Copy a simulation's current generation into a uint8 board."""
+    board = getattr(simulation, "board", None)
+    if board is not None and board.dtype == np.uint8 and board.shape == dst.shape:
+        np.copyto(dst, board)
+        return
+    dst.fill(0)
+    xs, ys = simulation.live_cells()
+    inside = (xs >= 0) & (xs < dst.shape[1]) & (ys >= 0) & (ys < dst.shape[0])
+    dst[ys[inside], xs[inside]] = 1
+
+
+def _simulation_process(names, shape, engine, options, front, generation, lock, inbox):
+    """
+    Simulation process: apply control messages, step while playing, and
+    publish finished generations into the back buffer before swapping it
+    to the front under ``lock``.
+    """
+    shms, boards = zip(*[_attach(name, shape) for name in names])
+    shms, boards = list(shms), list(boards)
+    simulation = create_simulation(engine, shape[1], shape[0], **options)
+
+    playing = False
+    interval = 0.0          # seconds per generation; 0 = as fast as possible
+    next_step = time.perf_counter()
+    last_publish = 0.0
+    edited = True           # messages applied since the last publish
+    pending = False         # generations stepped since the last publish
+
+    def publish():
+        back = 1 - front.value
+        _write_board(simulation, boards[back])
+        with lock:
+            front.value = back
+            generation.value = simulation.generations
+
+    try:
+        while True:
+            now = time.perf_counter()
+            if edited or (pending and not playing):
+                timeout = 0     # publish as soon as the queue is drained
+            elif playing:
+                timeout = max(0.0, next_step - now)
+                if pending:
+                    timeout = min(timeout, max(0.0, last_publish + PUBLISH_INTERVAL - now))
+            else:
+                timeout = None  # paused: sleep until a message arrives
+            try:
+                message = inbox.get(True, timeout) if timeout != 0 else inbox.get_nowait()
+            except queue.Empty:
+                message = None
+
+            if message is not None:
+                kind, *args = message
+                if kind == "stop":
+                    break
+                elif kind == "play":
+                    playing, rate = args
+                    interval = 1 / rate if rate else 0.0
+                    next_step = time.perf_counter()
+                elif kind == "pause":
+                    playing = False
+                elif kind == "step":
+                    simulation.step()
+                elif kind == "clear":
+                    simulation.clear()
+                elif kind == "set":
+                    x, y, alive = args
+                    if alive:
+                        simulation.positions.add((x, y))
+                    else:
+                        simulation.positions.discard((x, y))
+                elif kind == "add":
+                    simulation.add_coords(*args)
+                elif kind == "load":
+                    xs, ys = args
+                    simulation.clear()
+                    simulation.add_coords(xs, ys)
+                elif kind == "generations":
+                    simulation.generations = args[0]
+                elif kind == "resize":
+                    width, height, new_names = args
+                    boards.clear()
+                    for shm in shms:
+                        shm.close()
+                    shms, boards = zip(*[_attach(name, (height, width)) for name in new_names])
+                    shms, boards = list(shms), list(boards)
+                    simulation.update_grid_size(width, height, 1)
+                edited = True
+                continue
+
+            # Queue drained: publish if needed, then step if it's time
+            now = time.perf_counter()
+            if edited or (pending and (not playing or now - last_publish >= PUBLISH_INTERVAL)):
+                publish()
+                edited = pending = False
+                last_publish = now
+
+            if playing and now >= next_step:
+                simulation.step()
+                pending = True
+                # Don't try to catch up on time lost to slow generations
+                next_step = max(next_step + interval, time.perf_counter() - interval)
+    finally:
+        close = getattr(simulation, "close", None)
+        if close:
+            close()
+        # Views must be dropped before the mappings can be closed
+        boards.clear()
+        for shm in shms:
+            shm.close()
+
+
+class RemoteSimulation:
+    """
+    Runs another engine in a separate process so a slow generation never
+    stalls the render loop.
+
+    Finished generations are published into a double-buffered shared-memory
+    board; this side always reads the latest complete one. Edits, pause/
+    play, clears and pattern loads are sent over a queue. While playing,
+    the simulation steps on its own clock at the requested rate rather than
+    once per frame, so ``free_running`` is True.
+
+    :param engine: name of the engine to run in the simulation process
+    :param options: keyword arguments for that engine (e.g. ``rule``)
+    """
+
+    free_running = True
+
+    def __init__(self, width, height, engine="dense", **options):
+        self.width = width
+        self.height = height
+        self.rule = compile_rule(options.get("rule", CONWAY))
+        self._ctx = mp.get_context()
+
+        self._lock = self._ctx.Lock()
+        self._front = self._ctx.Value("i", 0, lock=False)
+        self._generation = self._ctx.Value("q", 0, lock=False)
+        self._inbox = self._ctx.Queue()
+        self._playing = None
+
+        self._shm = self._create_buffers(width, height)
+        self._board = np.zeros((height, width), dtype=np.uint8)
+        self._seen_generation = 0
+
+        self._process = self._ctx.Process(
+            target=_simulation_process,
+            args=(
+                [shm.name for shm, _ in self._shm], (height, width), engine, options,
+                self._front, self._generation, self._lock, self._inbox,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+
+
+    @staticmethod
+    def _create_buffers(width, height):
+        buffers = []
+        for _ in range(2):
+            shm = shared_memory.SharedMemory(create=True, size=max(1, width * height))
+            board = np.ndarray((height, width), dtype=np.uint8, buffer=shm.buf)
+            board.fill(0)
+            buffers.append((shm, board))
+        return buffers
+
+
+    @staticmethod
+    def _release_buffers(buffers):
+        for shm, _ in buffers:
+            try:
+                shm.close()
+            except BufferError:
+                pass
+            shm.unlink()
+
+
+    def close(self):
+        """Stop the simulation process and free the shared memory."""
+        if self._process is None:
+            return
+        self._inbox.put(("stop",))
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process = None
+        self._release_buffers(self._shm)
+        self._shm = []
+
+
+    def __del__(self):
+        self.close()
+
+
+    def _send(self, *message):
+        self._inbox.put(message)
+
+
+    def _refresh(self):
+        """Copy out the front buffer if a newer generation was published."""
+        if self._generation.value == self._seen_generation:
+            return
+        with self._lock:
+            np.copyto(self._board, self._shm[self._front.value][1])
+            self._seen_generation = self._generation.value
+
+
+    # -------------------------------------------------
+    # Playback control (used instead of step() while free running)
+    # -------------------------------------------------
+    def set_playing(self, playing, rate=None):
+        """
+        Start or pause free-running generations.
+
+        :param rate: target generations per second (None = unthrottled)
+        """
+        state = (playing, rate)
+        if state == self._playing:
+            return
+        self._playing = state
+        if playing:
+            self._send("play", True, rate)
+        else:
+            self._send("pause")
+
+
+    # -------------------------------------------------
+    # Public surface shared with LifeSimulation
+    # -------------------------------------------------
+    @property
+    def generations(self):
+        return self._generation.value
+
+
+    @generations.setter
+    def generations(self, value):
+        self._send("generations", value)
+        self._generation.value = value
+        self._seen_generation = value
+
+
+    @property
+    def board(self):
+        """Latest published generation as a (height, width) uint8 array."""
+        self._refresh()
+        return self._board
+
+
+    @property
+    def positions(self):
+        """Live cells as a set-like view of ``(col, row)`` tuples."""
+        return CellSet(self)
+
+
+    @positions.setter
+    def positions(self, cells):
+        xs, ys = self._inside(*coords_from_cells(cells))
+        self._board.fill(0)
+        self._board[ys, xs] = 1
+        self._send("load", xs, ys)
+
+
+    @property
+    def population(self):
+        return int(np.count_nonzero(self.board))
+
+
+    def step(self):
+        """Ask the simulation process for one generation (when paused)."""
+        self._send("step")
+
+
+    def clear(self):
+        self._board.fill(0)
+        self._send("clear")
+
+
+    def add_cells(self, cells):
+        """
+        Bulk-insert live cells, ignoring any that fall outside the board.
+
+        :param cells: iterable of (col, row) tuples
+        """
+        self.add_coords(*coords_from_cells(cells))
+
+
+    def _inside(self, xs, ys):
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        return xs[inside], ys[inside]
+
+
+    def add_coords(self, xs, ys):
+        """
+        Bulk-insert live cells given as coordinate arrays, ignoring any that
+        fall outside the board. Only the new cells are sent, and the
+        simulation process adds them to whatever generation it is on.
+        """
+        xs, ys = self._inside(xs, ys)
+        self._refresh()
+        self._board[ys, xs] = 1
+        self._send("add", xs, ys)
+
+
+    def live_cells(self):
+        """Return live cells as two int arrays ``(xs, ys)``."""
+        ys, xs = np.nonzero(self.board)
+        return xs, ys
+
+
+    def density(self, x0, y0, cols, rows, block):
+        """Live cells per ``block`` square; see ``engines.density``."""
+        return density_from_board(self.board, x0, y0, cols, rows, block)
+
+
+    def update_grid_size(self, width, height, tile_size):
+        """
+        Update the grid size based on screen dimensions and tile size. New
+        shared buffers are handed to the simulation process.
+        """
+        new_width = int(width // tile_size)
+        new_height = int(height // tile_size)
+        if (new_width, new_height) == (self.width, self.height):
+            return
+
+        board = np.zeros((new_height, new_width), dtype=np.uint8)
+        keep_h = min(new_height, self.height)
+        keep_w = min(new_width, self.width)
+        board[:keep_h, :keep_w] = self.board[:keep_h, :keep_w]
+
+        old = self._shm
+        self._shm = self._create_buffers(new_width, new_height)
+        with self._lock:
+            for _, buffer in self._shm:
+                np.copyto(buffer, board)
+        self._send("resize", new_width, new_height, [shm.name for shm, _ in self._shm])
+        self._release_buffers(old)
+
+        self._board = board
+        self.width = new_width
+        self.height = new_height
+
+
+    # -------------------------------------------------
+    # CellSet hooks
+    # -------------------------------------------------
+    def _has_cell(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.board[y, x])
+        return False
+
+
+    def _set_cell(self, x, y, alive):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self._board[y, x] = 1 if alive else 0
+            self._send("set", x, y, alive)
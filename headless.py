@@ -0,0 +1,184 @@
+"""
+Headless batch runner: step a simulation with no window.
+
+Never imports pygame or ``ui/``, so it starts quickly and many copies can
+run side by side on a server without a display.
+
+    python -m headless patterns/gosperglidergun.cells --generations 5000
+    python -m headless --density 0.35 --size 1024x1024 --time-budget 60
+    python -m headless --resume board.lifesnap -n 1000 --checkpoint board.lifesnap
+"""
+import argparse
+import json
+import sys
+import time
+from engines import LOCAL_ENGINES, UNBOUNDED_ENGINES, create_simulation
+from patternio import read_pattern, place_pattern
+from snapshot import read_snapshot, restore_snapshot, save_snapshot
+from rules import CONWAY, Rule
+from simulation import random_soup_batches
+
+
+def parse_size(text):
+    """Parse ``WIDTHxHEIGHT`` into a (width, height) tuple."""
+    try:
+        width, height = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got '{text}'")
+    return width, height
+
+
+def run(simulation, generations=None, time_budget=None):
+    """
+    Step ``simulation`` until ``generations`` steps have run or
+    ``time_budget`` seconds have passed, whichever comes first.
+
+    :return: (steps taken, elapsed seconds)
+    """
+    clock = time.perf_counter
+    start = clock()
+    deadline = start + time_budget if time_budget is not None else None
+    steps = 0
+
+    while generations is None or steps < generations:
+        if deadline is not None and clock() >= deadline:
+            break
+        simulation.step()
+        steps += 1
+
+    return steps, clock() - start
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m headless",
+        description="Run a Game of Life simulation without a window.",
+    )
+    parser.add_argument("pattern", nargs="?", help=".cells or .rle file to load")
+    parser.add_argument(
+        "--density",
+        type=float,
+        default=0.15,
+        help="random soup density when no pattern is given (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, help="random soup seed")
+    parser.add_argument(
+        "--size",
+        type=parse_size,
+        default=(512, 512),
+        help="board size as WIDTHxHEIGHT (default: 512x512; ignored with --resume)",
+    )
+    parser.add_argument(
+        "--engine", choices=sorted(LOCAL_ENGINES), default="sparse",
+        help="simulation engine (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--infinite", action="store_true",
+        help="run on an unbounded plane (engines: "
+        f"{', '.join(UNBOUNDED_ENGINES)}); --size only sets the soup area",
+    )
+    parser.add_argument(
+        "--rule", type=Rule,
+        help="Life-like rulestring (default: the pattern's own rule, else "
+        f"{CONWAY})",
+    )
+    parser.add_argument(
+        "-n", "--generations", type=int, help="number of generations to run"
+    )
+    parser.add_argument(
+        "-t", "--time-budget", type=float, help="wall-clock budget in seconds"
+    )
+    parser.add_argument(
+        "--resume", metavar="SNAPSHOT",
+        help="start from a snapshot file (its size, generation and rule)",
+    )
+    parser.add_argument(
+        "--checkpoint", metavar="SNAPSHOT", help="save a snapshot when done"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print the summary as JSON"
+    )
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.generations is None and args.time_budget is None:
+        parser.error("give --generations and/or --time-budget")
+
+    if args.pattern and args.resume:
+        parser.error("give a pattern or --resume, not both")
+    options = {}
+    if args.infinite:
+        if args.engine not in UNBOUNDED_ENGINES:
+            parser.error(f"--infinite needs one of: {', '.join(UNBOUNDED_ENGINES)}")
+        options["unbounded"] = True
+
+    width, height = args.size
+    header = batches = snapshot = body = None
+    if args.pattern:
+        try:
+            header, batches = read_pattern(args.pattern)
+        except OSError as e:
+            parser.error(f"cannot read pattern: {e}")
+    elif args.resume:
+        try:
+            snapshot, body = read_snapshot(args.resume)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read snapshot: {e}")
+        width, height = snapshot.width, snapshot.height
+    source_rule = (header or snapshot).rule if (header or snapshot) else None
+    rule = args.rule or source_rule or CONWAY
+    simulation = create_simulation(args.engine, width, height, rule=rule, **options)
+
+    try:
+        load_s = checkpoint_s = None
+        if args.pattern:
+            _, load_s = place_pattern(simulation, header, batches)
+        elif snapshot:
+            start = time.perf_counter()
+            restore_snapshot(simulation, snapshot, body)
+            load_s = time.perf_counter() - start
+        else:
+            simulation.clear()
+            for xs, ys in random_soup_batches(width, height, args.density, args.seed):
+                simulation.add_coords(xs, ys)
+
+        initial_population = len(simulation.positions)
+        steps, elapsed = run(simulation, args.generations, args.time_budget)
+        if args.checkpoint:
+            start = time.perf_counter()
+            save_snapshot(simulation, args.checkpoint)
+            checkpoint_s = time.perf_counter() - start
+
+        summary = {
+            "engine": args.engine,
+            "rule": str(simulation.rule),
+            "size": f"{width}x{height}",
+            "source": args.pattern or args.resume
+            or f"soup density={args.density} seed={args.seed}",
+            "load_s": round(load_s, 6) if load_s is not None else None,
+            "generations": steps,
+            "final_generation": simulation.generations,
+            "elapsed_s": round(elapsed, 6),
+            "gen_per_s": round(steps / elapsed, 2) if elapsed > 0 else None,
+            "initial_population": initial_population,
+            "final_population": len(simulation.positions),
+            "checkpoint_s": round(checkpoint_s, 6) if checkpoint_s is not None else None,
+        }
+    finally:
+        close = getattr(simulation, "close", None)
+        if close:
+            close()
+
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        for key, value in summary.items():
+            print(f"{key:>18}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
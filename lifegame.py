@@ -1,17 +1,31 @@
-import random
+import os
+import time
+import numpy as np
 import pygame
-from simulation import LifeSimulation
-from view import LifeView
+from engines import create_simulation
+from patternio import read_pattern, place_pattern
+from patternindex import PatternIndex
+from snapshot import save_snapshot, read_snapshot, restore_snapshot
+from simulation import random_soup_batches
+from cycles import CycleDetector
+from rules import CONWAY, compile_rule
+from scheduler import GenerationScheduler
+from profiler import FrameProfiler
+from view import LifeView, COLOR_MODES
 from ui.settingsmenu import SettingsMenu
 from ui.controlsmenu import ControlsMenu
 from ui.colorselector import ColorSelector
 from ui.patternmenu import PatternMenu
 from ui.hud import HUD
-from constants import WIDTH, HEIGHT, FPS, GRAY, GRID_COLOR
+from ui.profilegraph import ProfileGraph
+from constants import (
+    WIDTH, HEIGHT, FPS, GRID_COLOR, ENGINE, CYCLE_JUMP, STEP_BUDGET, SNAPSHOT_PATH,
+    PAN_SPEED, PROFILE_CSV_PATH,
+)
 
 
 class LifeGame:
-    def __init__(self):
+    def __init__(self, engine=ENGINE, engine_options=None):
         # -------------------------------------------------
         # Pygame setup
         # -------------------------------------------------
@@ -24,19 +38,42 @@ class LifeGame:
         # Game components
         # -------------------------------------------------
         self.settings = SettingsMenu()
-        self.simulation = LifeSimulation(
-            WIDTH // self.settings.zoom, HEIGHT // self.settings.zoom
+        self.engine = engine
+        self.engine_options = dict(engine_options or {})
+        self.default_rule = compile_rule(self.engine_options.get("rule", CONWAY))
+        self.simulation = create_simulation(
+            engine,
+            int(WIDTH // self.settings.zoom),
+            int(HEIGHT // self.settings.zoom),
+            **self.engine_options,
         )
         self.view = LifeView(self.screen, self.settings.zoom)
+        # On an unbounded plane the camera pans and only what's in view is drawn
+        self.view.unbounded = getattr(self.simulation, "unbounded", False)
+        self._track_changes()
         self.controls = ControlsMenu()
         self.color_selector = ColorSelector(
             self.settings.color_buttons, self.settings.font
         )
         self.pattern_menu = PatternMenu()
+        self.pattern_index = PatternIndex()
         self.hud = HUD(self.settings.font)
+        self.cycle_detector = CycleDetector()
+        self.scheduler = GenerationScheduler(self.settings.get_rate(), STEP_BUDGET)
+        self.profiler = FrameProfiler()
+        self.profile_graph = ProfileGraph(self.profiler, self.settings.font)
         # -------------------------------------------------
         # Game state
         # -------------------------------------------------
+        self.auto_pause_on_cycle = False
+        self.pan_carry = [0.0, 0.0]  # fraction of a cell the arrow keys have panned
+        self.drag_anchor = None      # (mouse pos, camera) while middle-dragging
+        # What is currently on screen, for deciding what to repaint
+        self.ui_dirty = True
+        self.drawn_ui_state = None
+        self.drawn_menus = None
+        self.drawn_generation = None
+        self.caption = None
         self.prev_settings = {
             "zoom": self.settings.zoom,
             "show_grid": self.settings.show_grid,
@@ -66,7 +103,7 @@ class LifeGame:
                 "max": self.settings.max_update_freq,
                 "step": 5,
                 "sync_slider": self.settings.speed_slider,
-                "invert": True,
+                "invert": False,
             },
             {
                 "rect": self.settings.initial_population_slider.rect,
@@ -93,23 +130,16 @@ class LifeGame:
 
     def load_pattern(self, filepath):
         """
-        Load a .cells pattern file and populate the simulation grid.
+        Load a .cells or .rle pattern file and populate the simulation grid.
+        The simulation switches to the rule the file names, or back to the
+        rule it was started with if the file names none. Patterns in the
+        precompiled index (see ``patternindex.py``) are not parsed again.
 
-        :filepath: path to the .cells file
+        :filepath: path to the pattern file
         """
-        pattern = []
-
         try:
-            with open(filepath, "r") as f:
-                for line in f:
-                    # Skip comment lines
-                    if line.startswith("!"):
-                        continue
-                    # Skip empty lines
-                    line = line.rstrip("\n")
-                    if not line:
-                        continue
-                    pattern.append(line)
+            indexed = self.pattern_index.get(filepath)
+            header, batches = indexed or read_pattern(filepath)
 
         except FileNotFoundError:
             print(f"Error: File '{filepath}' not found.")
@@ -119,32 +149,126 @@ class LifeGame:
             print(f"Error reading file: {e}")
             return
 
+        rule = header.rule or self.default_rule
+        if rule != self.simulation.rule:
+            self._set_rule(rule)
+
         # Clear existing cells
         self.simulation.positions.clear()
+        self.view.reset_history()
+        self.view.invalidate()
+        self.cycle_detector.invalidate()
 
-        # Calculate pattern dimensions
-        pattern_height = len(pattern)
-        pattern_width = max(len(row) for row in pattern) if pattern else 0
-
-        if pattern_width == 0 or pattern_height == 0:
+        if header.width == 0 or header.height == 0:
+            batches.close()
             print("Error: Pattern file is empty or invalid.")
             return
 
-        # Center pattern on the grid
-        grid_width = self.simulation.width
-        grid_height = self.simulation.height
-        start_x = (grid_width - pattern_width) // 2
-        start_y = (grid_height - pattern_height) // 2
-
-        # Populate live cells based on pattern
-        for y, row in enumerate(pattern):
-            for x, char in enumerate(row):
-                if char == "O":
-                    cell_x = start_x + x
-                    cell_y = start_y + y
-                    # Ensure cell is within grid bounds
-                    if 0 <= cell_x < grid_width and 0 <= cell_y < grid_height:
-                        self.simulation.positions.add((cell_x, cell_y))
+        # Center pattern in view, dropping cells outside a bounded board
+        view = self.view
+        try:
+            if view.unbounded:
+                cols, rows = view.grid_shape()
+                placed, seconds = place_pattern(
+                    self.simulation, header, batches, cols, rows,
+                    view.camera_x, view.camera_y,
+                )
+            else:
+                placed, seconds = place_pattern(self.simulation, header, batches)
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            return
+
+        if indexed:
+            source = "from index"
+        else:
+            megabytes = os.path.getsize(filepath) / 1e6
+            source = f"{megabytes / max(seconds, 1e-9):.1f} MB/s"
+        print(
+            f"Loaded '{header.name or os.path.basename(filepath)}': "
+            f"{placed} cells in {seconds:.3f}s ({source})"
+        )
+
+    def save_snapshot(self, filepath=SNAPSHOT_PATH):
+        """
+        Save the board, generation and rule to a snapshot file.
+
+        :filepath: path to write
+        """
+        start = time.perf_counter()
+        try:
+            header = save_snapshot(self.simulation, filepath)
+        except OSError as e:
+            print(f"Error saving snapshot: {e}")
+            return
+        print(
+            f"Saved generation {header.generation} ({header.population} cells) "
+            f"to '{filepath}' in {time.perf_counter() - start:.3f}s"
+        )
+
+    def save_profile(self, filepath=PROFILE_CSV_PATH):
+        """
+        Save the frame profiler's per-frame phase timings as CSV.
+
+        :filepath: path to write
+        """
+        try:
+            frames = self.profiler.write_csv(filepath)
+        except OSError as e:
+            print(f"Error saving frame profile: {e}")
+            return
+        print(f"Saved {frames} profiled frames to '{filepath}'")
+
+    def load_snapshot(self, filepath=SNAPSHOT_PATH):
+        """
+        Restore the board, generation and rule from a snapshot file. Cells
+        that don't fit on the current board are dropped.
+
+        :filepath: path to the snapshot
+        """
+        start = time.perf_counter()
+        try:
+            header, body = read_snapshot(filepath)
+        except FileNotFoundError:
+            print(f"Error: File '{filepath}' not found.")
+            return
+        except (OSError, ValueError) as e:
+            print(f"Error reading snapshot: {e}")
+            return
+
+        if header.rule != self.simulation.rule:
+            self._set_rule(header.rule)
+        restore_snapshot(self.simulation, header, body)
+        if self.view.unbounded:
+            self.view.center_on(
+                header.origin_x + header.width // 2, header.origin_y + header.height // 2
+            )
+        self.view.reset_history()
+        self.view.invalidate()
+        self.cycle_detector.invalidate()
+        self.scheduler.rebase(self.simulation.generations)
+        print(
+            f"Restored generation {header.generation} ({header.population} cells) "
+            f"from '{filepath}' in {time.perf_counter() - start:.3f}s"
+        )
+
+    def _set_rule(self, rule):
+        """Recreate the simulation with the same engine and options under ``rule``."""
+        options = dict(self.engine_options, rule=rule)
+        try:
+            simulation = create_simulation(
+                self.engine, self.simulation.width, self.simulation.height, **options
+            )
+        except ValueError as e:
+            print(f"Keeping rule {self.simulation.rule}: {e}")
+            return
+        close = getattr(self.simulation, "close", None)
+        if close:
+            close()
+        self.simulation = simulation
+        self.engine_options = options
+        self._track_changes()
+        self.scheduler.rebase(simulation.generations)
 
     def _handle_keyboard(self, event):
         if event.type != pygame.KEYDOWN:
@@ -157,11 +281,22 @@ class LifeGame:
         elif event.key == pygame.K_c:
             # Clear the grid and pause the simulation
             self.simulation.positions.clear()
+            self.cycle_detector.invalidate()
+            self.view.reset_history()
+            self.view.invalidate()
             self.playing = False
-            self.count = 0
+            self.scheduler.reset()
 
         elif event.key == pygame.K_r:
-            self._reset_cells(WIDTH // self.settings.zoom, HEIGHT // self.settings.zoom)
+            self._reset_cells(*self.view.grid_shape())
+
+        elif event.key == pygame.K_a:
+            # Toggle pausing automatically once the board starts cycling
+            self.auto_pause_on_cycle = not self.auto_pause_on_cycle
+
+        elif event.key == pygame.K_j:
+            # Jump ahead while the board is cycling
+            self._skip_cycle()
 
         elif event.key == pygame.K_g:
             # Toggle grid lines
@@ -171,13 +306,73 @@ class LifeGame:
             # Toggle fade effect
             self.settings.fade_enabled = not self.settings.fade_enabled
 
+        elif event.key == pygame.K_v:
+            # Cycle cell coloring: plain, by age, activity heat map
+            modes = COLOR_MODES
+            next_mode = modes[(modes.index(self.view.color_mode) + 1) % len(modes)]
+            self.view.set_color_mode(next_mode)
+
         elif event.key == pygame.K_ESCAPE:
-            pygame.quit()
-            exit()
+            # Leave the main loop so the engine can shut down cleanly
+            self.running = False
+
+        elif event.key == pygame.K_s:
+            # Save the board to a snapshot file
+            self.save_snapshot()
+
+        elif event.key == pygame.K_l:
+            # Restore the board from the snapshot file
+            self.load_snapshot()
+
+        elif event.key == pygame.K_p:
+            # Toggle the frame profiler and its graph
+            self.profiler.set_enabled(not self.profiler.enabled)
+            self.view.invalidate()
+
+        elif event.key == pygame.K_m:
+            # Toggle allocation tracing while profiling
+            self.profiler.set_trace_memory(not self.profiler.trace_memory)
+
+        elif event.key == pygame.K_o:
+            # Save the profiled frames' timings
+            self.save_profile()
 
-        # elif event.key == pygame.K_l:
-        #     # Load a pattern from file
-        #     self.load_pattern("all/glider.cells")
+    def _handle_pan(self, event):
+        """Middle-drag the camera around an unbounded plane."""
+        if not self.view.unbounded:
+            return
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 2:
+            self.drag_anchor = (event.pos, (self.view.camera_x, self.view.camera_y))
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 2:
+            self.drag_anchor = None
+        elif event.type == pygame.MOUSEMOTION and self.drag_anchor:
+            (x0, y0), (cam_x, cam_y) = self.drag_anchor
+            zoom = self.view.zoom
+            # The cell that was under the cursor stays under it
+            self.view.pan(
+                cam_x - int((event.pos[0] - x0) // zoom) - self.view.camera_x,
+                cam_y - int((event.pos[1] - y0) // zoom) - self.view.camera_y,
+            )
+
+    def _pan_keys(self, dt):
+        """Pan with the arrow keys at PAN_SPEED pixels per second."""
+        if not self.view.unbounded:
+            return
+        keys = pygame.key.get_pressed()
+        direction = (
+            keys[pygame.K_RIGHT] - keys[pygame.K_LEFT],
+            keys[pygame.K_DOWN] - keys[pygame.K_UP],
+        )
+        if direction == (0, 0):
+            self.pan_carry = [0.0, 0.0]
+            return
+        cells = PAN_SPEED * dt / self.settings.zoom
+        whole = []
+        for axis in (0, 1):
+            self.pan_carry[axis] += direction[axis] * cells
+            whole.append(int(self.pan_carry[axis]))
+            self.pan_carry[axis] -= whole[axis]
+        self.view.pan(*whole)
 
     def _handle_mouse(self):
         # Mouse Drawing
@@ -186,21 +381,26 @@ class LifeGame:
 
         mouse_pressed = pygame.mouse.get_pressed()
         # Click and drag to draw new cells
-        x, y = pygame.mouse.get_pos()
-        col = x // self.settings.zoom
-        row = y // self.settings.zoom
+        col, row = self.view.screen_to_cell(*pygame.mouse.get_pos())
         pos = (col, row)
 
         if mouse_pressed[0]:
             # Left click to add a cell
-            if 0 <= col < self.simulation.width and 0 <= row < self.simulation.height:
-                self.simulation.positions.add(pos)
+            if self.view.unbounded or (
+                0 <= col < self.simulation.width and 0 <= row < self.simulation.height
+            ):
+                if pos not in self.simulation.positions:
+                    self.simulation.positions.add(pos)
+                    self.cycle_detector.invalidate()
+                    self._edited(pos, alive=True)
 
         elif mouse_pressed[2]:
             # Right click to remove a cell
             if pos in self.simulation.positions:
                 # Remove position if it already exists
                 self.simulation.positions.remove(pos)
+                self.cycle_detector.invalidate()
+                self._edited(pos, alive=False)
 
     def _handle_scrollwheel(self, event):
         """Handle mouse wheel events for sliders and zoom."""
@@ -248,24 +448,23 @@ class LifeGame:
             # Map slider base_label to actual settings attribute
             label_lower = target_slider.label.lower()
             if "zoom" in label_lower:
-                settings.zoom = value
+                settings.zoom = settings.get_zoom()
             elif "speed" in label_lower:
                 settings.sim_speed = value
             elif "population" in label_lower:
                 settings.initial_cells = value
 
     def _reset_cells(self, grid_width, grid_height):
-        self.simulation.positions.clear()
-
         # Probability-based generation for cells
         prob_alive = self.settings.initial_population_slider.val / 100
-        positions = set()
-
-        for col in range(grid_width):
-            for row in range(grid_height):
-                if random.random() < prob_alive:
-                    positions.add((col, row))
-        self.simulation.positions = positions
+        # Fill the viewport, wherever the camera is
+        cam_x, cam_y = self.view.camera_x, self.view.camera_y
+        self.simulation.clear()
+        for xs, ys in random_soup_batches(grid_width, grid_height, prob_alive):
+            self.simulation.add_coords(xs + cam_x, ys + cam_y)
+        self.cycle_detector.invalidate()
+        self.view.reset_history()
+        self.view.invalidate()
 
     def _can_draw(self):
         if self.settings.open or self.controls.open or self.pattern_menu.open:
@@ -297,9 +496,111 @@ class LifeGame:
             self.prev_settings[attr_name] = current_value
 
     def _apply_zoom(self, zoom_value):
-        self.view.zoom = zoom_value
+        view = self.view
+        # Zoom about the middle of the screen when the camera can move
+        center = view.screen_to_cell(WIDTH // 2, HEIGHT // 2)
+        view.zoom = zoom_value
+        if view.unbounded:
+            view.center_on(*center)
         self.simulation.update_grid_size(WIDTH, HEIGHT, zoom_value)
-        self.view.cell_fade.clear()
+        self._track_changes()
+        self.view.reset_history()
+        self.view.invalidate()
+        self.cycle_detector.invalidate()
+
+    def _apply_color(self, color):
+        self.color_selector.selected_color = color
+        self.view.invalidate()
+
+    def _track_changes(self):
+        """
+        Have the engine report each generation's births and deaths, if it
+        can. Zoomed out nothing per-cell is drawn, so the engine is spared
+        the work.
+        """
+        simulation = self.simulation
+        tracking = hasattr(simulation, "track_changes") and self.view.zoom >= 1
+        if hasattr(simulation, "track_changes"):
+            simulation.track_changes = tracking
+        self.view.incremental = tracking
+        self.births = self.deaths = None
+
+    def _tracked_cells(self):
+        """Live cells the engine's births and deaths are relative to."""
+        region = getattr(self.simulation, "changes_region", None)
+        if region is None:
+            return self.simulation.positions
+        xs, ys = self.simulation.live_cells(*region)
+        return zip(xs.tolist(), ys.tolist())
+
+    def _edited(self, pos, alive):
+        """Show a cell drawn or erased with the mouse."""
+        if self.view.incremental:
+            cell = (np.array([pos[0]]), np.array([pos[1]]))
+            none = (np.array([], dtype=int), np.array([], dtype=int))
+            self.view.apply_changes(*((cell, none) if alive else (none, cell)))
+        else:
+            self.view.mark_changed((pos,))
+
+    def _step(self):
+        """Step the simulation once and feed its births/deaths to the cycle detector."""
+        if self.view.zoom < 1:
+            # Zoomed out the whole view is reshaded every generation anyway,
+            # and diffing a board that size would cost far more than the step
+            self.simulation.step()
+            self.cycle_detector.invalidate()
+            return
+
+        detector = self.cycle_detector
+        if hasattr(self.simulation, "changes_region"):
+            # The engine only reports changes in view, so the fingerprint
+            # covers just that area and starts over when the camera moves
+            region = self.view.visible_region()
+            if region != self.simulation.changes_region:
+                self.simulation.changes_region = region
+                detector.invalidate()
+        if detector.stale:
+            detector.reset(self._tracked_cells(), self.simulation.generations)
+
+        was_cycling = detector.period is not None
+        if self.view.incremental:
+            # The engine hands over the changes; no copies of the board
+            self.simulation.step()
+            births, deaths = self.simulation.births, self.simulation.deaths
+            generation = self.simulation.generations
+            self.view.apply_changes(births, deaths, generation)
+            period = detector.observe_coords(births, deaths, generation)
+            self.births, self.deaths = len(births[0]), len(deaths[0])
+        else:
+            # An engine that can't report its changes: diff the cell sets
+            before = set(self.simulation.positions)
+            self.simulation.step()
+            after = set(self.simulation.positions)
+
+            births, deaths = after - before, before - after
+            self.view.mark_changed(births)
+            self.view.mark_changed(deaths)
+            period = detector.observe(births, deaths, self.simulation.generations)
+            self.births, self.deaths = len(births), len(deaths)
+        if period and not was_cycling and self.auto_pause_on_cycle:
+            self.playing = False
+
+    def _skip_cycle(self, skip=CYCLE_JUMP):
+        """
+        Jump the generation counter ahead while the board is cycling. Whole
+        periods leave the board unchanged, so only the remainder is stepped.
+        """
+        detector = self.cycle_detector
+        if detector.period is None or detector.stale:
+            return
+
+        generation, remaining = detector.fast_forward(
+            self.simulation.generations, skip
+        )
+        self.simulation.generations = generation
+        for _ in range(remaining):
+            self._step()
+        self.scheduler.rebase(self.simulation.generations)
 
     ############################## END HELPER METHODS ##############################
 
@@ -308,19 +609,23 @@ class LifeGame:
 
     def handle_events(self):
         events = pygame.event.get()
+        if events:
+            # Hover, drags and clicks may all change how the UI looks
+            self.ui_dirty = True
         for event in events:
             if event.type == pygame.QUIT:
                 return False
 
             self.settings.handle_event(event)
             self._handle_scrollwheel(event)
+            self._handle_pan(event)
             self.controls.handle_event(event)
             self.pattern_menu.handle_event(event)
             self._handle_keyboard(event)
             if self.settings.open:
                 self.color_selector.handle_event(event)
 
-        return True
+        return self.running
 
     ############################## END EVENTS ##############################
 
@@ -330,41 +635,56 @@ class LifeGame:
     def update_simulation(self, dt):
         """Update simulation state and view based on current settings."""
 
+        profiler = self.profiler
         self.update_simulation_settings()
-        self.view.update_fade(self.simulation.positions, dt)
+        self._pan_keys(dt)
+        profiler.mark("events")
 
-        # Step the simulation while playing
-        if self.playing:
-            self.count += 1
+        # Free-running engines keep their own clock; just tell them to run
+        if getattr(self.simulation, "free_running", False):
+            self.simulation.set_playing(self.playing, self.scheduler.rate)
 
-            if self.count >= self.settings.get_speed():
-                self.count = 0
-                self.simulation.step()
+        # Step as many generations as the target rate and time budget allow
+        elif self.playing:
+            self.scheduler.run(self._step, dt)
+        self.scheduler.observe(self.simulation.generations)
+        profiler.mark("step")
+        self.view.update_fade(self.simulation.positions, dt, self.simulation.generations)
+        profiler.mark("fade")
 
         # Load selected pattern if any
         if self.pattern_menu.selected_pattern:
             self.load_pattern(self.pattern_menu.selected_pattern)
             self.pattern_menu.selected_pattern = None
+            profiler.mark("events")
 
     def update_simulation_settings(self):
         # Update dependent settings in simulation if they have changed
         self._sync_setting("zoom", apply_fn=self._apply_zoom)
 
-        self._sync_setting("show_grid")
-        self._sync_setting("sim_speed")
+        self._sync_setting("show_grid", apply_fn=lambda v: self.view.invalidate())
+        self._sync_setting(
+            "sim_speed",
+            apply_fn=lambda v: setattr(self.scheduler, "rate", self.settings.get_rate()),
+        )
         self._sync_setting("fade_enabled", apply_fn=self.view.set_fade_enabled)
         self._sync_setting(
             "fade_duration", apply_fn=lambda v: setattr(self.view, "fade_duration", v)
         )
         self._sync_setting(
             "cell_color",
-            apply_fn=lambda v: setattr(self.color_selector, "selected_color", v),
+            apply_fn=lambda v: self._apply_color(v),
             getter=lambda: self.color_selector.selected_color,
         )
         self.hud.update(
             generations=self.simulation.generations,
             cell_count=len(self.simulation.positions),
             clock=self.clock,
+            gen_rate=self.scheduler.achieved if self.playing else 0,
+            period=self.cycle_detector.period,
+            auto_pause=self.auto_pause_on_cycle,
+            births=self.births,
+            deaths=self.deaths,
         )
 
     ############################## END UPDATE ##############################
@@ -372,40 +692,122 @@ class LifeGame:
     ############################## DRAWING ##############################
     # Draw all updated game elements to the screen
 
-    def draw(self):
-        self.screen.fill(GRAY)
-        self.view.draw_cells(
-            self.simulation.positions, self.color_selector.selected_color
+    def _ui_rects(self):
+        """Screen areas covered by the HUD bar and any open menu panels."""
+        rects = [pygame.Rect(0, 0, WIDTH, self.hud.bar_height)]
+        for menu in (self.settings, self.controls, self.pattern_menu):
+            if menu.open:
+                rects.append(menu.panel_rect)
+        if self.profile_graph.visible:
+            rects.append(self.profile_graph.rect)
+        return rects
+
+    def _ui_state(self):
+        """Everything the UI shows that can change without an input event."""
+        hud = self.hud
+        return (
+            hud.generations, hud.cell_count, int(self.clock.get_fps()),
+            round(hud.gen_rate), hud.period, hud.auto_pause, self.playing,
+            hud.births, hud.deaths,
+            # The profiler graph scrolls every frame while it is shown
+            self.profiler.frames if self.profile_graph.visible else None,
         )
 
-        grid_width = int(WIDTH // self.settings.zoom)
-        grid_height = int(HEIGHT // self.settings.zoom)
-        self.view.draw_grid(
-            grid_width, grid_height, GRID_COLOR, self.settings.show_grid
+    def draw(self):
+        """
+        Repaint only what changed since the last frame: cells reported by
+        the simulation or edits, plus the UI when it is damaged. Zoom,
+        color and grid changes, loads and menu toggles repaint everything.
+        """
+        menus = (self.settings.open, self.controls.open, self.pattern_menu.open)
+        if menus != self.drawn_menus:
+            self.view.invalidate()
+            self.drawn_menus = menus
+
+        # Free-running engines don't report births/deaths, on an unbounded
+        # plane they are only tracked around the origin, and zoomed out
+        # they aren't tracked at all
+        if (
+            getattr(self.simulation, "free_running", False)
+            or self.view.unbounded
+            or self.view.zoom < 1
+        ):
+            if self.simulation.generations != self.drawn_generation:
+                self.view.invalidate()
+                self.drawn_generation = self.simulation.generations
+
+        full, rects = self.view.render(
+            self.simulation.positions,
+            self.color_selector.selected_color,
+            *self.view.grid_shape(),
+            GRID_COLOR,
+            self.settings.show_grid,
         )
-
-        self.hud.draw(self.screen)
-        self.settings.draw(self.screen)
-        self.controls.draw(self.screen)
-        self.pattern_menu.draw(self.screen)
-
-        pygame.display.set_caption("Playing" if self.playing else "Paused")
-        pygame.display.flip()
+        self.profiler.mark("cells")
+
+        # The UI is drawn with transparency, so restore the board beneath
+        # it before drawing it again
+        ui_rects = self._ui_rects()
+        ui_state = self._ui_state()
+        damaged = (
+            full
+            or self.ui_dirty
+            or ui_state != self.drawn_ui_state
+            or any(rect.collidelist(ui_rects) != -1 for rect in rects)
+        )
+        if damaged:
+            if not full:
+                for rect in ui_rects:
+                    self.screen.blit(self.view.board_surface, rect, rect)
+                rects.extend(ui_rects)
+            self.hud.draw(self.screen)
+            self.settings.draw(self.screen)
+            self.controls.draw(self.screen)
+            self.pattern_menu.draw(self.screen)
+            self.profile_graph.draw(self.screen)
+            self.ui_dirty = False
+            self.drawn_ui_state = ui_state
+        self.profiler.mark("ui")
+
+        caption = "Playing" if self.playing else "Paused"
+        if caption != self.caption:
+            pygame.display.set_caption(caption)
+            self.caption = caption
+
+        if full:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        self.profiler.mark("flip")
 
     ############################## END DRAWING ##############################
 
     ############################## MAIN LOOP ##############################
 
     def main(self):
-        running = True
+        self.running = True
         self.playing = False
-        self.count = 0
-
-        while running:
-            dt = self.clock.tick(FPS) / 1000.0
-            running = self.handle_events()
-            self._handle_mouse()
-            self.update_simulation(dt)
-            self.draw()
+        self.scheduler.reset()
+        profiler = self.profiler
 
+        try:
+            while self.running:
+                dt = self.clock.tick(FPS) / 1000.0
+                profiler.start_frame()
+                self.running = self.handle_events()
+                if not self.running:
+                    break
+                self._handle_mouse()
+                profiler.mark("events")
+                self.update_simulation(dt)
+                self.draw()
+                profiler.end_frame()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """Release engine resources (worker processes, shared memory) and quit."""
+        close = getattr(self.simulation, "close", None)
+        if close:
+            close()
         pygame.quit()
@@ -1,8 +1,66 @@
+import argparse
 import pygame
 from lifegame import LifeGame
+from engines import LOCAL_ENGINES, UNBOUNDED_ENGINES
+from constants import ENGINE
+from rules import CONWAY, Rule
 
 pygame.init()
 
 if __name__ == "__main__":
-    game = LifeGame()
+    parser = argparse.ArgumentParser(description="Conway's Game of Life")
+    parser.add_argument(
+        "--engine",
+        choices=sorted(LOCAL_ENGINES),
+        default=ENGINE,
+        help="simulation engine to run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rule",
+        type=Rule,
+        default=CONWAY,
+        help="Life-like rulestring, e.g. B36/S23 (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--infinite",
+        action="store_true",
+        help="run on an unbounded plane and pan with the arrow keys or middle "
+        f"mouse button (engines: {', '.join(UNBOUNDED_ENGINES)})",
+    )
+    parser.add_argument(
+        "--separate-process",
+        action="store_true",
+        help="run the engine in its own process so slow generations never stall rendering",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="worker processes for the parallel engine (default: CPU count)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="start with the frame profiler on (P toggles it, O saves a CSV)",
+    )
+    args = parser.parse_args()
+
+    engine_options = {"rule": args.rule}
+    if args.workers is not None:
+        if args.engine != "parallel":
+            parser.error("--workers requires --engine parallel")
+        engine_options["workers"] = args.workers
+    if args.infinite:
+        if args.engine not in UNBOUNDED_ENGINES:
+            parser.error(f"--infinite needs one of: {', '.join(UNBOUNDED_ENGINES)}")
+        if args.separate_process:
+            parser.error("--infinite can't be combined with --separate-process")
+        engine_options["unbounded"] = True
+
+    engine = args.engine
+    if args.separate_process:
+        engine_options["engine"] = engine
+        engine = "remote"
+
+    game = LifeGame(engine=engine, engine_options=engine_options)
+    game.profiler.set_enabled(args.profile)
     game.main()
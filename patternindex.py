@@ -0,0 +1,422 @@
+"""
+Precompiled pattern index: every pattern in a library parsed once into a
+single binary file, so selecting a pattern is a table lookup instead of a
+parse.
+
+    python -m patternindex                      # index patterns/ into patterns.idx
+    python -m patternindex ~/lifewiki --index lifewiki.idx
+
+File layout (little-endian)::
+
+    header    magic, version, entry count, section offsets
+    entries   one fixed-size ENTRY record per pattern
+    strings   UTF-8 paths, names, rules and comments
+    coords    packed (x, y) pairs, uint16 where the pattern fits, else uint32
+
+The index is opened lazily through a memory map, so nothing is read until
+the first lookup and coordinates are paged in only for the pattern used.
+An entry is trusted while its file's mtime and size are unchanged; if only
+the mtime moved, the file is re-hashed and the entry is still used when the
+content is the same.
+"""
+import argparse
+import hashlib
+import os
+import struct
+import sys
+import time
+from collections import namedtuple
+import numpy as np
+from engines.dense import apply_rule, count_neighbors, rule_terms
+from patternio import PatternHeader, read_pattern
+from rules import Rule
+
+INDEX_PATH = "patterns.idx"
+PATTERN_EXTENSIONS = (".cells", ".rle")
+
+# Longest period looked for, and the most cell-generations spent looking
+MAX_PERIOD = 256
+PERIOD_BUDGET = 20_000_000
+
+_MAGIC = b"LIFEIDX1"
+_VERSION = 1
+# magic, version, count, strings offset, coords offset
+_HEADER = struct.Struct("<8sIIQQ")
+
+ENTRY = np.dtype([
+    ("path", "<u4"), ("path_len", "<u4"),
+    ("name", "<u4"), ("name_len", "<u4"),
+    ("rule", "<u4"), ("rule_len", "<u4"),
+    ("comments", "<u4"), ("comments_len", "<u4"),
+    ("mtime_ns", "<i8"),
+    ("size", "<i8"),
+    ("digest", "u1", 16),
+    ("width", "<u4"),
+    ("height", "<u4"),
+    ("population", "<u8"),
+    ("period", "<u4"),
+    ("coord_bytes", "<u4"),       # 2 or 4 bytes per coordinate
+    ("coords", "<u8"),            # byte offset into the coords section
+])
+
+PatternInfo = namedtuple("PatternInfo", "path name rule width height population period")
+PatternInfo.__doc__ = """\
+Index metadata for one pattern.
+
+:period: period of the pattern (1 for still lifes; spaceships count, as
+    the shape is compared wherever it has moved to), or 0 if it has none
+    within ``MAX_PERIOD`` generations (or ``PERIOD_BUDGET`` ran out)
+"""
+
+
+def file_digest(path):
+    """16-byte BLAKE2b digest of a file's contents."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def find_period(xs, ys, rule, limit=MAX_PERIOD, budget=PERIOD_BUDGET):
+    """
+    Step a pattern until its shape repeats.
+
+    The board is cropped to the pattern's bounding box every generation and
+    regrown by one cell on each side before the next, so the plane is
+    effectively unbounded and a spaceship's period is found as well as an
+    oscillator's.
+
+    :param budget: give up once this many board cells have been stepped
+    :return: the period, or 0 if the shape hasn't repeated within ``limit``
+        generations or ``budget``
+    """
+    terms = rule_terms(rule)
+    board = np.zeros((int(ys.max()) + 1, int(xs.max()) + 1), dtype=np.uint8)
+    board[ys, xs] = 1
+
+    seen = {}
+    for generation in range(limit + 1):
+        rows = np.flatnonzero(board.any(axis=1))
+        if not rows.size:
+            return 0
+        cols = np.flatnonzero(board.any(axis=0))
+        board = board[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+        shape = (board.shape, np.packbits(board).tobytes())
+        if shape in seen:
+            return generation - seen[shape]
+        seen[shape] = generation
+
+        budget -= board.size
+        if budget < 0:
+            return 0
+        # One cell of room to grow into, plus the zero border counting needs
+        padded = np.pad(board, 2)
+        counts = np.empty((board.shape[0] + 2, board.shape[1] + 2), dtype=np.uint8)
+        board = apply_rule(count_neighbors(padded, counts), padded[1:-1, 1:-1], terms)
+    return 0
+
+
+# -------------------------------------------------
+# Building
+# -------------------------------------------------
+def _parse_entry(path):
+    """Parse a pattern file into (header, xs, ys, period)."""
+    header, batches = read_pattern(path)
+    batches = list(batches)
+    if batches:
+        xs = np.concatenate([b[0] for b in batches])
+        ys = np.concatenate([b[1] for b in batches])
+    else:
+        xs = ys = np.zeros(0, dtype=np.int64)
+
+    period = find_period(xs, ys, header.rule or Rule()) if xs.size else 0
+    return header, xs, ys, period
+
+
+def find_patterns(paths):
+    """Pattern files under ``paths`` (files are taken as given, directories walked)."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found.extend(
+                    os.path.join(root, name)
+                    for name in names
+                    if name.lower().endswith(PATTERN_EXTENSIONS)
+                )
+        else:
+            found.append(path)
+    return sorted(found)
+
+
+def build_index(paths, index_path=INDEX_PATH, verbose=False):
+    """
+    Parse every pattern in ``paths`` into a binary index at ``index_path``.
+
+    Entries of an existing index are reused for files whose content hasn't
+    changed, so rebuilding after editing a few files only parses those.
+
+    :return: (patterns indexed, patterns parsed)
+    """
+    previous = PatternIndex(index_path)
+    base = os.path.dirname(os.path.abspath(index_path))
+
+    records = []
+    strings = bytearray()
+    coords = bytearray()
+    parsed = 0
+
+    def add_string(text):
+        data = (text or "").encode("utf-8")
+        offset = len(strings)
+        strings.extend(data)
+        return offset, len(data)
+
+    for path in find_patterns(paths):
+        key = os.path.relpath(os.path.abspath(path), base)
+        stat = os.stat(path)
+        cached = previous.lookup_entry(key)
+        if cached is not None and (stat.st_mtime_ns, stat.st_size) == (
+            cached["mtime_ns"], cached["size"]
+        ):
+            digest = cached["digest"].tobytes()
+        else:
+            digest = file_digest(path)
+
+        if cached is not None and cached["digest"].tobytes() == digest:
+            header, xs, ys = previous._decode(cached)
+            period = int(cached["period"])
+        else:
+            header, xs, ys, period = _parse_entry(path)
+            parsed += 1
+            if verbose:
+                print(f"  parsed {key}: {xs.size} cells, period {period or '-'}")
+
+        coord_type = np.uint16 if max(header.width, header.height) <= 0xFFFF else np.uint32
+        packed = np.empty((xs.size, 2), dtype=coord_type)
+        packed[:, 0] = xs
+        packed[:, 1] = ys
+        # Keep every coordinate block aligned to its item size
+        coords.extend(bytes(-len(coords) % 4))
+        coord_offset = len(coords)
+        coords.extend(packed.tobytes())
+
+        record = np.zeros((), dtype=ENTRY)
+        record["path"], record["path_len"] = add_string(key)
+        record["name"], record["name_len"] = add_string(header.name)
+        record["rule"], record["rule_len"] = add_string(header.rule and str(header.rule))
+        record["comments"], record["comments_len"] = add_string("\n".join(header.comments))
+        record["mtime_ns"] = stat.st_mtime_ns
+        record["size"] = stat.st_size
+        record["digest"] = np.frombuffer(digest, dtype=np.uint8)
+        record["width"] = header.width
+        record["height"] = header.height
+        record["population"] = xs.size
+        record["period"] = period
+        record["coord_bytes"] = np.dtype(coord_type).itemsize
+        record["coords"] = coord_offset
+        records.append(record)
+
+    previous.close()
+    entries = np.array(records, dtype=ENTRY).tobytes()
+    strings_offset = _HEADER.size + len(entries)
+    coords_offset = strings_offset + len(strings)
+    coords_offset += -coords_offset % 8
+
+    # Write to a temporary file and swap it in, so readers never see half an index
+    temp_path = index_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(records), strings_offset, coords_offset))
+        f.write(entries)
+        f.write(strings)
+        f.write(bytes(coords_offset - f.tell()))
+        f.write(coords)
+    os.replace(temp_path, index_path)
+    return len(records), parsed
+
+
+# -------------------------------------------------
+# Lookup
+# -------------------------------------------------
+class PatternIndex:
+    """
+    Read-only view of a pattern index file.
+
+    Nothing is opened until the first lookup. A missing or outdated index
+    simply has no entries, so callers fall back to parsing the file.
+
+    :param index_path: path of the index file
+    """
+
+    def __init__(self, index_path=INDEX_PATH):
+        self.index_path = index_path
+        self.base = os.path.dirname(os.path.abspath(index_path))
+        self._data = None
+        self._entries = None
+        self._strings = None
+        self._coords_offset = 0
+        self._by_path = None
+        self._rules = {}
+
+
+    def _open(self):
+        self._by_path = {}
+        try:
+            data = np.memmap(self.index_path, dtype=np.uint8, mode="r")
+        except (OSError, ValueError):
+            return
+        if data.size < _HEADER.size:
+            return
+        magic, version, count, strings_offset, coords_offset = _HEADER.unpack(
+            data[:_HEADER.size].tobytes()
+        )
+        if magic != _MAGIC or version != _VERSION:
+            return
+
+        self._data = data
+        self._entries = data[_HEADER.size:strings_offset].view(ENTRY)[:count]
+        self._strings = data[strings_offset:coords_offset]
+        self._coords_offset = coords_offset
+        strings = memoryview(self._strings)
+        self._by_path = {
+            str(strings[start:start + length], "utf-8"): i
+            for i, (start, length) in enumerate(zip(
+                self._entries["path"].tolist(), self._entries["path_len"].tolist()
+            ))
+        }
+
+
+    def close(self):
+        """Drop the memory map (the index reopens on the next lookup)."""
+        self._data = self._entries = self._strings = self._by_path = None
+
+
+    def _string(self, entry, field):
+        start, length = int(entry[field]), int(entry[field + "_len"])
+        return self._strings[start:start + length].tobytes().decode("utf-8")
+
+
+    def _rule(self, entry):
+        text = self._string(entry, "rule")
+        if not text:
+            return None
+        # Building a rule's tables costs more than decoding a small pattern
+        if text not in self._rules:
+            self._rules[text] = Rule(text)
+        return self._rules[text]
+
+
+    def __len__(self):
+        if self._by_path is None:
+            self._open()
+        return len(self._by_path)
+
+
+    def lookup_entry(self, key):
+        """Raw ENTRY record for an index-relative path, or None."""
+        if self._by_path is None:
+            self._open()
+        i = self._by_path.get(key)
+        return None if i is None else self._entries[i]
+
+
+    def _entry(self, filepath):
+        """The entry for ``filepath`` if it still matches the file on disk."""
+        entry = self.lookup_entry(os.path.relpath(os.path.abspath(filepath), self.base))
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        if stat.st_size != entry["size"]:
+            return None
+        if (
+            stat.st_mtime_ns != entry["mtime_ns"]
+            and file_digest(filepath) != entry["digest"].tobytes()
+        ):
+            return None
+        return entry
+
+
+    def _decode(self, entry):
+        """(header, xs, ys) for an entry; xs/ys are int64 copies of the packed pairs."""
+        comments = self._string(entry, "comments")
+        header = PatternHeader(
+            int(entry["width"]),
+            int(entry["height"]),
+            self._rule(entry),
+            self._string(entry, "name") or None,
+            comments.split("\n") if comments else [],
+        )
+        start = self._coords_offset + int(entry["coords"])
+        count = int(entry["population"])
+        coord_type = np.uint16 if entry["coord_bytes"] == 2 else np.uint32
+        packed = self._data[start:start + count * 2 * entry["coord_bytes"]]
+        pairs = packed.view(coord_type).reshape(-1, 2).astype(np.int64)
+        return header, pairs[:, 0], pairs[:, 1]
+
+
+    def info(self, filepath):
+        """PatternInfo for an up-to-date indexed file, or None."""
+        entry = self._entry(filepath)
+        if entry is None:
+            return None
+        return PatternInfo(
+            filepath,
+            self._string(entry, "name") or None,
+            self._rule(entry),
+            int(entry["width"]),
+            int(entry["height"]),
+            int(entry["population"]),
+            int(entry["period"]),
+        )
+
+
+    def get(self, filepath):
+        """
+        Pattern from the index, in the same form as ``read_pattern``.
+
+        :return: (header, batches), or None if ``filepath`` isn't indexed or
+            has changed since
+        """
+        entry = self._entry(filepath)
+        if entry is None:
+            return None
+        header, xs, ys = self._decode(entry)
+        return header, iter([(xs, ys)] if xs.size else [])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m patternindex",
+        description="Precompile pattern files into a binary index.",
+    )
+    parser.add_argument(
+        "paths", nargs="*", default=["patterns"],
+        help="pattern files or directories to index (default: patterns)",
+    )
+    parser.add_argument(
+        "--index", default=INDEX_PATH, help="index file to write (default: %(default)s)"
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="list every pattern parsed"
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    count, parsed = build_index(args.paths, args.index, args.verbose)
+    print(
+        f"Indexed {count} patterns ({parsed} parsed, {count - parsed} unchanged) "
+        f"into {args.index} ({os.path.getsize(args.index) / 1e6:.2f} MB) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
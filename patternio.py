@@ -0,0 +1,340 @@
+"""
+Pattern file reading, kept free of pygame so the headless tools can use it.
+
+Both plaintext ``.cells`` and run-length encoded ``.rle`` files are parsed
+in large blocks with NumPy rather than line by line, and handed out as
+batches of ``(xs, ys)`` coordinate arrays that go straight into an
+engine's ``add_coords`` bulk insert.
+"""
+import os
+import re
+import time
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np
+from rules import Rule
+
+# Bytes of pattern text parsed per batch
+CHUNK_SIZE = 1 << 22
+
+PatternHeader = namedtuple("PatternHeader", "width height rule name comments")
+PatternHeader.__doc__ = """\
+What a pattern file says about itself.
+
+:width, height: bounding box in cells
+:rule: Rule from the file, or None if it names none (or an unsupported one)
+:name: pattern name, or None
+:comments: remaining comment lines
+"""
+
+_RLE_SIZE = re.compile(rb"x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?", re.I)
+
+_SPACE = np.zeros(256, dtype=bool)
+_SPACE[list(b" \t\r\n")] = True
+_DIGIT = np.zeros(256, dtype=bool)
+_DIGIT[list(b"0123456789")] = True
+
+
+@lru_cache(maxsize=32)
+def _parse_rule(text):
+    """
+    Rule for a rulestring from a pattern file, or None if unsupported.
+    Cached, as building a rule's lookup tables costs more than a small load.
+    """
+    # Drop bounded-grid suffixes such as ":T100,100"
+    text = text.split(":", 1)[0]
+    try:
+        return Rule(text)
+    except ValueError:
+        return None
+
+
+# -------------------------------------------------
+# Plaintext .cells
+# -------------------------------------------------
+def _cells_block(data, row):
+    """
+    Parse whole lines of .cells text.
+
+    :return: (xs, ys, rows, width, height) where ``rows`` counts the
+        pattern rows in the block and width/height are the extent of its
+        non-blank text (0 when it has none)
+    """
+    text = np.frombuffer(data, dtype=np.uint8)
+    newline = text == ord("\n")
+    line = np.cumsum(newline) - newline            # line index of each byte
+    starts = np.concatenate(([0], np.flatnonzero(newline) + 1))
+    if starts[-1] == text.size:
+        starts = starts[:-1]
+    comment = text[starts] == ord("!")
+    line_row = row + np.cumsum(~comment) - ~comment
+
+    pattern = ~comment[line]
+    x = np.arange(text.size) - starts[line]
+    live = pattern & ((text == ord("O")) | (text == ord("*")))
+    xs = x[live]
+    ys = line_row[line[live]]
+
+    ink = pattern & ~_SPACE[text]
+    width = int(x[ink].max()) + 1 if ink.any() else 0
+    height = int(line_row[line[ink]].max()) + 1 if ink.any() else 0
+    return xs, ys, int((~comment).sum()), width, height
+
+
+def _read_cells(f, chunk_size):
+    name = None
+    comments = []
+    batches = []
+    width = height = row = 0
+    pending = b""
+
+    while True:
+        block = f.read(chunk_size)
+        data = pending + block
+        if block:
+            # Only parse whole lines; the rest waits for the next block
+            cut = data.rfind(b"\n") + 1
+            data, pending = data[:cut], data[cut:]
+        if data:
+            # Comment lines are rare and short, so collect them the slow way
+            for text in re.findall(rb"^!(.*)$", data, re.M):
+                text = text.decode("utf-8", "replace").strip()
+                if text.startswith("Name:") and name is None:
+                    name = text[5:].strip()
+                elif text:
+                    comments.append(text)
+
+            xs, ys, rows, block_width, block_height = _cells_block(data, row)
+            if xs.size:
+                batches.append((xs, ys))
+            width = max(width, block_width)
+            height = max(height, block_height)
+            row += rows
+        if not block:
+            break
+
+    return PatternHeader(width, height, None, name, comments), iter(batches)
+
+
+# -------------------------------------------------
+# Run-length encoded .rle
+# -------------------------------------------------
+def _rle_block(text, x, y):
+    """
+    Decode whitespace-free RLE that ends on a tag (never mid-number).
+
+    :param x, y: position at the start of the block
+    :return: (xs, ys, x, y) with the position after the block
+    """
+    digit = _DIGIT[text]
+    tags = np.flatnonzero(~digit)
+    kinds = text[tags]
+
+    # Run counts: read the digits before each tag, one decimal place per
+    # pass, only revisiting the tags that still have digits in front
+    counts = np.zeros(tags.size, dtype=np.int64)
+    runs = np.arange(tags.size)
+    position = tags - 1
+    place = 1
+    while runs.size:
+        has_digit = position >= 0
+        has_digit[has_digit] = digit[position[has_digit]]
+        runs, position = runs[has_digit], position[has_digit]
+        counts[runs] += (text[position] - ord("0")).astype(np.int64) * place
+        if place == 1:
+            numbered = has_digit
+        position -= 1
+        place *= 10
+    counts[~numbered] = 1
+
+    newline = kinds == ord("$")
+    dead = (kinds == ord("b")) | (kinds == ord("."))
+    live = ~newline & ~dead                         # o, or any multi-state letter
+
+    # Column of each run: running sum of widths, restarting after every $
+    widths = np.where(newline, 0, counts)
+    before = np.cumsum(widths) - widths
+    restart = np.maximum.accumulate(np.where(newline, before, -1))
+    run_x = np.where(restart < 0, x + before, before - restart)
+    heights = np.where(newline, counts, 0)
+    run_y = y + np.cumsum(heights) - heights
+
+    if tags.size:
+        x = int(run_x[-1] + widths[-1]) if not newline[-1] else 0
+        y = int(run_y[-1] + heights[-1])
+
+    # Expand live runs into one coordinate per cell
+    runs = np.flatnonzero(live)
+    lengths = counts[runs]
+    total = int(lengths.sum())
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    xs = np.repeat(run_x[runs], lengths) + offsets
+    ys = np.repeat(run_y[runs], lengths)
+    return xs, ys, x, y
+
+
+def _iter_rle(f, pending, chunk_size):
+    x = y = 0
+    done = False
+    while not done:
+        block = f.read(chunk_size)
+        text = np.frombuffer(pending + block, dtype=np.uint8)
+        text = text[~_SPACE[text]]
+
+        end = np.flatnonzero(text == ord("!"))
+        if end.size:
+            text, done = text[:end[0]], True
+        elif not block:
+            done = True
+        if not done:
+            # Hold back a trailing number until its tag arrives
+            tags = np.flatnonzero(~_DIGIT[text])
+            cut = tags[-1] + 1 if tags.size else 0
+            text, pending = text[:cut], text[cut:].tobytes()
+
+        if text.size:
+            xs, ys, x, y = _rle_block(text, x, y)
+            if xs.size:
+                yield xs, ys
+
+
+def _read_rle(f, chunk_size):
+    name = None
+    rule = None
+    comments = []
+    width = height = None
+
+    # Header: "#" lines, then "x = m, y = n[, rule = ...]"
+    while True:
+        line = f.readline()
+        if not line:
+            return PatternHeader(0, 0, rule, name, comments), iter(())
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith(b"#"):
+            tag, text = stripped[1:2], stripped[2:].decode("utf-8", "replace").strip()
+            if tag == b"N" and name is None:
+                name = text
+            elif tag == b"r":
+                rule = _parse_rule(text)
+            elif text:
+                comments.append(text)
+            continue
+
+        size = _RLE_SIZE.match(stripped)
+        if size:
+            width, height = int(size.group(1)), int(size.group(2))
+            if size.group(3):
+                rule = _parse_rule(size.group(3).decode())
+            pending = b""
+        else:
+            # No size line; this is already pattern data
+            pending = line
+        break
+
+    batches = _iter_rle(f, pending, chunk_size)
+    if width is None:
+        # Size unknown until everything is decoded
+        batches = list(batches)
+        width = max((int(xs.max()) + 1 for xs, _ in batches), default=0)
+        height = max((int(ys.max()) + 1 for _, ys in batches), default=0)
+        batches = iter(batches)
+    return PatternHeader(width, height, rule, name, comments), batches
+
+
+# -------------------------------------------------
+# Public API
+# -------------------------------------------------
+def read_pattern(filepath, chunk_size=CHUNK_SIZE):
+    """
+    Open a .cells or .rle pattern.
+
+    RLE bodies are decoded lazily, ``chunk_size`` bytes at a time, so
+    patterns with millions of cells never exist as a Python list.
+
+    :param filepath: path to the pattern; ``.rle`` files are run-length
+        encoded, anything else is read as plaintext .cells
+    :return: (header, batches) where batches yields ``(xs, ys)`` int arrays
+        of live-cell offsets from the pattern's top-left corner
+    """
+    rle = os.path.splitext(filepath)[1].lower() == ".rle"
+    f = open(filepath, "rb")
+    # No point reserving a whole chunk for a small file
+    chunk_size = max(1, min(chunk_size, os.fstat(f.fileno()).st_size))
+    try:
+        header, batches = (_read_rle if rle else _read_cells)(f, chunk_size)
+    except BaseException:
+        f.close()
+        raise
+
+    def stream():
+        with f:
+            yield from batches
+
+    return header, stream()
+
+
+def place_pattern(simulation, header, batches, grid_width=None, grid_height=None,
+                  left=0, top=0):
+    """
+    Stream a pattern into ``simulation`` centered on the grid, batch by
+    batch through ``add_coords``, dropping cells that fall outside it.
+    On an unbounded plane nothing is dropped.
+
+    :param grid_width, grid_height: area to center on (default: the board)
+    :param left, top: board position of the area's top-left corner
+    :return: (cells placed, seconds spent parsing and inserting)
+    """
+    start = time.perf_counter()
+    grid_width = simulation.width if grid_width is None else grid_width
+    grid_height = simulation.height if grid_height is None else grid_height
+    start_x = left + (grid_width - header.width) // 2
+    start_y = top + (grid_height - header.height) // 2
+    clip = not getattr(simulation, "unbounded", False)
+
+    placed = 0
+    for xs, ys in batches:
+        xs = xs + start_x
+        ys = ys + start_y
+        if clip:
+            inside = (
+                (xs >= left) & (xs < left + grid_width)
+                & (ys >= top) & (ys < top + grid_height)
+            )
+            if not inside.all():
+                xs, ys = xs[inside], ys[inside]
+        simulation.add_coords(xs, ys)
+        placed += xs.size
+    return placed, time.perf_counter() - start
+
+
+def read_cells(filepath):
+    """
+    Read a whole pattern into a list.
+
+    :param filepath: path to a .cells or .rle file
+    :return: (cells, width, height) where cells is a list of (x, y) offsets
+        of live cells relative to the pattern's top-left corner
+    """
+    header, batches = read_pattern(filepath)
+    cells = []
+    for xs, ys in batches:
+        cells.extend(zip(xs.tolist(), ys.tolist()))
+    return cells, header.width, header.height
+
+
+def center_cells(cells, pattern_width, pattern_height, grid_width, grid_height):
+    """
+    Offset pattern cells so the pattern is centered on the grid, dropping any
+    that fall outside it.
+
+    :return: set of (col, row) board positions
+    """
+    start_x = (grid_width - pattern_width) // 2
+    start_y = (grid_height - pattern_height) // 2
+    return {
+        (start_x + x, start_y + y)
+        for x, y in cells
+        if 0 <= start_x + x < grid_width and 0 <= start_y + y < grid_height
+    }
@@ -0,0 +1,171 @@
+"""
+Per-phase frame profiler.
+
+The main loop calls ``start_frame()``, then ``mark(phase)`` after each part
+of the frame, which charges the time since the previous mark to that
+phase, and ``end_frame()``. While the profiler is off every call returns
+straight away, so it can stay wired into the loop. Never imports pygame.
+"""
+import csv
+import time
+import tracemalloc
+from collections import deque
+import numpy as np
+
+# Phases of a frame, in the order they run
+PHASES = ("events", "step", "fade", "cells", "ui", "flip")
+
+# Frames kept for percentiles and the graph, and for the CSV dump
+PROFILE_WINDOW = 600
+PROFILE_LOG_FRAMES = 36_000
+
+# Leave tracemalloc's and the profiler's own bookkeeping out of the counts
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+)
+
+
+def _take_snapshot():
+    return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+class FrameProfiler:
+    """
+    Time each phase of every frame with ``perf_counter_ns``.
+
+    The last ``window`` frames are kept in a ring for rolling percentiles,
+    and up to ``log_frames`` in a log for ``write_csv``. With
+    ``trace_memory`` on, tracemalloc also counts the allocations made in
+    each phase: a snapshot is taken at every mark, and the blocks each
+    source line holds beyond the previous snapshot are added up. Blocks
+    allocated and freed again within one phase are not seen. Tracing and
+    snapshots slow Python down a lot, so this is a separate switch.
+    """
+
+    def __init__(self, window=PROFILE_WINDOW, log_frames=PROFILE_LOG_FRAMES):
+        self.enabled = False
+        self.trace_memory = False
+        self.window = window
+        self.frames = 0             # frames recorded since enabled
+        self.times = np.zeros((window, len(PHASES)), dtype=np.int64)
+        self.allocations = np.zeros((window, len(PHASES)), dtype=np.int64)
+        self.log = deque(maxlen=log_frames)
+        self._index = {name: i for i, name in enumerate(PHASES)}
+        self._frame_times = [0] * len(PHASES)
+        self._frame_allocations = [0] * len(PHASES)
+        self._last = 0
+        self._snapshot = None
+
+
+    def set_enabled(self, enabled):
+        """Start or stop recording; starting forgets earlier frames."""
+        if enabled and not self.enabled:
+            self.frames = 0
+            self.times.fill(0)
+            self.allocations.fill(0)
+            self.log.clear()
+        if not enabled:
+            self.set_trace_memory(False)
+        self.enabled = enabled
+
+
+    def set_trace_memory(self, trace):
+        """Turn tracemalloc on or off (only while the profiler is enabled)."""
+        trace = trace and self.enabled
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not trace and self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.trace_memory = trace
+        if not trace:
+            self._snapshot = None
+
+
+    def start_frame(self):
+        if not self.enabled:
+            return
+        for i in range(len(PHASES)):
+            self._frame_times[i] = 0
+            self._frame_allocations[i] = 0
+        if self.trace_memory:
+            self._snapshot = _take_snapshot()
+        self._last = time.perf_counter_ns()
+
+
+    def mark(self, phase):
+        """Charge the time since the last mark (or the frame start) to ``phase``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        i = self._index[phase]
+        self._frame_times[i] += now - self._last
+        if self.trace_memory:
+            snapshot = _take_snapshot()
+            self._frame_allocations[i] += sum(
+                stat.count_diff
+                for stat in snapshot.compare_to(self._snapshot, "lineno")
+                if stat.count_diff > 0
+            )
+            self._snapshot = snapshot
+            # Don't bill the snapshots themselves to the next phase
+            now = time.perf_counter_ns()
+        self._last = now
+
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        slot = self.frames % self.window
+        self.times[slot] = self._frame_times
+        self.allocations[slot] = self._frame_allocations
+        self.log.append((self.frames, *self._frame_times, *self._frame_allocations))
+        self.frames += 1
+
+
+    def recent(self, count=None):
+        """
+        The last ``count`` frames (all kept by default), oldest first.
+
+        :return: ``(times, allocations)``, each ``(frames, len(PHASES))``
+        """
+        kept = min(self.frames, self.window)
+        count = kept if count is None else min(count, kept)
+        order = np.arange(self.frames - count, self.frames) % self.window
+        return self.times[order], self.allocations[order]
+
+
+    def percentiles(self, quantiles=(50, 95, 99)):
+        """
+        Rolling percentiles over the kept frames, in milliseconds.
+
+        :return: ``{phase: (p50, p95, p99), "total": ...}``, empty before
+            the first frame
+        """
+        times, _ = self.recent()
+        if not len(times):
+            return {}
+        columns = np.column_stack([times, times.sum(axis=1)]) / 1e6
+        values = np.percentile(columns, quantiles, axis=0)
+        return {
+            name: tuple(values[:, i].tolist())
+            for i, name in enumerate((*PHASES, "total"))
+        }
+
+
+    def write_csv(self, path):
+        """
+        Write the logged frames to ``path``: one row per frame with each
+        phase's time in nanoseconds and number of allocations.
+
+        :return: number of frames written
+        """
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["frame"]
+                + [f"{name}_ns" for name in PHASES]
+                + [f"{name}_allocs" for name in PHASES]
+            )
+            writer.writerows(self.log)
+        return len(self.log)
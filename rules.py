@@ -0,0 +1,89 @@
+import re
+
+CONWAY = "B3/S23"
+
+_BS_PATTERN = re.compile(r"^B([0-8]*)/S([0-8]*)$", re.IGNORECASE)
+_SB_PATTERN = re.compile(r"^([0-8]*)/([0-8]*)$")
+
+
+class Rule:
+    """
+    A Life-like (outer totalistic) rule compiled into lookup tables.
+
+    Accepts ``B3/S23`` style rulestrings (case-insensitive, either order)
+    as well as the older ``S/B`` form such as ``23/3``.
+
+    :table: ``table[state][count]`` -> 1 if the cell is alive next
+        generation, for state 0/1 and 0-8 live neighbors
+    :table512: 512 entries indexed by a 3x3 neighborhood, where bit
+        ``(dy + 1) * 3 + (dx + 1)`` is the cell at offset (dx, dy), so the
+        centre cell is bit 4
+    """
+
+    def __init__(self, rulestring=CONWAY):
+        self.birth, self.survival = self._parse(rulestring)
+        self.rulestring = (
+            "B" + "".join(map(str, sorted(self.birth)))
+            + "/S" + "".join(map(str, sorted(self.survival)))
+        )
+
+        self.table = (
+            tuple(1 if n in self.birth else 0 for n in range(9)),
+            tuple(1 if n in self.survival else 0 for n in range(9)),
+        )
+        self.table512 = bytes(
+            self.table[(index >> 4) & 1][bin(index & ~0b10000).count("1")]
+            for index in range(512)
+        )
+
+
+    @staticmethod
+    def _parse(rulestring):
+        text = rulestring.strip().replace(" ", "")
+        # Accept "S23/B3" by swapping it into B/S order
+        if text[:1].upper() == "S" and "/" in text:
+            survive, born = text.split("/", 1)
+            text = f"{born}/{survive}"
+
+        match = _BS_PATTERN.match(text)
+        if match:
+            born, survive = match.groups()
+        else:
+            match = _SB_PATTERN.match(text)
+            if not match:
+                raise ValueError(f"Invalid rulestring: '{rulestring}'")
+            survive, born = match.groups()
+
+        birth = frozenset(int(n) for n in born)
+        if 0 in birth:
+            raise ValueError(
+                f"'{rulestring}': B0 rules are not supported (empty space "
+                "would come alive everywhere)"
+            )
+        return birth, frozenset(int(n) for n in survive)
+
+
+    @property
+    def is_conway(self):
+        return self.rulestring == CONWAY
+
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and self.rulestring == other.rulestring
+
+
+    def __hash__(self):
+        return hash(self.rulestring)
+
+
+    def __repr__(self):
+        return f"Rule('{self.rulestring}')"
+
+
+    def __str__(self):
+        return self.rulestring
+
+
+def compile_rule(rule):
+    """Return ``rule`` as a ``Rule``, parsing it if it's a rulestring."""
+    return rule if isinstance(rule, Rule) else Rule(rule)
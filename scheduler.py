@@ -0,0 +1,90 @@
+"""
+Time-based generation scheduling, independent of the frame rate.
+"""
+import time
+
+# Longest frame gap that still earns generations; anything beyond it
+# (window drags, breakpoints) is treated as a pause rather than a backlog
+MAX_FRAME_GAP = 0.25
+
+
+class GenerationScheduler:
+    """
+    Decide how many generations to step each frame to hit a target rate.
+
+    Every frame earns ``rate * dt`` generations. Whole generations are
+    stepped until they run out or the frame's time ``budget`` is spent, and
+    the fractional remainder carries into the next frame, so e.g. 50 gen/s
+    at 120 FPS steps on five frames out of twelve instead of rounding to
+    every other frame. Generations that didn't fit in the budget are
+    dropped rather than queued, so a slow engine runs as fast as it can
+    without the frame rate spiralling down.
+
+    The achieved rate is measured separately from the generation counter,
+    which also works for engines that step on their own clock.
+
+    :param rate: target generations per second
+    :param budget: seconds per frame that may be spent stepping
+    :param window: seconds between updates of ``achieved``
+    """
+
+    def __init__(self, rate, budget=0.008, window=0.5):
+        self.rate = rate
+        self.budget = budget
+        self.window = window
+        self.carry = 0.0
+        self.achieved = 0.0
+        self._mark_time = time.perf_counter()
+        self._mark_generation = None
+
+
+    def reset(self):
+        """Forget any fractional generation owed from earlier frames."""
+        self.carry = 0.0
+
+
+    def run(self, step, dt):
+        """
+        Call ``step()`` as many times as this frame has earned and the time
+        budget allows.
+
+        :param step: callable advancing the simulation by one generation
+        :param dt: seconds since the previous frame
+        :return: number of generations stepped
+        """
+        self.carry += self.rate * min(dt, MAX_FRAME_GAP)
+        deadline = time.perf_counter() + self.budget
+        steps = 0
+        while self.carry >= 1:
+            step()
+            steps += 1
+            self.carry -= 1
+            if time.perf_counter() >= deadline:
+                break
+
+        # Out of budget: keep only the fraction, not the backlog
+        self.carry %= 1.0
+        return steps
+
+
+    def observe(self, generation):
+        """
+        Update ``achieved`` from the simulation's generation counter. A
+        counter that moved backwards (load, clear) restarts the measurement.
+        """
+        now = time.perf_counter()
+        if self._mark_generation is None or generation < self._mark_generation:
+            self.rebase(generation)
+            return
+
+        elapsed = now - self._mark_time
+        if elapsed >= self.window:
+            self.achieved = (generation - self._mark_generation) / elapsed
+            self._mark_time = now
+            self._mark_generation = generation
+
+
+    def rebase(self, generation):
+        """Restart the rate measurement at ``generation`` (e.g. after a jump)."""
+        self._mark_time = time.perf_counter()
+        self._mark_generation = generation
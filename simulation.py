@@ -1,43 +1,143 @@
+import random
 from collections import defaultdict
+import numpy as np
+from engines.cellset import coords_from_cells
+from rules import CONWAY, compile_rule
+
+# Cells drawn per batch by random_soup_batches
+SOUP_BATCH = 1 << 22
+
+# Offsets of the eight cells around a cell
+_NEIGHBORS = tuple(
+    (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)
+)
+
+
+def random_soup(width, height, density, seed=None):
+    """
+    Return a set of randomly placed live cells.
+
+    :param width: board width in cells
+    :param height: board height in cells
+    :param density: probability (0-1) that each cell starts alive
+    :param seed: optional seed for a reproducible soup
+    """
+    rng = random.Random(seed)
+    return {
+        (col, row)
+        for col in range(width)
+        for row in range(height)
+        if rng.random() < density
+    }
+
+
+def random_soup_batches(width, height, density, seed=None):
+    """
+    Like ``random_soup``, but drawn with NumPy a band of rows at a time and
+    handed out as ``(xs, ys)`` coordinate arrays for an engine's
+    ``add_coords``, so boards of any size fill in seconds.
+    """
+    rng = np.random.default_rng(seed)
+    # 16-bit draws against a fixed-point threshold are cheaper than floats
+    threshold = round(density * 0x10000)
+    band = max(1, SOUP_BATCH // max(width, 1))
+    for top in range(0, height, band):
+        rows = min(band, height - top)
+        draws = rng.integers(0, 0x10000, (rows, width), dtype=np.uint32)
+        ys, xs = np.nonzero(draws < threshold)
+        yield xs, ys + top
+
 
 class LifeSimulation:
-    def __init__(self, width, height):
+    """
+    Set-based Game of Life: ``positions`` holds the ``(col, row)`` of every
+    live cell, so memory and step cost follow the population.
+
+    Set ``track_changes`` to have ``step()`` leave the generation's
+    ``births`` and ``deaths`` as ``(xs, ys)`` int arrays.
+
+    :param unbounded: run on an infinite plane; ``width`` and ``height``
+        then only describe the viewport and never clip cells
+    """
+
+    def __init__(self, width, height, rule=CONWAY, unbounded=False):
         self.width = width
         self.height = height
+        self.unbounded = unbounded
         self.positions = set()
         self.generations = 0
+        self.rule = compile_rule(rule)
+        self.track_changes = False
+        self.births = self.deaths = None
 
 
     def clear(self):
         self.positions.clear()
 
 
+    def add_cells(self, cells):
+        """
+        Bulk-insert live cells, ignoring any that fall outside the board.
+
+        :param cells: iterable of (col, row) tuples
+        """
+        if self.unbounded:
+            self.positions.update(cells)
+            return
+        width, height = self.width, self.height
+        self.positions.update(
+            (x, y) for x, y in cells if 0 <= x < width and 0 <= y < height
+        )
+
+
+    def add_coords(self, xs, ys):
+        """
+        Bulk-insert live cells given as coordinate arrays (e.g. NumPy int
+        arrays), ignoring any that fall outside the board.
+
+        :param xs: columns
+        :param ys: rows
+        """
+        self.add_cells(zip(xs.tolist(), ys.tolist()))
+
+
     def step(self):
         """Advance the simulation by one generation."""
-        self.positions = self._next_generation()
+        old, self.positions = self.positions, self._next_generation()
+        if self.track_changes:
+            self.births = coords_from_cells(self.positions - old)
+            self.deaths = coords_from_cells(old - self.positions)
         self.generations += 1
 
     
     def _next_generation(self):
-        """Adjusts the grid based on the rules of Conway's Game of Life."""
+        """Adjusts the grid based on the simulation's Life-like rule."""
         neighbor_counts = defaultdict(int)
+        born, survives = self.rule.table
+        if survives[0]:
+            # Under S0 a live cell with no live neighbors must still be
+            # looked at, so every live cell starts out with a count of 0
+            neighbor_counts.update(dict.fromkeys(self.positions, 0))
 
         # Count neighbors of all live cells
-        for x, y in self.positions:
-            for dx in (-1, 0, 1):
-                for dy in (-1, 0, 1):
-                    if dx == 0 and dy == 0:
-                        continue  # Skip; this is the cell itself
+        if self.unbounded:
+            for x, y in self.positions:
+                for dx, dy in _NEIGHBORS:
+                    neighbor_counts[(x + dx, y + dy)] += 1
+        else:
+            for x, y in self.positions:
+                for dx, dy in _NEIGHBORS:
                     nx, ny = x + dx, y + dy
                     if 0 <= nx < self.width and 0 <= ny < self.height:
                         neighbor_counts[(nx, ny)] += 1
 
         
         new_positions = set()
+        positions = self.positions
 
-        # Apply Life rules based on neighbor counts
+        # Apply the rule with one table lookup per candidate cell
         for pos, count in neighbor_counts.items():
-            if count == 3 or (count == 2 and pos in self.positions):
+            if (survives if pos in positions else born)[count]:
                 new_positions.add(pos)
 
         return new_positions
@@ -45,11 +145,12 @@ class LifeSimulation:
 
     def update_grid_size(self, width, height, tile_size):
         """
-        Update the grid size based on screen dimensions and tile size.
-        
+        Update the grid size based on screen dimensions and tile size. On
+        an unbounded plane this only resizes the viewport.
+
         :param width: screen width in pixels
         :param height: screen height in pixels
         :param tile_size: size of each cell in pixels (zoom level)
         """
-        self.width = width // tile_size
-        self.height = height // tile_size
\ No newline at end of file
+        self.width = int(width // tile_size)
+        self.height = int(height // tile_size)
\ No newline at end of file
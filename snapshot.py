@@ -0,0 +1,236 @@
+"""
+Binary board snapshots: save a running simulation and restore it later.
+
+File layout (little-endian)::
+
+    header  128 bytes: magic, version, kind, width, height, generation,
+            population, rulestring, generation high bits, origin x,
+            origin y
+    body    DENSE:  ``height`` rows of ``ceil(width / 64)`` uint64 words,
+                    column ``x`` in bit ``x % 64`` of word ``x // 64``
+            SPARSE: ``population`` (x, y) pairs of uint32
+
+The dense body is exactly ``BitPackedSimulation``'s board, so restoring
+into that engine is one straight copy of the mapped words, with no
+unpacking. Other engines get the cells through their bulk-insert path.
+Saving writes a temporary file and swaps it into place, so a board
+restored from ``path`` can be saved back to ``path``.
+
+Snapshots of an unbounded plane store the bounding box of the live cells;
+the origin fields give the plane position of its top-left corner.
+
+The generation field holds the low 64 bits of the counter. Hashlife can
+jump past 2**64 generations, so the bits above that follow the rulestring
+as a length-prefixed little-endian integer (empty for ordinary counts).
+Version 1 files have a 64-byte rulestring field there instead. Rulestrings
+are far shorter than that, so those bytes are zero, which reads as an
+empty prefix, and both versions load the same way.
+"""
+import mmap
+import os
+import struct
+from collections import namedtuple
+import numpy as np
+from engines import create_simulation
+from engines.bitpacked import BitPackedSimulation, WORD, WORD_BITS
+from engines.cellset import coords_from_cells
+from rules import Rule
+
+SNAPSHOT_EXTENSION = ".lifesnap"
+
+DENSE, SPARSE = 0, 1
+
+_MAGIC = b"LIFESNAP"
+_VERSION = 2
+_READABLE_VERSIONS = (1, 2)
+# magic, version, kind, width, height, generation (low 64 bits),
+# population, rule, byte count + bytes of the generation's high bits,
+# origin x, origin y (files written before the origin existed hold zeros)
+_HEADER = struct.Struct("<8sIIQQQQ32sB31sqq")
+_GENERATION_HIGH_BYTES = 31
+BODY_OFFSET = 128
+
+# Region passed to unbounded engines' live_cells() to get the whole plane
+_PLANE = (-(1 << 62), -(1 << 62), 1 << 62, 1 << 62)
+
+SnapshotHeader = namedtuple(
+    "SnapshotHeader",
+    "kind width height generation population rule origin_x origin_y",
+    defaults=(0, 0),
+)
+SnapshotHeader.__doc__ = """\
+What a snapshot file holds.
+
+:kind: DENSE (bit-packed board) or SPARSE (coordinate list)
+:rule: Rule the board was running
+:origin_x, origin_y: board position of the body's top-left corner
+"""
+
+
+def _live_coords(simulation, region=()):
+    """(xs, ys) of every live cell, from whichever accessor the engine has."""
+    live_cells = getattr(simulation, "live_cells", None)
+    if live_cells is not None:
+        return live_cells(*region)
+    return coords_from_cells(simulation.positions)
+
+
+def _packed_board(simulation):
+    """The board as bit-packed (height, words) uint64 rows."""
+    packed_board = getattr(simulation, "packed_board", None)
+    if packed_board is not None:
+        return packed_board()
+    packed = BitPackedSimulation(simulation.width, simulation.height)
+    packed.add_coords(*_live_coords(simulation))
+    return packed.board
+
+
+def save_snapshot(simulation, path, sparse=None):
+    """
+    Write ``simulation``'s board, generation and rule to ``path``.
+
+    :param sparse: store a coordinate list instead of a bit-packed board;
+        by default whichever is smaller (a coordinate takes 64 bits, so
+        below 1/64 density the list wins)
+    :return: the SnapshotHeader written
+    """
+    coords = None
+    origin_x = origin_y = 0
+    if getattr(simulation, "unbounded", False):
+        # Store just the bounding box of the live cells
+        xs, ys = _live_coords(simulation, _PLANE)
+        if xs.size:
+            origin_x, origin_y = int(xs.min()), int(ys.min())
+            xs, ys = xs - origin_x, ys - origin_y
+        coords = xs, ys
+        width = int(xs.max()) + 1 if xs.size else 0
+        height = int(ys.max()) + 1 if ys.size else 0
+    else:
+        width, height = simulation.width, simulation.height
+
+    if sparse is None:
+        population = getattr(simulation, "population", None)
+        if population is None:
+            population = len(simulation.positions)
+        words = (width + WORD_BITS - 1) // WORD_BITS
+        sparse = population * 8 <= height * words * 8
+
+    if sparse:
+        xs, ys = coords or _live_coords(simulation)
+        body = np.empty((len(xs), 2), dtype="<u4")
+        body[:, 0] = xs
+        body[:, 1] = ys
+        kind, population = SPARSE, len(body)
+    else:
+        if coords:
+            packed = BitPackedSimulation(width, height)
+            packed.add_coords(*coords)
+            board = packed.board
+        else:
+            board = _packed_board(simulation)
+        body = np.ascontiguousarray(board, dtype=WORD)
+        kind, population = DENSE, int(np.bitwise_count(body).sum())
+
+    header = SnapshotHeader(
+        kind, width, height, simulation.generations, population, simulation.rule,
+        origin_x, origin_y,
+    )
+    high = header.generation >> 64
+    high = high.to_bytes((high.bit_length() + 7) // 8, "little")
+    if len(high) > _GENERATION_HIGH_BYTES:
+        raise ValueError(f"generation {header.generation} is too large to store")
+    # Write to a temporary file and swap it in, so the old snapshot stays
+    # whole until the new one is complete
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(
+            _MAGIC, _VERSION, kind, width, height, header.generation & (2**64 - 1),
+            population, str(header.rule).encode("ascii"), len(high), high,
+            origin_x, origin_y,
+        ).ljust(BODY_OFFSET, b"\0"))
+        if body.size:
+            # Written straight from the array's memory, without a bytes copy
+            f.write(memoryview(body).cast("B"))
+    os.replace(temp_path, path)
+    return header
+
+
+def read_snapshot(path):
+    """
+    Map a snapshot file into memory.
+
+    The body is a copy-on-write mapping: it can be modified in place
+    without touching the file, and only the pages actually used are read.
+
+    :return: (header, body) where body is a (height, words) uint64 array
+        for DENSE snapshots or a (population, 2) uint32 array for SPARSE
+    """
+    with open(path, "rb") as f:
+        raw = f.read(BODY_OFFSET)
+        if len(raw) < BODY_OFFSET:
+            raise ValueError(f"'{path}' is not a snapshot (too short)")
+        (magic, version, kind, width, height, generation, population, rule,
+         high_length, high, origin_x, origin_y) = _HEADER.unpack_from(raw)
+        if magic != _MAGIC:
+            raise ValueError(f"'{path}' is not a snapshot")
+        if version not in _READABLE_VERSIONS:
+            raise ValueError(f"'{path}' is snapshot version {version}, expected {_VERSION}")
+        generation |= int.from_bytes(high[:high_length], "little") << 64
+        header = SnapshotHeader(
+            kind, width, height, generation, population,
+            Rule(rule.rstrip(b"\0").decode("ascii")), origin_x, origin_y,
+        )
+
+        if kind == DENSE:
+            shape, dtype = (height, (width + WORD_BITS - 1) // WORD_BITS), WORD
+        elif kind == SPARSE:
+            shape, dtype = (population, 2), np.dtype("<u4")
+        else:
+            raise ValueError(f"'{path}' has unknown snapshot kind {kind}")
+
+        count = shape[0] * shape[1]
+        if count == 0:
+            return header, np.zeros(shape, dtype=dtype)
+        # The mapping stays alive as long as the array does
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    body = np.frombuffer(mapped, dtype=dtype, count=count, offset=BODY_OFFSET)
+    return header, body.reshape(shape)
+
+
+def restore_snapshot(simulation, header, body):
+    """
+    Replace ``simulation``'s board and generation counter with a snapshot's.
+    Cells that don't fit on the simulation's board are dropped; the rule is
+    left as it is.
+    """
+    load_packed = getattr(simulation, "load_packed", None)
+    origin = header.origin_x, header.origin_y
+    if header.kind == DENSE and load_packed is not None and origin == (0, 0) and (
+        simulation.width, simulation.height
+    ) == (header.width, header.height):
+        load_packed(body)
+    else:
+        if header.kind == DENSE:
+            packed = BitPackedSimulation(header.width, header.height)
+            packed.load_packed(body)
+            xs, ys = packed.live_cells()
+        else:
+            xs, ys = body[:, 0].astype(np.int64), body[:, 1].astype(np.int64)
+        simulation.clear()
+        simulation.add_coords(xs + header.origin_x, ys + header.origin_y)
+    simulation.generations = header.generation
+
+
+def load_snapshot(path, engine="bitpacked", **options):
+    """
+    Build a simulation of the snapshot's size and rule and restore it.
+
+    :param engine: key in ``engines.ENGINES``
+    :param options: engine-specific keyword arguments
+    """
+    header, body = read_snapshot(path)
+    simulation = create_simulation(
+        engine, header.width, header.height, **dict(options, rule=header.rule)
+    )
+    restore_snapshot(simulation, header, body)
+    return simulation
@@ -0,0 +1,511 @@
+"""
+Soup search: run many seeded random soups and take a census of the ash.
+
+Soups are fanned out across a process pool. Each one runs on a small dense
+board until its population repeats, and the remaining cells are split into
+connected objects. Spaceships that reach the edge of the board are
+classified and taken off it; anything else that gets there doubles the
+board around it, and past ``MAX_BOARD_SIZE`` the soup finishes on the
+unbounded sparse engine. Every object is classified as a still life, oscillator
+or spaceship and named by its apgcode (``xs4_33`` is the block,
+``xp2_7`` the blinker, ``xq4_153`` the glider), the canonical form over
+every rotation, reflection and phase. Classifications are kept in a cache
+shared by all workers, so a block is only ever analysed once.
+
+Never imports pygame.
+
+    python -m soupsearch --soups 10000 --seed lab1 --census census.json
+    python -m soupsearch --soups 500 --rule B36/S23 --workers 4
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+import numpy as np
+from engines.cellset import coords_from_cells
+from engines.dense import DenseSimulation
+from rules import CONWAY, Rule, compile_rule
+from simulation import LifeSimulation, random_soup
+
+SOUP_SIZE = 16
+SOUP_DENSITY = 0.5
+# Dense board each soup starts on, with the soup in the middle, and the
+# largest it grows to before the soup moves to an unbounded plane
+BOARD_SIZE = 128
+MAX_BOARD_SIZE = 512
+# Cells touching this band along the edge are checked for escaping ships
+EDGE = 4
+MAX_GENERATIONS = 20_000
+# Longest population period (of the whole ash) and object period looked for
+MAX_PERIOD = 60
+# Generations between stabilization checks
+CHECK_EVERY = 50
+# Most soups handed to a worker at a time
+BATCH = 32
+
+_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+_ZERO_RUNS = re.compile("0{2,}")
+_NEIGHBORS = tuple(
+    (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)
+)
+_NEAR = tuple(
+    (dx, dy) for dx in range(-2, 3) for dy in range(-2, 3) if (dx, dy) != (0, 0)
+)
+# (x, y) -> (x', y') for the eight rotations and reflections of the square
+_SYMMETRIES = (
+    lambda x, y: (x, y),
+    lambda x, y: (-x, y),
+    lambda x, y: (x, -y),
+    lambda x, y: (-x, -y),
+    lambda x, y: (y, x),
+    lambda x, y: (-y, x),
+    lambda x, y: (y, -x),
+    lambda x, y: (-y, -x),
+)
+
+# Per-worker state, set up by _init_worker
+_rule = None
+_shared_cache = None
+_local_cache = {}
+
+
+def _normalize(cells):
+    """``cells`` moved so the bounding box starts at (0, 0), as a sorted tuple."""
+    min_x = min(x for x, _ in cells)
+    min_y = min(y for _, y in cells)
+    return tuple(sorted((x - min_x, y - min_y) for x, y in cells))
+
+
+def wechsler(cells):
+    """
+    Extended Wechsler format of a non-empty set of cells (the part of an
+    apgcode after the underscore): 5-row strips separated by ``z``, one
+    base-32 digit per column, with runs of empty columns shortened to
+    ``w`` (2), ``x`` (3) or ``y`` plus a digit (4 to 39).
+    """
+    cells = _normalize(cells)
+    width = max(x for x, _ in cells) + 1
+    height = max(y for _, y in cells) + 1
+    columns = [[0] * width for _ in range((height + 4) // 5)]
+    for x, y in cells:
+        columns[y // 5][x] |= 1 << (y % 5)
+
+    strips = []
+    for strip in columns:
+        digits = "".join(_ALPHABET[v] for v in strip).rstrip("0")
+        strips.append(_ZERO_RUNS.sub(lambda m: _zero_run(len(m.group())), digits))
+    return "z".join(strips)
+
+
+def _zero_run(length):
+    """Wechsler shorthand for ``length`` empty columns."""
+    out = []
+    while length >= 4:
+        take = min(length, 39)
+        out.append("y" + _ALPHABET[take - 4])
+        length -= take
+    out.append(("", "0", "w", "x")[length])
+    return "".join(out)
+
+
+def canonical_code(prefix, phases):
+    """
+    apgcode of an object: the shortest, then alphabetically first,
+    Wechsler code over every phase and orientation, after ``prefix``.
+    """
+    codes = (
+        wechsler([transform(x, y) for x, y in phase])
+        for phase in phases
+        for transform in _SYMMETRIES
+    )
+    return f"{prefix}_{min(codes, key=lambda c: (len(c), c))}"
+
+
+def classify(cells, rule, max_period=MAX_PERIOD):
+    """
+    Run an isolated object until it repeats, up to ``max_period``
+    generations.
+
+    :return: ``(code, kind, period)`` where kind is ``"still life"``,
+        ``"oscillator"``, ``"spaceship"`` or ``"unknown"`` (the object dies,
+        grows, or doesn't repeat in time; its code is then ``zz_<cells>``)
+    """
+    simulation = LifeSimulation(0, 0, rule=rule, unbounded=True)
+    simulation.positions = set(cells)
+    start = _normalize(cells)
+    origin = (min(x for x, _ in cells), min(y for _, y in cells))
+    phases = [cells]
+
+    for period in range(1, max_period + 1):
+        simulation.step()
+        current = simulation.positions
+        if not current:
+            break
+        if _normalize(current) == start:
+            if (min(x for x, _ in current), min(y for _, y in current)) != origin:
+                return canonical_code(f"xq{period}", phases), "spaceship", period
+            if period == 1:
+                return canonical_code(f"xs{len(cells)}", phases), "still life", 1
+            return canonical_code(f"xp{period}", phases), "oscillator", period
+        phases.append(current)
+
+    return f"zz_{len(cells)}", "unknown", None
+
+
+def _separable(parts, generations):
+    """
+    Whether ``parts`` evolve exactly as they would apart for
+    ``generations`` generations, i.e. they are near each other but never
+    interact.
+    """
+    whole = LifeSimulation(0, 0, rule=_rule, unbounded=True)
+    whole.positions = set().union(*parts)
+    apart = []
+    for part in parts:
+        simulation = LifeSimulation(0, 0, rule=_rule, unbounded=True)
+        simulation.positions = set(part)
+        apart.append(simulation)
+    for _ in range(generations):
+        whole.step()
+        for simulation in apart:
+            simulation.step()
+        if whole.positions != set().union(*(sim.positions for sim in apart)):
+            return False
+    return True
+
+
+def _classify_cluster(cluster, footprint):
+    """
+    Objects in a cluster of nearby cells: its 8-connected parts when each
+    is an object of its own that never touches the others (a block beside
+    a blinker), else the whole cluster as one object.
+    """
+    parts = components(cluster, footprint, _NEIGHBORS)
+    if len(parts) > 1:
+        results = [classify(part, _rule) for part in parts]
+        if all(kind != "unknown" for _, kind, _ in results):
+            generations = min(math.lcm(*(period for _, _, period in results)), MAX_PERIOD)
+            if _separable(parts, generations):
+                return tuple(results)
+    return (classify(cluster, _rule),)
+
+
+def _lookup(cluster, footprint):
+    """
+    Objects in ``cluster`` as ``(code, kind, period)`` tuples, from the
+    caches when this phase of it was seen before.
+    """
+    key = _normalize(cluster)
+    result = _local_cache.get(key)
+    if result is None and _shared_cache is not None:
+        result = _shared_cache.get(key)
+    if result is None:
+        result = _classify_cluster(cluster, footprint)
+        if _shared_cache is not None:
+            _shared_cache[key] = result
+    _local_cache[key] = result
+    return result
+
+
+def components(cells, footprint, neighbors=_NEAR):
+    """
+    Split ``cells`` into clusters: the components of ``footprint`` (every
+    cell alive at some point in the last period, so an oscillator's phases
+    and a spaceship's path hold together) under ``neighbors``, each
+    returned as the live cells inside it. Cells up to two apart share a
+    neighbor, so by default those are kept together.
+    """
+    clusters = []
+    unseen = set(footprint)
+    while unseen:
+        stack = [unseen.pop()]
+        group = set(stack)
+        while stack:
+            x, y = stack.pop()
+            for dx, dy in neighbors:
+                pos = (x + dx, y + dy)
+                if pos in unseen:
+                    unseen.discard(pos)
+                    group.add(pos)
+                    stack.append(pos)
+        alive = group & cells
+        if alive:
+            clusters.append(alive)
+    return clusters
+
+
+def _population_period(populations, max_period):
+    """Smallest period the recent population history repeats with, or None."""
+    window = list(populations)
+    for period in range(1, max_period + 1):
+        if window[period:] == window[:-period]:
+            return period
+    return None
+
+
+def _cells(board):
+    """Live cells of a dense board as a set of (x, y) tuples."""
+    ys, xs = np.nonzero(board)
+    return set(zip(xs.tolist(), ys.tolist()))
+
+
+def _census(cells, footprint):
+    census = Counter()
+    for cluster in components(cells, footprint):
+        census.update(_lookup(cluster, footprint))
+    return census
+
+
+def _at_edge(board):
+    return bool(
+        board[:EDGE].any() or board[-EDGE:].any()
+        or board[:, :EDGE].any() or board[:, -EDGE:].any()
+    )
+
+
+def _remove_escapes(simulation, escaped):
+    """
+    Take the objects touching the edge band off the board, adding them to
+    ``escaped``, if they are all spaceships (which only ever fly outwards
+    from the soup).
+
+    :return: False, leaving the board alone, if anything else is there
+    """
+    size = simulation.width
+    cells = _cells(simulation.board)
+    leaving = [
+        cluster for cluster in components(cells, cells)
+        if any(not EDGE <= v < size - EDGE for cell in cluster for v in cell)
+    ]
+    objects = [_lookup(cluster, cluster) for cluster in leaving]
+    if any(kind != "spaceship" for found in objects for _, kind, _ in found):
+        return False
+    for cluster, found in zip(leaving, objects):
+        escaped.update(found)
+        xs, ys = coords_from_cells(cluster)
+        simulation.board[ys, xs] = 0
+    return True
+
+
+def _grown(simulation):
+    """A dense simulation twice the size, with the board in its middle."""
+    size = simulation.width
+    grown = DenseSimulation(2 * size, 2 * size, rule=simulation.rule)
+    grown.board[size // 2:size // 2 + size, size // 2:size // 2 + size] = simulation.board
+    grown.generations = simulation.generations
+    return grown
+
+
+def run_soup(seed, max_generations=MAX_GENERATIONS, max_period=MAX_PERIOD):
+    """
+    Run one soup until its population is periodic and every object in the
+    ash classifies, or ``max_generations`` have run.
+
+    :return: ``(census, generations)``, the census a Counter of
+        ``(code, kind, period)`` classifications
+    """
+    simulation = DenseSimulation(BOARD_SIZE, BOARD_SIZE, rule=_rule)
+    xs, ys = coords_from_cells(random_soup(SOUP_SIZE, SOUP_SIZE, SOUP_DENSITY, seed))
+    offset = (BOARD_SIZE - SOUP_SIZE) // 2
+    simulation.add_coords(xs + offset, ys + offset)
+    boards = deque(maxlen=max_period)
+    populations = deque(maxlen=4 * max_period)
+    escaped = Counter()
+
+    while True:
+        if _at_edge(simulation.board):
+            if _remove_escapes(simulation, escaped):
+                # The population dropped; the history no longer matches
+                boards.clear()
+                populations.clear()
+            elif simulation.width < MAX_BOARD_SIZE:
+                # Not a ship: it may grow or come back, so give it room
+                pad = simulation.width // 2
+                simulation = _grown(simulation)
+                boards = deque((np.pad(b, pad) for b in boards), maxlen=max_period)
+            else:
+                census, generations = _run_unbounded(
+                    _cells(simulation.board), simulation.generations,
+                    max_generations, max_period,
+                )
+                return census + escaped, generations
+
+        board = simulation.board
+        boards.append(board.copy())
+        populations.append(int(np.count_nonzero(board)))
+        done = simulation.generations >= max_generations
+        if (
+            done or (
+                simulation.generations % CHECK_EVERY == 0
+                and len(populations) == populations.maxlen
+            )
+        ):
+            period = _population_period(populations, max_period)
+            if period is not None or done:
+                recent = list(boards)[-(period or max_period):]
+                census = _census(_cells(board), _cells(np.logical_or.reduce(recent)))
+                if done or not any(kind == "unknown" for _, kind, _ in census):
+                    return census + escaped, simulation.generations
+        simulation.step()
+
+
+def _run_unbounded(cells, generation, max_generations, max_period):
+    """``run_soup``'s loop on the unbounded sparse engine, from ``cells``."""
+    simulation = LifeSimulation(0, 0, rule=_rule, unbounded=True)
+    simulation.positions = cells
+    simulation.generations = generation
+    history = deque(maxlen=max_period)
+    populations = deque(maxlen=4 * max_period)
+
+    while True:
+        history.append(simulation.positions)
+        populations.append(len(simulation.positions))
+        done = simulation.generations >= max_generations
+        if (
+            done or (
+                simulation.generations % CHECK_EVERY == 0
+                and len(populations) == populations.maxlen
+            )
+        ):
+            period = _population_period(populations, max_period)
+            if period is not None or done:
+                footprint = set().union(*list(history)[-(period or max_period):])
+                census = _census(simulation.positions, footprint)
+                if done or not any(kind == "unknown" for _, kind, _ in census):
+                    return census, simulation.generations
+        simulation.step()
+
+
+def _init_worker(rulestring, shared_cache):
+    global _rule, _shared_cache
+    _rule = compile_rule(rulestring)
+    _shared_cache = shared_cache
+
+
+def _run_batch(seed, first, count, max_generations):
+    """Combined census and generation count of soups ``first`` to ``first + count``."""
+    census = Counter()
+    generations = 0
+    for index in range(first, first + count):
+        soup_census, soup_generations = run_soup(f"{seed}:{index}", max_generations)
+        census.update(soup_census)
+        generations += soup_generations
+    return census, generations
+
+
+def search(soups, seed, rule=CONWAY, workers=None, max_generations=MAX_GENERATIONS):
+    """
+    Run ``soups`` soups named ``"<seed>:<index>"`` across ``workers``
+    processes.
+
+    :return: summary dict with the census sorted by count
+    """
+    workers = workers or os.cpu_count() or 1
+    rulestring = compile_rule(rule).rulestring
+    census = Counter()
+    generations = 0
+
+    start = time.perf_counter()
+    with Manager() as manager:
+        shared_cache = manager.dict()
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(rulestring, shared_cache)
+        ) as pool:
+            # Small enough batches that every worker gets several
+            batch = max(1, min(BATCH, soups // (workers * 4)))
+            jobs = [
+                pool.submit(_run_batch, seed, first, min(batch, soups - first), max_generations)
+                for first in range(0, soups, batch)
+            ]
+            for job in jobs:
+                batch_census, batch_generations = job.result()
+                census.update(batch_census)
+                generations += batch_generations
+        cached = len(shared_cache)
+    elapsed = time.perf_counter() - start
+
+    soups_per_s = soups / elapsed if elapsed > 0 else None
+    return {
+        "rule": rulestring,
+        "seed": seed,
+        "soups": soups,
+        "soup_size": f"{SOUP_SIZE}x{SOUP_SIZE}",
+        "workers": workers,
+        "elapsed_s": round(elapsed, 3),
+        "soups_per_s": round(soups_per_s, 2) if soups_per_s else None,
+        "soups_per_s_per_core": round(soups_per_s / workers, 2) if soups_per_s else None,
+        "generations": generations,
+        "objects": sum(census.values()),
+        "distinct_objects": len(census),
+        "classified_shapes": cached,
+        "census": [
+            {"code": code, "kind": kind, "period": period, "count": count}
+            for (code, kind, period), count in census.most_common()
+        ],
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m soupsearch",
+        description="Run random soups in parallel and census the objects they leave.",
+    )
+    parser.add_argument(
+        "-n", "--soups", type=int, default=1000,
+        help="number of soups to run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--seed", default="0",
+        help="seed prefix; soup i is seeded with '<seed>:<i>' (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rule", type=Rule, default=Rule(CONWAY),
+        help="Life-like rulestring (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--max-generations", type=int, default=MAX_GENERATIONS,
+        help="give up on a soup that hasn't stabilized by then (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--census", metavar="FILE", default="census.json",
+        help="where to write the census as JSON (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10,
+        help="most common objects to print (default: %(default)s)",
+    )
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.soups < 1:
+        parser.error("--soups must be at least 1")
+
+    summary = search(
+        args.soups, args.seed, args.rule, args.workers, args.max_generations
+    )
+    with open(args.census, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    for key, value in summary.items():
+        if key != "census":
+            print(f"{key:>21}: {value}")
+    for entry in summary["census"][:args.top]:
+        period = f" p{entry['period']}" if entry["period"] else ""
+        print(f"{entry['count']:>10}  {entry['code']}  ({entry['kind']}{period})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Initial-density sweep: how random soups end up, by starting density.
+
+Every density gets ``--boards`` random boards, and all of them run together
+in one ``BatchedSimulation``. Boards that die out or stabilize leave the
+batch as they finish. Never imports pygame.
+
+    python -m sweep --densities 0.05:0.95:0.05 --boards 500 --size 64x64
+    python -m sweep --densities 0.2,0.35,0.5 --rule B36/S23 --json
+"""
+import argparse
+import json
+import sys
+import time
+import numpy as np
+from engines.batched import BatchedSimulation, random_boards
+from headless import parse_size
+from rules import CONWAY, Rule
+
+
+def parse_densities(text):
+    """Parse ``start:stop:step`` (stop included) or a comma-separated list."""
+    try:
+        if ":" in text:
+            start, stop, step = (float(v) for v in text.split(":"))
+            values = np.arange(start, stop + step / 2, step)
+        else:
+            values = [float(v) for v in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected START:STOP:STEP or a comma-separated list, got '{text}'"
+        )
+    if not all(0 <= v <= 1 for v in values):
+        raise argparse.ArgumentTypeError("densities must be between 0 and 1")
+    return [round(float(v), 6) for v in values]
+
+
+def sweep(densities, boards, width, height, generations, rule=CONWAY, seed=None):
+    """
+    Run ``boards`` soups at each density for up to ``generations`` steps.
+
+    :return: (one summary dict per density, elapsed seconds)
+    """
+    per_board = np.repeat(densities, boards)
+    simulation = BatchedSimulation(
+        random_boards(per_board, width, height, seed), rule=rule, seed=seed
+    )
+    start = time.perf_counter()
+    simulation.run(generations)
+    elapsed = time.perf_counter() - start
+
+    finished = simulation.finished
+    extinct = finished & (simulation.final_population == 0)
+    rows = []
+    for index, density in enumerate(densities):
+        group = slice(index * boards, (index + 1) * boards)
+        done = finished[group]
+        rows.append({
+            "density": density,
+            "boards": boards,
+            "extinct": int(extinct[group].sum()),
+            "stabilized": int((done & ~extinct[group]).sum()),
+            "running": int((~done).sum()),
+            "mean_final_population": round(float(simulation.final_population[group][done].mean()), 2)
+            if done.any() else None,
+            "mean_generations": round(float(simulation.final_generation[group][done].mean()), 1)
+            if done.any() else None,
+        })
+    return rows, elapsed
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m sweep",
+        description="Sweep the initial population density over many small boards.",
+    )
+    parser.add_argument(
+        "--densities", type=parse_densities, default=parse_densities("0.05:0.95:0.05"),
+        help="START:STOP:STEP or a list like 0.2,0.35 (default: 0.05:0.95:0.05)",
+    )
+    parser.add_argument(
+        "--boards", type=int, default=200,
+        help="boards per density (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--size", type=parse_size, default=(64, 64),
+        help="board size as WIDTHxHEIGHT (default: 64x64)",
+    )
+    parser.add_argument(
+        "-n", "--generations", type=int, default=5000,
+        help="most generations to run (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, help="random seed")
+    parser.add_argument(
+        "--rule", type=Rule, default=Rule(CONWAY),
+        help="Life-like rulestring (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print the results as JSON"
+    )
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.boards < 1:
+        parser.error("--boards must be at least 1")
+
+    width, height = args.size
+    rows, elapsed = sweep(
+        args.densities, args.boards, width, height, args.generations,
+        args.rule, args.seed,
+    )
+
+    if args.json:
+        print(json.dumps({
+            "rule": args.rule.rulestring,
+            "size": f"{width}x{height}",
+            "generations": args.generations,
+            "elapsed_s": round(elapsed, 3),
+            "results": rows,
+        }))
+        return 0
+
+    columns = list(rows[0])
+    print("  ".join(columns))
+    for row in rows:
+        print("  ".join(
+            f"{'-' if row[c] is None else row[c]:>{len(c)}}" for c in columns
+        ))
+    print(f"{len(rows) * args.boards} boards in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import numpy as np
+import pygame
+
+
+class CachedLayer:
+    """
+    Retains what a widget draws so it can be composited with a single blit.
+
+    The widget's draw function only runs when its state key changes. It is
+    then drawn twice, over black and over white, at its usual screen
+    coordinates; the difference between the two gives each pixel's
+    coverage. The result is stored as a premultiplied-alpha surface, which
+    composites over the board exactly like the original draw calls would
+    (to within rounding), including translucent panels and antialiased text.
+
+    Rendering the layer costs a few times more than drawing directly, so
+    while the state keeps changing (e.g. a slider being dragged) the widget
+    is drawn directly, and the layer is only rebuilt once the state has
+    held for a frame.
+    """
+
+    def __init__(self, draw_fn):
+        self.draw_fn = draw_fn
+        self.key = None
+        self.rect = None
+        self._last_seen = None   # (key, rect) drawn last frame
+        self._black = None
+        self._white = None
+        self.layer = None
+
+
+    def _render(self, rect):
+        self._black.fill((0, 0, 0), rect)
+        self._white.fill((255, 255, 255), rect)
+        self.draw_fn(self._black)
+        self.draw_fn(self._white)
+
+        # Coverage is the same in every channel; one is enough
+        region = np.s_[rect.left:rect.right, rect.top:rect.bottom]
+        spread = np.subtract(
+            pygame.surfarray.pixels_green(self._white)[region],
+            pygame.surfarray.pixels_green(self._black)[region],
+            dtype=np.int16,
+        )
+
+        color = pygame.surfarray.pixels3d(self.layer)
+        alpha = pygame.surfarray.pixels_alpha(self.layer)
+        color[region] = pygame.surfarray.pixels3d(self._black)[region]
+        alpha[region] = 255 - spread
+        # Release the surface locks before blitting
+        del color, alpha
+
+
+    def draw(self, screen, key, rect):
+        """
+        Blit the widget, re-rendering it first if ``key`` or ``rect`` changed.
+
+        :param key: hashable snapshot of everything the widget shows
+        :param rect: screen area the widget draws into
+        """
+        size = screen.get_size()
+        if self.layer is None or self.layer.get_size() != size:
+            self._black = pygame.Surface(size)
+            self._white = pygame.Surface(size)
+            self.layer = pygame.Surface(size, pygame.SRCALPHA)
+            self.rect = None
+
+        rect = rect.clip(screen.get_rect())
+        if key != self.key or rect != self.rect:
+            seen = (key, rect)
+            if seen != self._last_seen:
+                # Still changing; don't pay for a layer that may not be reused
+                self._last_seen = seen
+                self.draw_fn(screen)
+                return
+            self._render(rect)
+            self.key = key
+            self.rect = rect
+
+        screen.blit(self.layer, rect, rect, special_flags=pygame.BLEND_PREMULTIPLIED)
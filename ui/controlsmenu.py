@@ -1,4 +1,5 @@
 import pygame
+from ui.cachedlayer import CachedLayer
 from constants import (
     WHITE, PANEL_COLOR, PANEL_BORDER_COLOR, BUTTON_LABEL_COLOR, BUTTON_COLOR
 )
@@ -12,11 +13,14 @@ class ControlsMenu:
 
         # Controls button and panel rectangles
         self.button_rect = pygame.Rect(90, 2, 80, 20)
-        self.panel_rect = pygame.Rect(5, 23, 260, 195)
+        self.panel_rect = pygame.Rect(5, 23, 260, 355)
 
         # Font for button labels
         self.font = pygame.font.SysFont("ubuntumono", 13)
 
+        # Rendered once per open/close, then composited with one blit
+        self.layer = CachedLayer(self._draw_contents)
+
 
     def _draw_button(self, screen, rect, label=None, label_color=(0, 0, 0), color=(120, 120, 120, 100)):
         """Draw a semi-transparent button with optional label."""
@@ -64,6 +68,14 @@ class ControlsMenu:
             "• C: Clear All Cells",
             "• G: Toggle Grid On/Off",
             "• F: Toggle Cell Fading On/Off",
+            "• V: Color Cells Plain/By Age/By Heat",
+            "• A: Auto-Pause When Cycling On/Off",
+            "• J: Jump Ahead While Cycling",
+            "• S / L: Save / Load Snapshot",
+            "• Arrows / Middle Drag: Pan (--infinite)",
+            "• P: Frame Profiler On/Off",
+            "• M: Trace Allocations (Profiler)",
+            "• O: Save Profile CSV",
         ]
 
         for i, line in enumerate(instructions):
@@ -95,6 +107,10 @@ class ControlsMenu:
 
     
     def draw(self, screen):
+        rect = self.button_rect.union(self.panel_rect) if self.open else self.button_rect
+        self.layer.draw(screen, self.open, rect)
+
+    def _draw_contents(self, screen):
         # Draw semi-transparent Controls button
         self._draw_button(
             screen,
@@ -7,60 +7,119 @@ class HUD:
         # HUD attributes
         # -------------------------------------------------
         self.font = font
+        self.bar_height = 23
         self.generations = 0
         self.cell_count = 0
         self.clock = None
+        self.gen_rate = 0
+        self.period = None
+        self.auto_pause = False
+        self.births = None
+        self.deaths = None
+        # -------------------------------------------------
+        # Rendered surfaces, kept until their text changes
+        # -------------------------------------------------
+        self._bar = None
+        self._elements = {}   # name -> (text, background, label surface)
 
 
     def _draw_hud_bar(self, screen):
         """Draw a semi-transparent HUD bar at the top of the screen."""
-        hud_height = 23
-        hud_bar = pygame.Surface((screen.get_width(), hud_height), pygame.SRCALPHA)
-        hud_bar.fill((0, 0, 0, 200))  # Semi-transparent black
-        screen.blit(hud_bar, (0, 0))
+        if self._bar is None or self._bar.get_width() != screen.get_width():
+            self._bar = pygame.Surface((screen.get_width(), self.bar_height), pygame.SRCALPHA)
+            self._bar.fill((0, 0, 0, 200))  # Semi-transparent black
+        screen.blit(self._bar, (0, 0))
 
-    def _draw_element_bg(self, screen, text, position):
-        """Draw background for HUD elements."""
+    def _make_element_bg(self, text):
+        """Build the background for a HUD element."""
         bg = pygame.Surface(
             (text.get_width() + 10, text.get_height() + 6),
             pygame.SRCALPHA
         )
         bg.fill((0, 0, 0, 120))  # Semi-transparent background
+        return bg
+
+    def _draw_element(self, screen, name, label, position):
+        """Draw a HUD element, rendering its text only when it changed."""
+        cached = self._elements.get(name)
+        if cached is None or cached[0] != label:
+            text = self.font.render(label, True, BUTTON_LABEL_COLOR)
+            cached = (label, self._make_element_bg(text), text)
+            self._elements[name] = cached
+        _, bg, text = cached
         screen.blit(bg, position)
+        screen.blit(text, (position[0] + 5, position[1] + 3))
     
-    def _draw_generation_tracker(self, screen, generations):
-        """Display the current generation count on the screen."""
+    def _draw_generation_tracker(self, screen, generations, gen_rate):
+        """Display the current generation count and achieved gen/s on the screen."""
         position = (screen.get_width() // 2 - 60, 0)
-        text = self.font.render(f"Generation: {generations}", True, BUTTON_LABEL_COLOR)
-        self._draw_element_bg(screen, text, position)
-        screen.blit(text, (position[0] + 5, position[1] + 3))
+        label = f"Gen: {generations}  {gen_rate:.0f}/s" if gen_rate else f"Generation: {generations}"
+        self._draw_element(screen, "generation", label, position)
 
     def _draw_fps_tracker(self, screen, clock):
         """Display the current FPS on the screen."""
         position = (screen.get_width() - 60, 0)
-        text = self.font.render(f"FPS:{int(clock.get_fps())}", True, BUTTON_LABEL_COLOR)
-        self._draw_element_bg(screen, text, position)
-        screen.blit(text, (position[0] + 5, position[1] + 3))
+        self._draw_element(screen, "fps", f"FPS:{int(clock.get_fps())}", position)
 
     def draw_cell_count(self, screen, cell_count):
         """Display the current live cell count on the screen."""
         position = (screen.get_width() - 150, 0)
-        text = self.font.render(f"Cells: {cell_count}", True, BUTTON_LABEL_COLOR)
-        self._draw_element_bg(screen, text, position)
-        screen.blit(text, (position[0] + 5, position[1] + 3))
+        self._draw_element(screen, "cells", f"Cells: {cell_count}", position)
+
+    def _draw_cycle_tracker(self, screen, period, auto_pause):
+        """Display the detected cycle period, if the board is repeating."""
+        if period is None:
+            if not auto_pause:
+                return
+            label = "Auto-pause"
+        elif period == 1:
+            label = "Stable  J: skip"
+        else:
+            label = f"Period {period}  J: skip"
+
+        position = (screen.get_width() // 2 + 70, 0)
+        self._draw_element(screen, "cycle", label, position)
+
+    def _draw_change_tracker(self, screen, births, deaths):
+        """Display the births and deaths of the last generation stepped."""
+        if births is None:
+            return
+        self._draw_element(screen, "changes", f"+{births} -{deaths}", (260, 0))
 
-    def update(self, generations=None, cell_count=None, clock=None):
-        """Update HUD data."""
+    def update(
+        self,
+        generations=None,
+        cell_count=None,
+        clock=None,
+        gen_rate=None,
+        period=None,
+        auto_pause=None,
+        births=None,
+        deaths=None,
+    ):
+        """
+        Update HUD data. ``period``, ``births`` and ``deaths`` are always
+        replaced, since None means no cycle or no step counted.
+        """
         if generations is not None:
             self.generations = generations
         if cell_count is not None:
             self.cell_count = cell_count
         if clock is not None:
             self.clock = clock
+        if gen_rate is not None:
+            self.gen_rate = gen_rate
+        self.period = period
+        self.births = births
+        self.deaths = deaths
+        if auto_pause is not None:
+            self.auto_pause = auto_pause
     
     def draw(self, screen):
         """Draw all HUD elements."""
         self._draw_hud_bar(screen)
-        self._draw_generation_tracker(screen, self.generations)
+        self._draw_generation_tracker(screen, self.generations, self.gen_rate)
         self._draw_fps_tracker(screen, self.clock)
-        self.draw_cell_count(screen, self.cell_count)
\ No newline at end of file
+        self.draw_cell_count(screen, self.cell_count)
+        self._draw_cycle_tracker(screen, self.period, self.auto_pause)
+        self._draw_change_tracker(screen, self.births, self.deaths)
\ No newline at end of file
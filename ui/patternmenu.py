@@ -1,5 +1,6 @@
 import pygame
 import json
+from ui.cachedlayer import CachedLayer
 from constants import (
     WHITE,
     PANEL_COLOR,
@@ -18,7 +19,7 @@ class PatternMenu:
         # 'Patterns' button and panel rectangles
         # -------------------------------------------------
         self.button_rect = pygame.Rect(175, 2, 80, 20)
-        self.panel_rect = pygame.Rect(5, 23, 200, 325)
+        self.panel_rect = pygame.Rect(5, 23, 200, 350)
         # -------------------------------------------------
         # Font for button labels
         # -------------------------------------------------
@@ -27,13 +28,20 @@ class PatternMenu:
         # Pattern data and buttons
         # -------------------------------------------------
         self.selected_pattern = None
-        self.pattern_buttons = []
         with open(json_path, "r") as f:
             self.categories = json.load(f)
+        self.category_labels, self.pattern_buttons = self._layout_pattern_buttons(
+            self.panel_rect
+        )
+        # -------------------------------------------------
+        # Rendered once per open/close, then composited with one blit
+        # -------------------------------------------------
+        self.layer = CachedLayer(self._draw_contents)
 
-    def _draw_pattern_button(self, screen, rect, label):
-        """Draw buttons for predefined patterns."""
-        self.pattern_buttons.clear()
+    def _layout_pattern_buttons(self, rect):
+        """Place category labels and pattern buttons inside the panel (once)."""
+        labels = []
+        buttons = []
 
         y_offset = rect.top + 10
         category_height = 15
@@ -46,23 +54,31 @@ class PatternMenu:
             if i > 0:
                 y_offset += category_spacing
 
-            # Draw category label
-            category_text = self.font.render(category["label"], True, WHITE)
-            screen.blit(category_text, (rect.left + 10, y_offset))
+            labels.append((category["label"], (rect.left + 10, y_offset)))
             y_offset += category_height + spacing
 
             for pattern in category["patterns"]:
                 button_rect = pygame.Rect(rect.left + 10, y_offset, rect.width - 20, button_height)
-                self._draw_button(
-                    screen,
-                    button_rect,
-                    label=pattern["label"],
-                    label_color=BUTTON_LABEL_COLOR,
-                    color=BUTTON_COLOR,
-                )
-                self.pattern_buttons.append((button_rect, pattern))
+                buttons.append((button_rect, pattern))
                 y_offset += button_height + spacing
 
+        return labels, buttons
+
+    def _draw_pattern_button(self, screen):
+        """Draw buttons for predefined patterns."""
+        for label, position in self.category_labels:
+            category_text = self.font.render(label, True, WHITE)
+            screen.blit(category_text, position)
+
+        for button_rect, pattern in self.pattern_buttons:
+            self._draw_button(
+                screen,
+                button_rect,
+                label=pattern["label"],
+                label_color=BUTTON_LABEL_COLOR,
+                color=BUTTON_COLOR,
+            )
+
     def _draw_button(
         self,
         screen,
@@ -117,6 +133,10 @@ class PatternMenu:
                 break
 
     def draw(self, screen):
+        rect = self.button_rect.union(self.panel_rect) if self.open else self.button_rect
+        self.layer.draw(screen, self.open, rect)
+
+    def _draw_contents(self, screen):
         # Draw semi-transparent Controls button
         self._draw_button(
             screen,
@@ -134,5 +154,5 @@ class PatternMenu:
         self._draw_panel(screen)
 
         # Draw buttons for predefined patterns
-        self._draw_pattern_button(screen, self.panel_rect, "Pattern")
+        self._draw_pattern_button(screen)
 
@@ -0,0 +1,102 @@
+import numpy as np
+import pygame
+from profiler import PHASES
+from constants import (
+    WHITE, PANEL_COLOR, PANEL_BORDER_COLOR, RED, ORANGE, YELLOW, GREEN,
+    PURPLE, CYAN, FPS, HEIGHT,
+)
+
+# Bar color of each phase, in PHASES order
+PHASE_COLORS = (CYAN, GREEN, YELLOW, ORANGE, PURPLE, RED)
+# Milliseconds per pixel of bar height
+MS_PER_PIXEL = 0.25
+# Seconds between refreshes of the percentile table
+TABLE_REFRESH = 0.5
+
+
+class ProfileGraph:
+    """
+    Stacked frame-time graph: one column per recent frame, split into the
+    time each phase took, with a line at the frame budget and a table of
+    rolling p50/p95/p99 per phase below it.
+    """
+
+    def __init__(self, profiler, font, rect=None):
+        self.profiler = profiler
+        self.font = font
+        self.rect = rect or pygame.Rect(5, HEIGHT - 240, 420, 235)
+        self.graph_rect = pygame.Rect(
+            self.rect.x + 8, self.rect.y + 8, self.rect.width - 16, 100
+        )
+        # Palette index per pixel -> color; the last entry is the background
+        self._colors = np.array([*PHASE_COLORS, (20, 20, 20)], dtype=np.uint8)
+        self._graph = pygame.Surface(self.graph_rect.size)
+        self._panel = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self._panel.fill(PANEL_COLOR)
+        self._table = None
+        self._table_time = None
+
+
+    @property
+    def visible(self):
+        return self.profiler.enabled
+
+
+    def _draw_graph(self, screen):
+        width, height = self.graph_rect.size
+        times, _ = self.profiler.recent(width)
+
+        # Pixel rows (counted up from the bottom) each phase's bar reaches
+        tops = np.cumsum(times, axis=1) / (MS_PER_PIXEL * 1e6)
+        rows = np.arange(height)[::-1]
+        # Index of the first phase whose bar is above each pixel
+        phase = (rows[None, :, None] >= tops[:, None, :]).sum(axis=2)
+        pixels = np.empty((width, height, 3), dtype=np.uint8)
+        pixels[:] = self._colors[-1]
+        pixels[width - len(times):] = self._colors[phase]
+        pygame.surfarray.blit_array(self._graph, pixels)
+
+        budget = height - 1000 / FPS / MS_PER_PIXEL
+        if budget >= 0:
+            pygame.draw.line(self._graph, WHITE, (0, budget), (width, budget))
+        screen.blit(self._graph, self.graph_rect)
+
+
+    def _render_table(self):
+        """Render the legend with each phase's rolling percentiles."""
+        stats = self.profiler.percentiles()
+        lines = [("phase", "  p50    p95    p99 ms", WHITE)]
+        for name, color in zip((*PHASES, "total"), (*PHASE_COLORS, WHITE)):
+            p50, p95, p99 = stats.get(name, (0, 0, 0))
+            lines.append((name, f"{p50:6.2f} {p95:6.2f} {p99:6.2f}", color))
+        if self.profiler.trace_memory:
+            _, allocations = self.profiler.recent()
+            per_frame = allocations.sum(axis=1).mean() if len(allocations) else 0
+            lines.append(("allocs", f"{per_frame:8.0f} blocks/frame", WHITE))
+
+        surfaces = [
+            (self.font.render(name, True, color), self.font.render(values, True, WHITE))
+            for name, values, color in lines
+        ]
+        table = pygame.Surface(
+            (self.rect.width - 16, 15 * len(surfaces)), pygame.SRCALPHA
+        )
+        for i, (label, values) in enumerate(surfaces):
+            table.blit(label, (0, i * 15))
+            table.blit(values, (70, i * 15))
+        return table
+
+
+    def draw(self, screen):
+        if not self.visible:
+            return
+        screen.blit(self._panel, self.rect)
+        pygame.draw.rect(screen, PANEL_BORDER_COLOR, self.rect, 2, border_radius=8)
+
+        self._draw_graph(screen)
+
+        now = pygame.time.get_ticks() / 1000
+        if self._table is None or now - self._table_time >= TABLE_REFRESH:
+            self._table = self._render_table()
+            self._table_time = now
+        screen.blit(self._table, (self.graph_rect.x, self.graph_rect.bottom + 6))
@@ -1,8 +1,10 @@
+import math
 import pygame
 from ui.slider import SimpleSlider
 from ui.slidersetting import SliderSetting
 from ui.colorselector import ColorSelector
 from ui.togglebutton import ToggleButton
+from ui.cachedlayer import CachedLayer
 from constants import (
     RED,
     ORANGE,
@@ -15,6 +17,11 @@ from constants import (
     BUTTON_COLOR,
     PANEL_COLOR,
     PANEL_BORDER_COLOR,
+    MIN_GEN_RATE,
+    MAX_GEN_RATE,
+    GEN_RATE,
+    ZOOM_LEVELS,
+    ZOOM,
 )
 
 
@@ -33,13 +40,13 @@ class SettingsMenu:
         # -------------------------------------------------
         # User-adjustable settings
         # -------------------------------------------------
-        self.zoom = 10
-        self.min_zoom = 5
-        self.max_zoom = 20
+        self.zoom = ZOOM
+        self.min_zoom = ZOOM_LEVELS[0]
+        self.max_zoom = ZOOM_LEVELS[-1]
 
-        self.sim_speed = 30
         self.min_update_freq = 1
         self.max_update_freq = 100
+        self.sim_speed = self._rate_to_slider(GEN_RATE)
 
         self.initial_cells = 15
         self.show_grid = False
@@ -72,11 +79,14 @@ class SettingsMenu:
             SLIDER_H,
             self.min_update_freq,
             self.max_update_freq,
+            start_val=self._rate_to_slider(GEN_RATE),
         )
         y += SLIDER_SPACING
 
+        # Positions along the slider are indices into ZOOM_LEVELS
         self.zoom_slider = SimpleSlider(
-            SLIDER_X, y, SLIDER_WIDTH, SLIDER_H, self.min_zoom, self.max_zoom
+            SLIDER_X, y, SLIDER_WIDTH, SLIDER_H, 0, len(ZOOM_LEVELS) - 1,
+            start_val=ZOOM_LEVELS.index(ZOOM),
         )
         y += SLIDER_SPACING
         self.initial_population_slider = SimpleSlider(
@@ -99,12 +109,16 @@ class SettingsMenu:
         # -------------------------------------------------
         slider_configs = [
             {
-                "label": "Simulation Speed",
+                "label": "Speed",
                 "slider": self.speed_slider,
                 "step": 5,
-                "display_value_fn": lambda val: max(1, round(val / 2)),
+                "display_value_fn": lambda val: f"{self._slider_to_rate(val):.0f} gen/s",
+            },
+            {
+                "label": "Zoom Level",
+                "slider": self.zoom_slider,
+                "display_value_fn": lambda val: self._zoom_label(self._slider_to_zoom(val)),
             },
-            {"label": "Zoom Level", "slider": self.zoom_slider},
             {
                 "label": "Cell Population",
                 "slider": self.initial_population_slider,
@@ -159,6 +173,9 @@ class SettingsMenu:
 
         self.color_selector = ColorSelector(self.color_buttons, self.font)
 
+        # Rendered once per state change, then composited with one blit
+        self.layer = CachedLayer(self._draw_contents)
+
     ############################## HELPERS ##############################
     # Internal methods for drawing menu components and updating settings
 
@@ -212,11 +229,29 @@ class SettingsMenu:
             screen, PANEL_BORDER_COLOR, self.panel_rect, 2, border_radius=8
         )
 
-    def get_speed(self):
-        """Return actual ticks for simulation based on inverted slider value."""
-        max_val = self.speed_slider.max_val
-        min_val = self.speed_slider.min_val
-        return max_val - (self.speed_slider.val - min_val)
+    def _slider_to_rate(self, val):
+        """Map a speed slider position onto a log scale of generations/second."""
+        percent = (val - self.min_update_freq) / (self.max_update_freq - self.min_update_freq)
+        return MIN_GEN_RATE * (MAX_GEN_RATE / MIN_GEN_RATE) ** percent
+
+    def _rate_to_slider(self, rate):
+        percent = math.log(rate / MIN_GEN_RATE) / math.log(MAX_GEN_RATE / MIN_GEN_RATE)
+        return self.min_update_freq + percent * (self.max_update_freq - self.min_update_freq)
+
+    def _slider_to_zoom(self, val):
+        """Map a zoom slider position onto ZOOM_LEVELS (pixels per cell)."""
+        return ZOOM_LEVELS[round(val)]
+
+    def _zoom_label(self, zoom):
+        return f"1:{round(1 / zoom)}" if zoom < 1 else f"{zoom} px"
+
+    def get_zoom(self):
+        """Return the selected zoom in pixels per cell (fractions zoom out)."""
+        return self._slider_to_zoom(self.zoom_slider.val)
+
+    def get_rate(self):
+        """Return the target simulation speed in generations per second."""
+        return self._slider_to_rate(self.speed_slider.val)
 
     #########################################################################
 
@@ -243,7 +278,7 @@ class SettingsMenu:
 
         # Read slider values AFTER handling events
         self.sim_speed = max(0.5, self.speed_slider.val)
-        self.zoom = round(self.zoom_slider.val)
+        self.zoom = self.get_zoom()
         self.initial_cells = round(self.initial_population_slider.val)
         self.fade_duration = round(self.fade_slider.val, 2)
 
@@ -262,8 +297,20 @@ class SettingsMenu:
 
     ############################ DRAWING ##############################
 
+    def _state(self):
+        """Everything the menu shows; it is re-rendered only when this changes."""
+        return (
+            self.open,
+            tuple(s.slider.val for s in self.sliders),
+            self.fade_toggle.value,
+        )
+
     def draw(self, screen):
         """Draw the settings menu button and panel if open."""
+        rect = self.button_rect.union(self.panel_rect) if self.open else self.button_rect
+        self.layer.draw(screen, self._state(), rect)
+
+    def _draw_contents(self, screen):
         # Draw settings button
         self._draw_button(
             screen,
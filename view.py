@@ -1,53 +1,455 @@
+import numpy as np
 import pygame
-from constants import GRAY
+from engines.cellset import coords_from_cells
+from engines.density import density_from_coords
+from constants import GRAY, RENDERER, GRID_HIDE_ZOOM, GRID_FADE_ZOOM
+
+# Beyond this many changed cells a full repaint is cheaper than one rect each
+MAX_DIRTY_CELLS = 2000
+
+# Cell coloring modes, cycled with the V key
+COLOR_MODES = ("cells", "age", "heat")
+
+# Cells fade toward AGE_COLOR as they survive; fully there after 2^8 generations
+AGE_COLOR = (40, 70, 220)
+AGE_SCALE = 32
+# Activity heat map, from rarely to constantly changing cells
+HEAT_STOPS = [(70, 20, 110), (200, 40, 40), (255, 160, 0), (255, 255, 210)]
+# Zoomed out, a pixel with any live cells is at least this far from the
+# background toward the cell color; denser blocks shade further on a log scale
+LOD_FLOOR = 0.25
+
+
+def _as_coords(alive_cells, region=()):
+    """
+    Live cells as ``(xs, ys)`` arrays, straight from the engine when possible.
+
+    :param region: ``(x0, y0, x1, y1)`` to ask an unbounded engine for just
+        that rectangle; plain sets are returned whole
+    """
+    if isinstance(alive_cells, (set, frozenset)):
+        return coords_from_cells(alive_cells)
+    return alive_cells.live_cells(*region)
+
+
+def _gradient(stops, size=256):
+    """Build a (size, 3) uint8 palette blending evenly through ``stops``."""
+    stops = np.array(stops, dtype=np.float64)
+    positions = np.linspace(0, len(stops) - 1, size)
+    channels = [np.interp(positions, np.arange(len(stops)), stops[:, c]) for c in range(3)]
+    return np.stack(channels, axis=1).astype(np.uint8)
+
+
+HEAT_PALETTE = _gradient(HEAT_STOPS)
 
 
 class LifeView:
-    def __init__(self, screen, zoom):
+    def __init__(self, screen, zoom, renderer=RENDERER):
         # -------------------------------------------------
         # View attributes
         # -------------------------------------------------
         self.screen = screen
         self.zoom = zoom
-        self.cell_fade = {}    # {(col, row): remaining_time}
+        self.renderer = renderer   # "pixels" or "rects"
+        self.color_mode = "cells"  # one of COLOR_MODES
+        # -------------------------------------------------
+        # Camera: the cell shown in the top-left corner. On an unbounded
+        # plane it can pan anywhere and only the visible rectangle is
+        # fetched from the engine; otherwise it stays at the origin
+        # -------------------------------------------------
+        self.unbounded = False
+        self.camera_x = 0
+        self.camera_y = 0
+        # -------------------------------------------------
+        # Incremental rendering: cells and grid are kept on a persistent
+        # board surface; only changed cells are repainted between full redraws
+        # -------------------------------------------------
+        self.board_surface = pygame.Surface(screen.get_size())
+        self.full_redraw = True
+        self.changed = set()       # {(col, row), ...} to repaint next frame
+        self._was_fading = False
+        self._grid_surface = None  # cached grid-line overlay
+        self._grid_key = None      # (zoom, cols, rows, window size, color)
+        # -------------------------------------------------
+        # Pixel renderer buffers (rebuilt when the grid size changes)
+        # -------------------------------------------------
+        self._pixels = None        # (cols, rows, 3) uint8, one pixel per cell
+        self._cell_surface = None  # the same, as a surface
+        self._scaled_surface = None
+        # -------------------------------------------------
+        # Per-cell history, indexed [col, row] like the pixel buffer. Only
+        # kept while fading or an age/heat mode needs it
+        # -------------------------------------------------
+        self.alive = None          # bool, live cells as of the last update
+        self.fade = None           # float32, seconds of fade left per cell
+        self.born = None           # int64, generation each live cell was born in
+        self.heat = None           # uint16, births + deaths seen per cell
+        self._generation = None
+        self._revealed = None      # bool, cells panned into view since the last update
+        self._history_changed = False
+        self._fading = False
+        self._fade_left = 0.0      # seconds until the last death has faded
+        # When the engine reports births/deaths through apply_changes, the
+        # history is kept up to date from those instead of re-diffing the
+        # whole board every frame
+        self.incremental = False
+        self._palettes = {}        # (mode, color) -> (256, 3) uint8 LUT
+        self._lod_levels = {}      # block -> (block**2 + 1,) uint8 palette index
+        self._lod_surface = None   # 8-bit, one pixel per block, palette from GRAY to the cell color
+        self._lod_color = None
         # -------------------------------------------------
         # Fade attributes
         # -------------------------------------------------
         self.fade_enabled = False
-        self.prev_alive_cells = set()
         self.fade_duration = 0.5   # seconds
 
     
     def set_fade_enabled(self, enabled: bool):
         self.fade_enabled = enabled
+        self.invalidate()
+
+
+    def set_color_mode(self, mode):
+        """Switch between coloring live cells plainly, by age, or by activity."""
+        self.color_mode = mode
+        self.invalidate()
 
 
-    def update_fade(self, alive_cells, dt):
+    def invalidate(self):
+        """Repaint the whole board next frame (zoom, colors, loads, clears)."""
+        self.full_redraw = True
+        self.changed.clear()
+
+
+    def mark_changed(self, cells):
+        """
+        Note cells whose state changed (births, deaths, edits) so only they
+        are repainted next frame.
+
+        :cells: iterable of (col, row) positions
         """
-        Update alpha for fading cells.
+        if not self.full_redraw:
+            self.changed.update(cells)
+            if len(self.changed) > MAX_DIRTY_CELLS:
+                self.invalidate()
+
+
+    def _block(self):
+        """Cells per screen pixel along each axis: 1 unless zoomed out past 1:1."""
+        return round(1 / self.zoom) if self.zoom < 1 else 1
+
+
+    def grid_shape(self):
+        """Board cells the screen shows, as ``(cols, rows)``."""
+        if self.zoom < 1:
+            block = self._block()
+            return self.screen.get_width() * block, self.screen.get_height() * block
+        zoom = int(self.zoom)
+        return self.screen.get_width() // zoom, self.screen.get_height() // zoom
+
+
+    # -------------------------------------------------
+    # Camera
+    # -------------------------------------------------
+    def screen_to_cell(self, x, y):
+        """Board cell under screen pixel (x, y)."""
+        if self.zoom < 1:
+            block = self._block()
+            return self.camera_x + x * block, self.camera_y + y * block
+        zoom = int(self.zoom)
+        return self.camera_x + x // zoom, self.camera_y + y // zoom
+
+
+    def center_on(self, col, row):
+        """Move the camera so cell (col, row) is in the middle of the screen."""
+        cols, rows = self.grid_shape()
+        self.pan(col - cols // 2 - self.camera_x, row - rows // 2 - self.camera_y)
+
+
+    def pan(self, dx, dy):
+        """
+        Move the camera by whole cells. Fades, ages and heat move with the
+        board; cells coming into view start with a clean history.
+        """
+        if not dx and not dy:
+            return
+        self.camera_x += dx
+        self.camera_y += dy
+        self.invalidate()
+        if self.alive is None:
+            return
+
+        cols, rows = self.alive.shape
+        if abs(dx) >= cols or abs(dy) >= rows:
+            self.reset_history()
+            return
+        # Screen cell (c, r) now shows what (c + dx, r + dy) showed
+        src = np.s_[max(dx, 0):cols + min(dx, 0), max(dy, 0):rows + min(dy, 0)]
+        dst = np.s_[max(-dx, 0):cols + min(-dx, 0), max(-dy, 0):rows + min(-dy, 0)]
+        for name in ("alive", "fade", "born", "heat"):
+            old = getattr(self, name)
+            new = np.zeros_like(old)
+            new[dst] = old[src]
+            setattr(self, name, new)
+
+        revealed = np.ones((cols, rows), dtype=bool)
+        revealed[dst] = False
+        if self._revealed is not None:
+            revealed[dst] |= self._revealed[src]
+        self._revealed = revealed
+
+
+    def visible_region(self):
+        """Board rectangle on screen, as ``(x0, y0, x1, y1)``."""
+        cols, rows = self.grid_shape()
+        return self.camera_x, self.camera_y, self.camera_x + cols, self.camera_y + rows
+
+
+    def _visible_coords(self, alive_cells):
+        """Screen-grid ``(cols, rows)`` arrays of the live cells in view."""
+        cols, rows = self.grid_shape()
+        x0, y0 = self.camera_x, self.camera_y
+        region = self.visible_region() if self.unbounded else ()
+        xs, ys = _as_coords(alive_cells, region)
+        if x0 or y0:
+            xs, ys = xs - x0, ys - y0
+        inside = (xs >= 0) & (xs < cols) & (ys >= 0) & (ys < rows)
+        return xs[inside], ys[inside]
+
+
+    def _alive_mask(self, alive_cells):
+        mask = np.zeros(self.grid_shape(), dtype=bool)
+        mask[self._visible_coords(alive_cells)] = True
+        return mask
+
+
+    def reset_history(self):
+        """Forget fades, ages and heat (zoom changes, loads, clears)."""
+        self.alive = None
+        self._revealed = None
+
+
+    def _tracking(self):
+        # Zoomed out, pixels show block densities rather than cells
+        return self.zoom >= 1 and (self.fade_enabled or self.color_mode != "cells")
+
+
+    def update_fade(self, alive_cells, dt, generation=None):
+        """
+        Update fade timers, cell ages and the activity heat map from the
+        current live cells, all with whole-array operations.
+
+        With ``incremental`` set, births and deaths have already been
+        applied by ``apply_changes``, so only the fade timers run down
+        (while something is fading). Otherwise changes are measured against
+        the previous update, so when several generations run in one frame a
+        cell that was born and died in between leaves no trace.
 
         :alive_cells: set of currently alive positions {(col, row), ...}
         :dt: time delta since last update in seconds
+        :generation: current generation count, used to age surviving cells
         """
-        if not self.fade_enabled:
-            self.cell_fade.clear()
+        if not self._tracking():
+            # Nothing to track; the renderers draw live cells directly
+            self.reset_history()
+            self._fading = False
+            return
+
+        if generation is None:
+            generation = (self._generation or 0) + 1
+        if (
+            self.incremental
+            and self.alive is not None
+            and self.alive.shape == self.grid_shape()
+            and self._revealed is None
+        ):
+            self._run_fades(dt)
+            if generation != self._generation:
+                # Ages are read off the birth generations; colors move on
+                self._history_changed = True
+                self._generation = generation
+            return
+
+        alive = self._alive_mask(alive_cells)
+        if self.alive is None or self.alive.shape != alive.shape:
+            self.alive = alive
+            self.fade = np.where(alive, np.float32(self.fade_duration), np.float32(0))
+            self.born = np.full(alive.shape, generation, dtype=np.int64)
+            self.heat = np.zeros(alive.shape, dtype=np.uint16)
+            self._generation = generation
+            self._revealed = None
+            self._history_changed = True
+            self._fading = False
+            self._fade_left = 0.0
+            return
 
-        # Add newly dead cells to fade map
-        for pos in list(self.cell_fade.keys()):
-            self.cell_fade[pos] -= dt
-            if self.cell_fade[pos] <= 0:
-                del self.cell_fade[pos]
+        if self._revealed is not None:
+            # Cells that just panned into view weren't born; they were there
+            revealed = self._revealed
+            self.alive[revealed] = alive[revealed]
+            self.born[revealed] = generation
+            self._revealed = None
 
-        # Detect deaths (cells that were alive last frame but aren't now)
-        for pos in self.prev_alive_cells - alive_cells:
-            self.cell_fade[pos] = self.fade_duration
+        changed = alive ^ self.alive
 
-        self.prev_alive_cells = set(alive_cells)
+        # Fade timers: live cells stay full, the newly dead start counting down
+        if changed.any():
+            self._fade_left = self.fade_duration
+        self._run_fades(dt)
+        self.fade[alive | changed] = self.fade_duration
 
-        # Set new alpha for live cells
-        for pos in alive_cells:
-            # Snap new births to full alpha
-            self.cell_fade[pos] = self.fade_duration
+        self.born[alive & changed] = generation
+
+        # Heat: one count per observed birth or death, saturating
+        self.heat[changed & (self.heat < 0xFFFF)] += 1
+
+        self._history_changed = generation != self._generation or changed.any()
+        self._generation = generation
+        self.alive = alive
+
+
+    def _run_fades(self, dt):
+        """Count the fade timers down; skipped once every dead cell has faded."""
+        if self._fade_left <= 0:
+            self._fading = False
+            return
+        self.fade -= dt
+        np.maximum(self.fade, 0, out=self.fade)
+        self._fade_left -= dt
+        self._fading = self._fade_left > 0
+
+
+    def apply_changes(self, births, deaths, generation=None):
+        """
+        Take one generation's (or one edit's) births and deaths: note them
+        for repainting and, while fades, ages or heat are kept, apply them
+        to the per-cell history. The work follows the number of changes,
+        not the population.
+
+        :births: ``(xs, ys)`` int arrays of cells that came alive
+        :deaths: ``(xs, ys)`` int arrays of cells that died
+        :generation: generation the changes produced (None for edits)
+        """
+        count = len(births[0]) + len(deaths[0])
+        if not count:
+            return
+        if not self.full_redraw:
+            if len(self.changed) + count > MAX_DIRTY_CELLS:
+                self.invalidate()
+            else:
+                for xs, ys in (births, deaths):
+                    self.changed.update(zip(xs.tolist(), ys.tolist()))
+
+        if self.alive is None or not self._tracking():
+            return
+        cols, rows = self.alive.shape
+        for (xs, ys), alive in ((births, True), (deaths, False)):
+            xs, ys = xs - self.camera_x, ys - self.camera_y
+            inside = (xs >= 0) & (xs < cols) & (ys >= 0) & (ys < rows)
+            cells = xs[inside], ys[inside]
+            self.alive[cells] = alive
+            heat = self.heat[cells]
+            self.heat[cells] = heat + (heat < 0xFFFF)
+            if alive:
+                self.born[cells] = self._generation if generation is None else generation
+            else:
+                self.fade[cells] = self.fade_duration
+                self._fade_left = self.fade_duration
+        self._history_changed = True
+
+
+    def _palette(self, mode, color):
+        """Return the cached 256-entry LUT for ``mode`` and the cell color."""
+        key = (mode, tuple(color))
+        palette = self._palettes.get(key)
+        if palette is None:
+            if mode == "fade":
+                palette = _gradient([GRAY, color])
+            elif mode == "age":
+                palette = _gradient([color, AGE_COLOR])
+            else:
+                palette = HEAT_PALETTE
+            self._palettes[key] = palette
+        return palette
+
+
+    def _paint(self, pixels, alive_cells, color):
+        """
+        Write every cell's color into ``pixels`` (cols, rows, 3) using the
+        current color mode, fades and palettes.
+        """
+        pixels[:] = GRAY
+        cols, rows = pixels.shape[:2]
+
+        if self.alive is None or self.alive.shape != (cols, rows):
+            pixels[self._visible_coords(alive_cells)] = color
+            return
+
+        alive = self.alive
+        if self.color_mode == "heat":
+            hot = self.heat > 0
+            if hot.any():
+                level = np.log1p(self.heat[hot]) / np.log1p(self.heat.max())
+                pixels[hot] = HEAT_PALETTE[(level * 255).astype(np.uint8)]
+
+        if self.fade_enabled:
+            fading = (self.fade > 0) & ~alive
+            alpha = np.minimum(1.0, self.fade[fading] / self.fade_duration)
+            pixels[fading] = self._palette("fade", color)[(alpha * 255).astype(np.uint8)]
+
+        if self.color_mode == "age":
+            age = self._generation - self.born[alive] + 1
+            level = np.minimum(255, np.log2(np.maximum(age, 1)) * AGE_SCALE)
+            pixels[alive] = self._palette("age", color)[level.astype(np.uint8)]
+        else:
+            pixels[alive] = color
+
+
+    def render(self, alive_cells, color, grid_width, grid_height, grid_color, show_grid):
+        """
+        Bring the board surface up to date and copy the damaged parts of it
+        to the screen.
+
+        Fading cells change color every frame, and ages and heat change
+        with every generation, so while those are shown the whole board is
+        redrawn whenever they move.
+
+        :return: ``(full, rects)`` -- whether the whole board was redrawn,
+            and the screen rects that changed
+        """
+        fading = self.fade_enabled and self._fading
+        if fading or self._was_fading:
+            self.invalidate()
+        self._was_fading = fading
+        if self.color_mode != "cells" and self._history_changed:
+            self.invalidate()
+        self._history_changed = False
+        if self.zoom < 1 and self.changed:
+            # A changed cell changes its whole block's shade
+            self.invalidate()
+
+        if self.full_redraw:
+            self.board_surface.fill(GRAY)
+            self.draw_cells(alive_cells, color)
+            self.draw_grid(grid_width, grid_height, grid_color, show_grid)
+            self.screen.blit(self.board_surface, (0, 0))
+            self.full_redraw = False
+            return True, [self.screen.get_rect()]
+
+        zoom = int(self.zoom)
+        bounds = self.board_surface.get_rect()
+        rects = []
+        for pos in self.changed:
+            col, row = pos[0] - self.camera_x, pos[1] - self.camera_y
+            rect = pygame.Rect(col * zoom, row * zoom, zoom, zoom)
+            if not bounds.contains(rect):
+                continue
+            self.board_surface.fill(color if pos in alive_cells else GRAY, rect)
+            self.draw_grid(grid_width, grid_height, grid_color, show_grid, area=rect)
+            self.screen.blit(self.board_surface, rect, rect)
+            rects.append(rect)
+        self.changed.clear()
+        return False, rects
 
 
     def draw_cells(self, alive_cells, color):
@@ -57,50 +459,159 @@ class LifeView:
         :alive_cells: set of positions
         :color: RGB tuple
         """
-        for pos, remaining in self.cell_fade.items():
-            if not self.fade_enabled and pos not in alive_cells:
-                continue
+        if self.zoom < 1:
+            self._draw_density(alive_cells, color)
+        elif self.renderer == "pixels":
+            self._draw_cells_pixels(alive_cells, color)
+        else:
+            self._draw_cells_rects(alive_cells, color)
+
+
+    def _pixel_buffers(self):
+        """Return the one-pixel-per-cell array and surfaces for the current zoom."""
+        zoom = int(self.zoom)
+        cols, rows = self.grid_shape()
+        if self._pixels is None or self._pixels.shape[:2] != (cols, rows) \
+                or self._scaled_surface.get_width() != cols * zoom:
+            self._pixels = np.empty((cols, rows, 3), dtype=np.uint8)
+            self._cell_surface = pygame.Surface((cols, rows))
+            self._scaled_surface = pygame.Surface((cols * zoom, rows * zoom))
+        return self._pixels
+
+
+    def _draw_cells_pixels(self, alive_cells, color):
+        """
+        Write every cell into a one-pixel-per-cell buffer with array
+        operations, then scale it up to the zoom level and blit it once.
+        """
+        pixels = self._pixel_buffers()
+        self._paint(pixels, alive_cells, color)
+
+        pygame.surfarray.blit_array(self._cell_surface, pixels)
+        pygame.transform.scale(
+            self._cell_surface, self._scaled_surface.get_size(), self._scaled_surface
+        )
+        self.board_surface.blit(self._scaled_surface, (0, 0))
 
-            col, row = pos
+
+    def _density(self, alive_cells, x0, y0, cols, rows, block):
+        """
+        Live cells per ``block`` square for a ``(rows, cols)`` grid of
+        squares from cell (x0, y0): from the engine's own block counts when
+        it keeps them, else by binning the live cells in the area.
+        """
+        density = getattr(getattr(alive_cells, "engine", None), "density", None)
+        if density is not None:
+            return density(x0, y0, cols, rows, block)
+        region = (x0, y0, x0 + cols * block, y0 + rows * block)
+        xs, ys = _as_coords(alive_cells, region if self.unbounded else ())
+        return density_from_coords(xs, ys, x0, y0, cols, rows, block)
+
+
+    def _lod_level(self, block):
+        """Palette index for each possible live-cell count of a block."""
+        levels = self._lod_levels.get(block)
+        if levels is None:
+            counts = np.arange(block * block + 1)
+            shade = LOD_FLOOR + (1 - LOD_FLOOR) * np.log1p(counts) / np.log1p(block * block)
+            levels = np.where(counts > 0, shade * 255, 0).astype(np.uint8)
+            self._lod_levels[block] = levels
+        return levels
+
+
+    def _draw_density(self, alive_cells, color):
+        """
+        Zoomed out past one cell per pixel: shade each screen pixel by how
+        many live cells its block holds. The work is per pixel, not per
+        cell, so a whole large board can be watched live.
+        """
+        block = self._block()
+        cols, rows = self.screen.get_size()
+        # Blocks are aligned to the board so panning doesn't reshuffle them
+        x0 = self.camera_x - self.camera_x % block
+        y0 = self.camera_y - self.camera_y % block
+        counts = self._density(alive_cells, x0, y0, cols, rows, block)
+        np.minimum(counts, block * block, out=counts)
+
+        # Palette indices only; the surface's palette turns them into colors
+        if self._lod_surface is None or self._lod_surface.get_size() != (cols, rows):
+            self._lod_surface = pygame.Surface((cols, rows), depth=8)
+            self._lod_color = None
+        if self._lod_color != tuple(color):
+            self._lod_surface.set_palette(self._palette("fade", color).tolist())
+            self._lod_color = tuple(color)
+        pygame.surfarray.blit_array(self._lod_surface, self._lod_level(block)[counts].T)
+        self.board_surface.blit(self._lod_surface, (0, 0))
+
+
+    def _draw_cells_rects(self, alive_cells, color):
+        """Draw each non-background cell with its own ``pygame.draw.rect`` call."""
+        pixels = np.empty((*self.grid_shape(), 3), dtype=np.uint8)
+        self._paint(pixels, alive_cells, color)
+
+        xs, ys = np.nonzero((pixels != GRAY).any(axis=2))
+        for col, row, cell_color in zip(xs.tolist(), ys.tolist(), pixels[xs, ys].tolist()):
             rect = pygame.Rect(
                 col * self.zoom,
                 row * self.zoom,
                 self.zoom,
                 self.zoom
             )
+            pygame.draw.rect(self.board_surface, cell_color, rect)
 
-            alpha = min(1.0, remaining / self.fade_duration)
-
-            fade_color = (
-                int(color[0] * alpha + GRAY[0] * (1 - alpha)),
-                int(color[1] * alpha + GRAY[1] * (1 - alpha)),
-                int(color[2] * alpha + GRAY[2] * (1 - alpha)),
-            )
-
-            draw_color = fade_color if self.fade_enabled else color
-            pygame.draw.rect(self.screen, draw_color, rect)
 
+    def _grid_alpha(self):
+        """Grid line opacity: full when cells are big, thinner as they shrink."""
+        zoom = int(self.zoom)
+        if zoom < GRID_HIDE_ZOOM:
+            return 0
+        if zoom >= GRID_FADE_ZOOM:
+            return 255
+        steps = GRID_FADE_ZOOM - GRID_HIDE_ZOOM + 1
+        return 255 * (zoom - GRID_HIDE_ZOOM + 1) // steps
 
-    def draw_grid(self, width, height, color, show=False):
-        """Draws the grid lines on the screen.
 
-        :width: number of columns
-        :height: number of rows
-        :color: RGB tuple for grid line color
-        :show: boolean to toggle grid visibility
+    def _grid_overlay(self, width, height, color):
+        """
+        Return the grid lines pre-rendered onto a transparent surface. It is
+        rebuilt only when the zoom, grid size, window size or color changes.
         """
-        if show:
+        key = (int(self.zoom), width, height, self.screen.get_size(), color)
+        if key != self._grid_key:
+            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            line_color = (*color[:3], self._grid_alpha())
             for x in range(width):
                 pygame.draw.line(
-                    self.screen,
-                    color,
+                    overlay,
+                    line_color,
                     (x * self.zoom, 0),
                     (x * self.zoom, height * self.zoom)
                 )
             for y in range(height):
                 pygame.draw.line(
-                    self.screen,
-                    color,
+                    overlay,
+                    line_color,
                     (0, y * self.zoom),
                     (width * self.zoom, y * self.zoom)
-                )
\ No newline at end of file
+                )
+            self._grid_surface = overlay
+            self._grid_key = key
+        return self._grid_surface
+
+
+    def draw_grid(self, width, height, color, show=False, area=None):
+        """Draws the grid lines on the board surface.
+
+        :width: number of columns
+        :height: number of rows
+        :color: RGB tuple for grid line color
+        :show: boolean to toggle grid visibility
+        :area: only redraw the lines inside this rect
+        """
+        if not show or self._grid_alpha() == 0:
+            return
+        overlay = self._grid_overlay(width, height, color)
+        if area is None:
+            self.board_surface.blit(overlay, (0, 0))
+        else:
+            self.board_surface.blit(overlay, area, area)